@@ -0,0 +1,95 @@
+r"""Compare cache value codecs (see also :mod:`wikidata.cachecodec`) by
+encoding and decoding time and entry size::
+
+    python benchmarks/cachecodec.py [REPEAT]
+
+The corpus consists of the entity fixtures of the test suite larger than
+50 KB.  Values are parsed as :class:`~wikidata.client.Client` does with
+the JSON backend each codec pairs with, e.g., ``json+lazy`` stores
+:class:`~wikidata.lazyjson.LazyObject`\ s.  Decoding time includes looking
+up the English label of each entity, so that it's fair to lazy parsing.
+
+"""
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, List, Sequence, Tuple
+
+from wikidata.cache import CacheValue
+from wikidata.cachecodec import (CacheCodec, JsonCodec, MarshalCodec,
+                                 PickleCodec)
+from wikidata.jsonbackend import JsonBackend, StdlibJsonBackend
+from wikidata.lazyjson import LazyJsonBackend
+
+__all__ = 'main', 'measure'
+
+
+FIXTURES_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'fixtures', 'entities'
+)
+MIN_SIZE = 50 * 1024
+
+
+def measure(items: Sequence[Any],
+            repeat: int,
+            function: Callable[[Any], object]) -> float:
+    """Call the ``function`` with each of ``items`` ``repeat`` times, and
+    return the best seconds taken per round.
+
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def read_label(value: object) -> object:
+    entities = value['entities']  # type: ignore
+    return next(iter(entities.values()))['labels']['en']
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    documents = []
+    for filename in sorted(os.listdir(FIXTURES_PATH)):
+        with open(os.path.join(FIXTURES_PATH, filename), 'rb') as f:
+            document = f.read()
+        if len(document) >= MIN_SIZE:
+            documents.append(document)
+    total = sum(map(len, documents))
+    print('{} documents, {:.1f} KB of JSON, best of {}'.format(
+        len(documents), total / 1024, repeat
+    ))
+    stdlib = StdlibJsonBackend()
+    lazy = LazyJsonBackend()
+    codecs: List[Tuple[str, JsonBackend, CacheCodec]] = [
+        ('pickle', stdlib, PickleCodec()),
+        ('pickle-5', stdlib, PickleCodec(5)),
+        ('marshal', stdlib, MarshalCodec()),
+        ('json', stdlib, JsonCodec(stdlib)),
+        ('json+lazy', lazy, JsonCodec(lazy)),
+    ]
+    print('{:<10} {:>12} {:>12} {:>10} {:>8}'.format(
+        'codec', 'encode (ms)', 'decode (ms)', 'size (KB)', 'ratio'
+    ))
+    for name, backend, codec in codecs:
+        values = [CacheValue(backend.loads(d)) for d in documents]
+        entries = [codec.encode(v) for v in values]
+        assert all(codec.decode(e) == json.loads(d)
+                   for e, d in zip(entries, documents))
+        encode = measure(values, repeat,
+                         lambda v: codec.encode(CacheValue(v)))
+        decode = measure(entries, repeat,
+                         lambda e: read_label(codec.decode(e)))
+        size = sum(map(len, entries))
+        print('{:<10} {:>12.2f} {:>12.2f} {:>10.1f} {:>8.2f}'.format(
+            name, encode * 1000, decode * 1000, size / 1024, size / total
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Compare compression of cached entities with and without dictionaries
+(see also :mod:`wikidata.compression`) by compression ratio and CPU time::
+
+    python benchmarks/compression.py [REPEAT]
+
+The corpus consists of all entity fixtures of the test suite, serialized
+by :class:`~wikidata.cachecodec.JsonCodec`.  Each entity is compressed
+with a dictionary trained from the other entities, so that the entity
+itself is never in the dictionary.  Ratios of small entities (less than
+20 KB) are reported separately, since dictionaries matter most to them.
+
+"""
+import json
+import os
+import sys
+from typing import List, Optional, Tuple
+
+from wikidata.cache import CacheKey, CacheValue, MemoryCachePolicy
+from wikidata.cachecodec import JsonCodec
+from wikidata.compression import (CompressedCachePolicy, CompressionStats,
+                                  train_dictionary)
+
+__all__ = 'main', 'measure'
+
+
+FIXTURES_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'fixtures', 'entities'
+)
+SMALL_SIZE = 20 * 1024
+
+
+def measure(values: List[CacheValue],
+            samples: List[bytes],
+            repeat: int,
+            level: int,
+            dictionary_size: Optional[int]) -> Tuple[CompressionStats, float]:
+    """Store and look up each of ``values`` ``repeat`` times through
+    :class:`~wikidata.compression.CompressedCachePolicy`, and return
+    the statistics of the last round and the ratio of small values.
+
+    """
+    for _ in range(repeat):
+        stats = CompressionStats()
+        small_raw = small_compressed = 0
+        for i, value in enumerate(values):
+            dictionary = None
+            if dictionary_size is not None:
+                dictionary = train_dictionary(samples[:i] + samples[i + 1:],
+                                              dictionary_size)
+            policy = CompressedCachePolicy(MemoryCachePolicy(), dictionary,
+                                           level=level)
+            policy.set(CacheKey('key'), value)
+            policy.get(CacheKey('key'))
+            result = policy.compression_stats()
+            for attr in CompressionStats.__slots__:
+                setattr(stats, attr,
+                        getattr(stats, attr) + getattr(result, attr))
+            if result.raw_size < SMALL_SIZE:
+                small_raw += result.raw_size
+                small_compressed += result.compressed_size
+    return stats, small_raw / small_compressed
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    codec = JsonCodec()
+    values = []
+    for filename in sorted(os.listdir(FIXTURES_PATH)):
+        with open(os.path.join(FIXTURES_PATH, filename), 'rb') as f:
+            values.append(CacheValue(json.load(f)))
+    samples = [codec.encode(v) for v in values]
+    total = sum(map(len, samples))
+    print('{} entities, {:.1f} KB of JSON, {} rounds'.format(
+        len(samples), total / 1024, repeat
+    ))
+    print('{:<16} {:>8} {:>8} {:>16} {:>16}'.format(
+        'compression', 'ratio', 'small', 'compress (ms)', 'decompress (ms)'
+    ))
+    cases: List[Tuple[str, int, Optional[int]]] = [
+        ('zlib-1', 1, None),
+        ('zlib-6', 6, None),
+        ('zlib-9', 9, None),
+        ('zlib-6 + 8 KB', 6, 8 * 1024),
+        ('zlib-6 + 32 KB', 6, 32 * 1024),
+        ('zlib-9 + 32 KB', 9, 32 * 1024),
+    ]
+    for name, level, dictionary_size in cases:
+        stats, small_ratio = measure(values, samples, repeat, level,
+                                     dictionary_size)
+        print('{:<16} {:>8.2f} {:>8.2f} {:>16.2f} {:>16.2f}'.format(
+            name, stats.ratio or 0, small_ratio,
+            stats.compress_time * 1000, stats.decompress_time * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Measure memory saved by interning strings of entity documents
+(see also :mod:`wikidata.interning`), using :mod:`tracemalloc`::
+
+    python benchmarks/interning.py [COPIES]
+
+The corpus consists of the entity fixtures of the test suite, each parsed
+``COPIES`` times as if they were distinct entities kept in memory.
+
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from wikidata.interning import intern_pairs
+
+__all__ = 'main', 'measure'
+
+
+FIXTURES_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'fixtures', 'entities'
+)
+
+
+def measure(documents: List[bytes],
+            copies: int,
+            hook: Optional[Callable]) -> Tuple[int, float]:
+    """Parse the ``documents`` ``copies`` times each, and return the bytes
+    taken by the parsed objects and the seconds taken.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        parsed = [json.loads(document, object_pairs_hook=hook)
+                  for _ in range(copies) for document in documents]
+        elapsed = time.perf_counter() - started
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del parsed
+    return after - before, elapsed
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    documents = []
+    for filename in sorted(os.listdir(FIXTURES_PATH)):
+        with open(os.path.join(FIXTURES_PATH, filename), 'rb') as f:
+            documents.append(f.read())
+    total = sum(map(len, documents)) * copies
+    print('{} documents, {:.1f} MB of JSON'.format(
+        len(documents) * copies, total / 1024 ** 2
+    ))
+    print('{:<12} {:>12} {:>10}'.format('mode', 'memory (MB)', 'time (s)'))
+    for name, hook in [('plain', None), ('interned', intern_pairs)]:
+        size, elapsed = measure(documents, copies, hook)
+        print('{:<12} {:>12.1f} {:>10.2f}'.format(
+            name, size / 1024 ** 2, elapsed
+        ))
+
+
+if __name__ == '__main__':
+    main()
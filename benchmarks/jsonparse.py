@@ -0,0 +1,90 @@
+"""Compare JSON backends (see also :mod:`wikidata.jsonbackend`) on large
+entity documents::
+
+    python benchmarks/jsonparse.py [REPEAT]
+
+The corpus consists of the entity fixtures of the test suite larger than
+50 KB, each parsed ``REPEAT`` times.  ``text`` is the way responses were
+parsed before: decoding UTF-8 through :class:`io.TextIOWrapper` and then
+parsing the text using :func:`json.load()`.
+
+"""
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from wikidata.interning import intern_pairs
+from wikidata.jsonbackend import (JsonBackend, OrjsonBackend, PairsHook,
+                                  StdlibJsonBackend)
+
+__all__ = 'main', 'measure'
+
+
+FIXTURES_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'fixtures', 'entities'
+)
+MIN_SIZE = 50 * 1024
+
+
+class TextBackend(JsonBackend):
+
+    def loads(self,
+              data: bytes,
+              object_pairs_hook: Optional[PairsHook] = None) -> object:
+        return json.load(io.TextIOWrapper(io.BytesIO(data), 'utf-8'),
+                         object_pairs_hook=object_pairs_hook)
+
+
+def measure(documents: List[bytes],
+            repeat: int,
+            parse: Callable[[bytes], object]) -> float:
+    """Parse the ``documents`` ``repeat`` times each, and return the best
+    seconds taken per round.
+
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for document in documents:
+            parse(document)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    documents = []
+    for filename in sorted(os.listdir(FIXTURES_PATH)):
+        with open(os.path.join(FIXTURES_PATH, filename), 'rb') as f:
+            document = f.read()
+        if len(document) >= MIN_SIZE:
+            documents.append(document)
+    total = sum(map(len, documents))
+    print('{} documents, {:.1f} MB of JSON, best of {}'.format(
+        len(documents), total / 1024 ** 2, repeat
+    ))
+    backends: List[Tuple[str, JsonBackend]] = [
+        ('text', TextBackend()),
+        ('stdlib', StdlibJsonBackend()),
+    ]
+    try:
+        backends.append(('orjson', OrjsonBackend()))
+    except ImportError:
+        print('orjson is not installed; skipped')
+    print('{:<10} {:>12} {:>12} {:>14}'.format(
+        'backend', 'plain (ms)', 'MB/s', 'interned (ms)'
+    ))
+    for name, backend in backends:
+        plain = measure(documents, repeat, backend.loads)
+        interned = measure(documents, repeat,
+                           lambda d: backend.loads(d, intern_pairs))
+        print('{:<10} {:>12.1f} {:>12.1f} {:>14.1f}'.format(
+            name, plain * 1000, total / 1024 ** 2 / plain, interned * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
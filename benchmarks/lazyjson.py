@@ -0,0 +1,69 @@
+"""Compare eager and lazy parsing (see also :mod:`wikidata.lazyjson`) of
+the largest entity fixture, by what is read from it::
+
+    python benchmarks/lazyjson.py [REPEAT]
+
+"""
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+from wikidata.lazyjson import loads
+
+__all__ = 'main', 'measure'
+
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', 'tests', 'fixtures', 'entities',
+    'Q8646.json'
+)
+
+
+def measure(repeat: int, function: Callable[[], object]) -> float:
+    """Call the ``function`` ``repeat`` times, and return the best seconds
+    taken.
+
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with open(FIXTURE_PATH, 'rb') as f:
+        document = f.read()
+    print('{:.1f} KB of JSON, best of {}'.format(
+        len(document) / 1024, repeat
+    ))
+    claims = json.loads(document)['entities']['Q8646']['claims']
+    last_property = list(claims)[-1]
+
+    def read(parse: Callable[[bytes], Any], path: List[str]) -> object:
+        value = parse(document)
+        for key in path:
+            value = value[key]
+        return value
+
+    cases: List[Tuple[str, List[str]]] = [
+        ('label', ['entities', 'Q8646', 'labels', 'en']),
+        ('first claim', ['entities', 'Q8646', 'claims', next(iter(claims))]),
+        ('last claim', ['entities', 'Q8646', 'claims', last_property]),
+        ('sitelinks', ['entities', 'Q8646', 'sitelinks']),
+    ]
+    print('{:<12} {:>10} {:>10}'.format('read', 'eager (ms)', 'lazy (ms)'))
+    for name, path in cases:
+        eager = measure(repeat, lambda: read(json.loads, path))
+        lazy = measure(repeat, lambda: read(loads, path))
+        print('{:<12} {:>10.2f} {:>10.2f}'.format(
+            name, eager * 1000, lazy * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
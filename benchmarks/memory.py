@@ -0,0 +1,65 @@
+"""Measure memory taken by each object of the value types, e.g.,
+:class:`~wikidata.entity.Entity`, using :mod:`tracemalloc`::
+
+    python benchmarks/memory.py [COUNT]
+
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from wikidata.client import Client
+from wikidata.commonsmedia import File
+from wikidata.entity import Entity, EntityId
+from wikidata.globecoordinate import GlobeCoordinate
+from wikidata.quantity import Quantity
+
+__all__ = 'main', 'measure'
+
+
+def measure(factory: Callable[[int], object], count: int) -> float:
+    """Measure the average bytes per object made by the ``factory``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects: List[object] = [factory(i) for i in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The list itself is not what we measure:
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    client = Client()
+    unit = client.get(EntityId('Q11573'))
+    globe = client.get(EntityId('Q2'))
+    ids = [EntityId('Q{}'.format(i)) for i in range(count)]
+    titles = ['File:{}.jpg'.format(i) for i in range(count)]
+    english = {'language': 'en', 'value': 'label'}
+    factories = [
+        ('Entity', lambda i: Entity(ids[i], client)),
+        ('Entity (labels cached)', lambda i: labelled_entity(ids[i], client,
+                                                             english)),
+        ('Quantity', lambda i: Quantity(i, None, None, unit)),
+        ('GlobeCoordinate', lambda i: GlobeCoordinate(i, i, globe, 1.0)),
+        ('File', lambda i: File(client, titles[i])),
+    ]
+    print('{:<24} {:>14}'.format('type', 'bytes/object'))
+    for name, factory in factories:
+        print('{:<24} {:>14.1f}'.format(name, measure(factory, count)))
+
+
+def labelled_entity(entity_id: EntityId, client: Client,
+                    label: object) -> Entity:
+    entity = Entity(entity_id, client)
+    entity.data = {'id': entity_id, 'labels': {'en': label}}
+    entity.label
+    return entity
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,16 @@
+import collections
 import pickle
+import threading
+import time
 import typing
 
-from wikidata.cache import MemoryCachePolicy, ProxyCachePolicy
+from pytest import raises
+
+from wikidata.cache import (CacheStats, MemoryCachePolicy, NullCachePolicy,
+                            ProxyCachePolicy, RevalidatingCachePolicy,
+                            StatsCacheObject, TieredCachePolicy)
+from wikidata.cachecodec import PickleCodec
+from wikidata.client import Client
 
 
 def test_memory_cache_policy():
@@ -65,3 +74,249 @@ def test_proxy_cache_policy():
     assert mock.records[4][1][0] == 'wd/a071db2de830f9369edfcb773750ccc9'
     assert pickle.loads(mock.records[4][1][1]) == 'foo'
     assert mock.records[4][1][2] == 456
+
+
+def test_memory_cache_policy_stats():
+    m = MemoryCachePolicy(max_size=2)
+    assert m.stats().hit_ratio is None
+    assert m.stats().entries == 0
+    m.set('a', 1)
+    m.set('b', 2)
+    m.set('c', 3)
+    m.get('a')
+    m.get('c')
+    m.set('c', None)
+    m.set('d', None)
+    stats = m.stats()
+    assert isinstance(stats, CacheStats)
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_ratio == 0.5
+    assert stats.sets == 3
+    assert stats.deletes == 1
+    assert stats.evictions == 1
+    assert stats.expirations == 0
+    assert stats.entries == 1
+    assert stats.size is not None and stats.size > 0
+    m.get('b')
+    assert stats.hits == 1  # a snapshot
+    assert m.stats().hits == 2
+
+
+def test_null_cache_policy_stats():
+    assert NullCachePolicy().stats().entries == 0
+    assert NullCachePolicy().stats().lookups == 0
+    null = NullCachePolicy()
+    null.get('a')
+    null.set('a', 'b')
+    null.get('a')
+    stats = null.stats()
+    assert (stats.hits, stats.misses, stats.lookups) == (0, 2, 2)
+    assert stats.entries == 0
+    assert NullCachePolicy().stats().misses == 0
+    # Each client has its own default policy:
+    client, other = Client(), Client()
+    assert client.cache_policy is not other.cache_policy
+    client.cache_policy.get('a')
+    assert other.cache_policy.stats().misses == 0
+
+
+def test_cache_policy_unpickle_older_versions():
+    # Policies pickled by older versions have no statistics nor codecs.
+    null = pickle.loads(pickle.dumps(NullCachePolicy.__new__(NullCachePolicy)))
+    null.get('a')
+    assert null.stats().misses == 1
+    memory = MemoryCachePolicy.__new__(MemoryCachePolicy)
+    memory.__dict__.update(max_size=2, values=collections.OrderedDict(a=1))
+    memory = pickle.loads(pickle.dumps(memory))
+    assert memory.get('a') == 1
+    assert memory.stats().hits == 1
+    mock = MockCache()
+    proxy = ProxyCachePolicy.__new__(ProxyCachePolicy)
+    proxy.__dict__.update(cache_object=mock, timeout=123,
+                          property_timeout=456, namespace='wd/')
+    proxy = pickle.loads(pickle.dumps(proxy))
+    assert proxy.get('bar') == 'cached value'
+    assert isinstance(proxy.codec, PickleCodec)
+    assert proxy.stats().hits == 1
+
+
+def test_proxy_cache_policy_stats():
+    mock = MockCache()
+    proxy = ProxyCachePolicy(mock, 123, 456, 'wd/')
+    proxy.get('foo')
+    proxy.get('bar')
+    proxy.set('baz', 'asdf')
+    proxy.set('qux', None)
+    stats = proxy.stats()
+    assert (stats.hits, stats.misses, stats.sets, stats.deletes) == \
+        (1, 1, 1, 1)
+    assert stats.entries is None and stats.size is None
+
+
+def test_stats_cache_object():
+    mock = MockCache()
+    backend = StatsCacheObject(mock)
+    proxy = ProxyCachePolicy(backend, 123, 456, 'wd/')
+    proxy.set('foo', 'value')
+    proxy.set('baz', 'asdf')
+    assert proxy.get('bar') == 'cached value'
+    assert proxy.get('foo') is None  # MockCache doesn't keep it
+    proxy.set('baz', None)
+    stats = backend.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.expirations == 1
+    assert stats.sets == 2
+    assert stats.deletes == 1
+    assert stats.entries == 0
+    assert stats.size == 0
+    assert len(mock.records) == 5
+
+
+def test_tiered_cache_policy():
+    l1 = MemoryCachePolicy(max_size=1)
+    l2 = MemoryCachePolicy()
+    l3 = MemoryCachePolicy()
+    tiered = TieredCachePolicy([l1, l2, l3])
+    tiered.set('a', 1)
+    assert l1.get('a') == l2.get('a') == l3.get('a') == 1
+    tiered.set('b', 2)
+    assert l1.get('a') is None  # evicted from the first tier
+    assert tiered.get('a') == 1
+    assert l1.get('a') == 1  # promoted
+    l2.set('a', None)
+    l1.set('a', None)
+    assert tiered.get('a') == 1
+    assert l2.get('a') == 1  # promoted from the third tier
+    assert tiered.get('c') is None
+    tiered.set('a', None)
+    assert l1.get('a') is l2.get('a') is l3.get('a') is None
+    stats = tiered.stats()
+    assert (stats.hits, stats.misses, stats.sets, stats.deletes) == \
+        (2, 1, 2, 1)
+    assert [(s.hits, s.misses) for s in tiered.tier_stats()] == \
+        [(0, 3), (1, 2), (1, 1)]
+    with raises(ValueError):
+        TieredCachePolicy([])
+
+
+def test_tiered_cache_policy_negative_ttl():
+    l2 = StatsCacheObject(MockCache())
+    tiered = TieredCachePolicy([MemoryCachePolicy(),
+                                ProxyCachePolicy(l2, 0, namespace='wd/')],
+                               negative_ttl=60, max_negatives=2)
+    assert tiered.get('foo') is None
+    assert tiered.get('foo') is None
+    assert l2.stats().misses == 1
+    assert tiered.negative_hits == 1
+    assert tiered.stats().misses == 2
+    tiered.set('foo', 'value')
+    assert tiered.get('foo') == 'value'
+    tiered.get('a')
+    tiered.get('b')
+    tiered.get('c')
+    assert list(tiered.negatives) == ['b', 'c']
+    tiered.negatives['b'] = time.monotonic() - 1  # expired
+    assert tiered.get('b') is None
+    assert l2.stats().misses == 5
+    # Not remembered by default.
+    tiered = TieredCachePolicy([MemoryCachePolicy()])
+    tiered.get('foo')
+    assert not tiered.negatives
+
+
+class BlockingCachePolicy(MemoryCachePolicy):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.event = threading.Event()
+
+    def set(self, key, value) -> None:
+        self.event.wait(5)
+        if key == 'error':
+            raise IOError('failed to write')
+        super().set(key, value)
+
+
+def test_tiered_cache_policy_write_behind():
+    l1 = MemoryCachePolicy()
+    l2 = BlockingCachePolicy()
+    tiered = TieredCachePolicy([l1, l2], write_behind=True)
+    tiered.set('error', 0)
+    tiered.set('a', 1)
+    assert tiered.get('a') == 1
+    assert l2.get('a') is None  # not written yet
+    l2.event.set()
+    tiered.flush()
+    assert l2.get('a') == 1
+    assert not tiered.writes
+    tiered.flush()
+
+
+def test_tiered_cache_policy_pickle():
+    tiered = TieredCachePolicy([MemoryCachePolicy()], write_behind=True,
+                               negative_ttl=10)
+    tiered.set('a', 1)
+    loaded = pickle.loads(pickle.dumps(tiered))
+    assert loaded.get('a') == 1
+    assert loaded.write_behind
+    assert loaded.negative_ttl == 10
+
+
+def test_revalidating_cache_policy():
+    memory = MemoryCachePolicy()
+    policy = RevalidatingCachePolicy(memory, max_age=10, stale_window=5)
+    now = [1000.0]
+    policy.clock = lambda: now[0]
+    policy.set('a', 1)
+    assert memory.get('a') == (1000.0, 1)
+    assert policy.get('a') == 1
+    assert not policy.revalidate('a', lambda: None)  # fresh
+    now[0] += 12
+    assert policy.get('a') == 1  # stale
+    assert policy.stale_hits == 1
+    fetches = []
+    finish = threading.Event()
+
+    def fetch() -> None:
+        fetches.append('a')
+        finish.wait(5)
+        policy.set('a', 2)
+
+    assert policy.revalidate('a', fetch)
+    assert policy.get('a') == 1
+    assert not policy.revalidate('a', fetch)  # deduplicated
+    finish.set()
+    policy.flush()
+    assert fetches == ['a']
+    assert policy.get('a') == 2
+    assert not policy.revalidate('a', fetch)
+    assert policy.revalidations == 1
+    now[0] += 16
+    assert policy.get('a') is None  # beyond the stale window
+    assert policy.get('b') is None
+    memory.set('c', 'not an entry')
+    assert policy.get('c') is None
+    policy.set('a', None)
+    assert memory.get('a') is None
+
+
+def test_revalidating_cache_policy_error():
+    policy = RevalidatingCachePolicy(MemoryCachePolicy(), 0, 60)
+    policy.set('a', 1)
+    time.sleep(0.01)
+    assert policy.get('a') == 1
+
+    def fail() -> None:
+        raise IOError('failed to fetch')
+
+    assert policy.revalidate('a', fail)
+    policy.flush()
+    # Still stale, so revalidated again.
+    assert policy.get('a') == 1
+    assert policy.revalidate('a', fail)
+    policy.flush()
+    loaded = pickle.loads(pickle.dumps(policy))
+    assert loaded.stale_window == 60
+    assert loaded.get('a') == 1
@@ -0,0 +1,107 @@
+import json
+import marshal
+import typing
+
+from pytest import mark
+
+from wikidata.cache import (CacheKey, CacheValue, ProxyCachePolicy,
+                            StatsCacheObject)
+from wikidata.cachecodec import (CacheCodec, JsonCodec, MarshalCodec,
+                                 PickleCodec)
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.lazyjson import LazyJsonBackend, LazyObject, loads
+from wikidata.multilingual import Locale
+
+from .mock import ENTITY_FIXTURES_PATH, FixtureOpener
+
+
+class DictCache:
+
+    def __init__(self) -> None:
+        self.values: typing.Dict[str, bytes] = {}
+
+    def get(self, key: str) -> typing.Optional[bytes]:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, timeout: int = 0) -> None:
+        self.values[key] = value
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+@mark.parametrize('codec', [
+    PickleCodec(),
+    PickleCodec(2),
+    JsonCodec(),
+    JsonCodec(LazyJsonBackend()),
+    MarshalCodec(),
+])
+def test_codec_round_trip(codec: CacheCodec):
+    data = json.loads((ENTITY_FIXTURES_PATH / 'Q1299.json').read_bytes())
+    encoded = codec.encode(CacheValue(data))
+    assert isinstance(encoded, bytes)
+    assert codec.decode(encoded) == data
+
+
+@mark.parametrize('codec', [JsonCodec(), MarshalCodec()])
+def test_codec_lazy_object(codec: CacheCodec):
+    raw = (ENTITY_FIXTURES_PATH / 'Q1299.json').read_bytes()
+    lazy = loads(raw)
+    assert isinstance(lazy, LazyObject)
+    lazy['entities']['Q1299']['labels']  # type: ignore
+    assert codec.decode(codec.encode(CacheValue(lazy))) == json.loads(raw)
+
+
+def test_json_codec_original_text():
+    raw = (ENTITY_FIXTURES_PATH / 'Q1299.json').read_bytes()
+    lazy = loads(raw)
+    assert JsonCodec().encode(CacheValue(lazy)) == raw
+    decoded = JsonCodec(LazyJsonBackend()).decode(raw)
+    assert isinstance(decoded, LazyObject)
+    assert not decoded.parsed
+
+
+def test_marshal_codec_version():
+    codec = MarshalCodec()
+    encoded = codec.encode(CacheValue({'a': [1, 'b']}))
+    assert encoded.startswith(MarshalCodec.HEADER)
+    assert codec.decode(encoded) == {'a': [1, 'b']}
+    other_version = b'WDM' + bytes([marshal.version + 1]) + \
+        encoded[len(MarshalCodec.HEADER):]
+    assert codec.decode(other_version) is None
+    assert codec.decode(b'garbage') is None
+
+
+def test_proxy_cache_policy_codec():
+    cache = DictCache()
+    policy = ProxyCachePolicy(cache, 0, codec=MarshalCodec())
+    key = CacheKey('key')
+    policy.set(key, CacheValue({'a': 1}))
+    encoded, = cache.values.values()
+    assert encoded.startswith(MarshalCodec.HEADER)
+    assert policy.get(key) == {'a': 1}
+    # Entries of other formats are misses.
+    cache.values[policy.encode_key(key)] = b'WDM\0'
+    assert policy.get(key) is None
+    assert policy.stats().misses == 1
+
+
+def test_client_json_codec(fx_client_opener: FixtureOpener):
+    backend = LazyJsonBackend()
+    cache = StatsCacheObject(DictCache())
+    policy = ProxyCachePolicy(cache, 0, codec=JsonCodec(backend))
+    client = Client(opener=fx_client_opener, cache_policy=policy,
+                    json_backend=backend)
+    client.get(EntityId('Q1299'), load=True)
+    assert len(fx_client_opener.records) == 1
+    other = Client(opener=fx_client_opener, cache_policy=policy,
+                   json_backend=backend)
+    beatles = other.get(EntityId('Q1299'), load=True)
+    assert len(fx_client_opener.records) == 1
+    assert beatles.label[Locale('en')] == 'The Beatles'
+    assert isinstance(beatles.data, LazyObject)
+    size = cache.stats().size
+    raw = (ENTITY_FIXTURES_PATH / 'Q1299.json').read_bytes()
+    assert size is not None and size <= len(raw)
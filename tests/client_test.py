@@ -3,12 +3,14 @@ import pickle
 import urllib.request
 from typing import Optional, TYPE_CHECKING
 
-from wikidata.cache import CacheKey, CachePolicy, CacheValue
+from wikidata.cache import (CacheKey, CachePolicy, CacheValue,
+                            MemoryCachePolicy, RevalidatingCachePolicy)
 from wikidata.client import Client
 from wikidata.entity import Entity, EntityId, EntityState, EntityType
 from wikidata.multilingual import Locale
 
 from .mock import FixtureOpener
+from .observer_test import RecordingObserver
 
 if TYPE_CHECKING:
     from typing import Dict, Union  # noqa: F401
@@ -87,6 +89,36 @@ def test_client_cache_policy(fx_client_opener: FixtureOpener):
     assert len(fx_client_opener.records) == 2
 
 
+def test_client_revalidating_cache_policy(fx_client_opener: FixtureOpener):
+    memory = MemoryCachePolicy()
+    policy = RevalidatingCachePolicy(memory, max_age=60, stale_window=60)
+    client = Client(opener=fx_client_opener, cache_policy=policy)
+    client.get(EntityId('Q1299'), load=True)
+    assert len(fx_client_opener.records) == 1
+    url = 'https://www.wikidata.org/wiki/Special:EntityData/Q1299.json'
+    stored_at, value = memory.get(CacheKey(url))  # type: ignore
+    memory.set(CacheKey(url), CacheValue((stored_at - 90, value)))
+    # A stale value is served at once and refreshed in the background.
+    observer = RecordingObserver()
+    other = Client(opener=fx_client_opener, cache_policy=policy,
+                   observers=[observer])
+    beatles = other.get(EntityId('Q1299'), load=True)
+    assert beatles.label[Locale('en')] == 'The Beatles'
+    policy.flush()
+    assert len(fx_client_opener.records) == 2
+    # Refreshes on worker threads aren't observed.
+    assert [kind for kind, _ in observer.calls] == ['start', 'finish']
+    assert observer.calls[-1][1].cache_hit
+    assert policy.revalidations == 1
+    refreshed_at, _ = memory.get(CacheKey(url))  # type: ignore
+    assert refreshed_at >= stored_at
+    assert client.request(url) == value
+    policy.flush()
+    assert len(fx_client_opener.records) == 2
+    assert client.request(url, refresh=True) == value
+    assert len(fx_client_opener.records) == 3
+
+
 def test_client_pickle(fx_client: Client):
     dumped = pickle.dumps(fx_client)
     c = pickle.loads(dumped)
@@ -99,3 +131,134 @@ def test_client_repr():
     assert repr(Client(repr_string='repr_string test')) == 'repr_string test'
     assert repr(Client()) == \
         "wikidata.client.Client('https://www.wikidata.org/')"
+
+
+def test_client_load_entities(fx_client_opener: FixtureOpener,
+                              fx_client: Client):
+    beatles = fx_client.get(EntityId('Q1299'))
+    redirected = fx_client.get(EntityId('Q16231742'))
+    non_existent = fx_client.get(EntityId('Q1'))
+    loaded = fx_client.get(EntityId('Q494290'), load=True)
+    assert len(fx_client_opener.records) == 1
+    fx_client.load_entities([beatles, redirected, non_existent, loaded])
+    assert len(fx_client_opener.records) == 2
+    assert beatles.state is EntityState.loaded
+    assert beatles.label[Locale('en')] == 'The Beatles'
+    assert redirected.id == EntityId('Q3571994')
+    assert redirected.data is not None
+    assert non_existent.state is EntityState.non_existent
+    fx_client.load_entities([beatles, non_existent])
+    assert len(fx_client_opener.records) == 2
+
+
+def test_client_load_entities_chunks(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener)
+    client.entities_per_request = 2
+    entities = [client.get(EntityId(i)) for i in ('Q1299', 'Q20145', 'P434')]
+    client.load_entities(entities)
+    assert len(fx_client_opener.records) == 2
+    assert all(e.state is EntityState.loaded for e in entities)
+
+
+def test_client_load_entities_invalid_id(fx_client_opener: FixtureOpener,
+                                         fx_client: Client):
+    beatles = fx_client.get(EntityId('Q1299'))
+    invalid = fx_client.get(EntityId('1299'))
+    fx_client.load_entities([beatles, invalid])
+    assert beatles.state is EntityState.loaded
+    assert invalid.state is EntityState.non_existent
+
+
+def test_client_traverse(fx_client_opener: FixtureOpener, fx_client: Client):
+    human = fx_client.get(EntityId('Q5'))
+    subclass_of = fx_client.get(EntityId('P279'))
+    result = [
+        (entity.id, depth, [e.id for e in path])
+        for entity, depth, path in fx_client.traverse([human], [subclass_of])
+    ]
+    assert result == [
+        ('Q5', 0, ['Q5']),
+        ('Q154954', 1, ['Q5', 'Q154954']),
+        ('Q215627', 1, ['Q5', 'Q215627']),
+        ('Q35120', 2, ['Q5', 'Q215627', 'Q35120']),
+    ]
+    # A request per depth:
+    assert len(fx_client_opener.records) == 3
+
+
+def test_client_traverse_cycle(fx_client: Client):
+    natural_person = fx_client.get(EntityId('Q154954'))
+    result = [
+        (entity.id, depth)
+        for entity, depth, _ in fx_client.traverse(
+            [natural_person],
+            [EntityId('P460')]  # said to be the same as
+        )
+    ]
+    assert result == [('Q154954', 0), ('Q215627', 1)]
+
+
+def test_client_traverse_max_depth(fx_client: Client):
+    roots = [fx_client.get(EntityId('Q5')), fx_client.get(EntityId('Q1'))]
+    result = [
+        (entity.id, depth)
+        for entity, depth, _ in fx_client.traverse(
+            roots,
+            [EntityId('P279')],
+            max_depth=1
+        )
+    ]
+    assert result == [('Q5', 0), ('Q154954', 1), ('Q215627', 1)]
+
+
+def test_client_traverse_redirect(fx_client: Client):
+    roots = [fx_client.get(EntityId('Q16231742')),  # redirects to Q3571994
+             fx_client.get(EntityId('Q3571994'))]
+    result = [
+        (entity.id, depth)
+        for entity, depth, _ in fx_client.traverse(roots, [EntityId('P279')],
+                                                   max_depth=0)
+    ]
+    assert result == [('Q3571994', 0)]
+
+
+def test_client_get_labels(fx_client_opener: FixtureOpener,
+                           fx_client: Client):
+    ids = [EntityId('Q1299'), EntityId('Q20145'), EntityId('Q16231742'),
+           EntityId('Q1'), EntityId('1299')]
+    labels = fx_client.get_labels(ids, ['ko'])
+    # A batch, and then one by one due to the invalid id:
+    assert len(fx_client_opener.records) == 6
+    assert set(labels) == {'Q1299', 'Q20145', 'Q16231742'}
+    assert str(labels[EntityId('Q1299')]) == '비틀즈'
+    assert Locale('en') not in labels[EntityId('Q1299')]
+    assert str(labels[EntityId('Q16231742')]) == '강남'  # redirected
+    # Entities are not loaded, but their labels are filled:
+    beatles = fx_client.get(EntityId('Q1299'))
+    assert beatles.state is EntityState.not_loaded
+    assert beatles.label is labels[EntityId('Q1299')]
+    assert len(fx_client_opener.records) == 6
+    assert beatles.state is EntityState.not_loaded
+    # Languages already fetched are not fetched again:
+    fx_client.get_labels(ids[:2], ['ko'])
+    assert len(fx_client_opener.records) == 6
+    labels = fx_client.get_labels(ids[:2], ['en', 'ko'], descriptions=True)
+    assert len(fx_client_opener.records) == 7
+    assert str(labels[EntityId('Q20145')]) == 'IU'
+    assert labels[EntityId('Q20145')][Locale('ko')] == '아이유'
+    iu = fx_client.get(EntityId('Q20145'))
+    assert str(iu.description) == 'South Korean singer and actress'
+    assert iu.state is EntityState.not_loaded
+    # Loading the entity takes precedence:
+    iu.load()
+    assert iu.label is not labels[EntityId('Q20145')]
+    assert str(iu.label) == 'IU'
+
+
+def test_client_get_labels_chunks(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener)
+    client.entities_per_request = 2
+    ids = [EntityId(i) for i in ('Q1299', 'Q20145', 'P434')]
+    labels = client.get_labels(ids)
+    assert len(fx_client_opener.records) == 2
+    assert str(labels[EntityId('P434')]) == 'MusicBrainz artist ID'
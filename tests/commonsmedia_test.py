@@ -1,12 +1,16 @@
 import hashlib
 import json
 import pathlib
+import threading
 
-from pytest import fixture
+from pytest import fixture, raises
 
-from wikidata.commonsmedia import File
+from wikidata.cache import MemoryCachePolicy
+from wikidata.client import Client
+from wikidata.commonsmedia import File, FileError
+from wikidata.entity import EntityId
 
-from .mock import MEDIA_FIXTURES_PATH
+from .mock import FixtureOpener, MEDIA_FIXTURES_PATH, upload_content
 
 
 def test_file_page_url(fx_file: File):
@@ -51,3 +55,194 @@ def test_file_load(fx_file: File, fx_file_mock_path: pathlib.Path):
 def test_file_repr(fx_file: File):
     assert (repr(fx_file) ==
             "<wikidata.commonsmedia.File 'File:Gandhara Buddha (tnm).jpeg'>")
+
+
+def test_file_load_many(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener,
+                    cache_policy=MemoryCachePolicy())
+    buddha = File(client, 'File:Gandhara Buddha (tnm).jpeg')
+    normalized = File(client, 'File:Gandhara_Buddha_(tnm).jpeg')
+    redirected = File(client, 'File:Gandhara Buddha.jpeg')
+    missing = File(client, 'File:Missing.png')
+    iu = File(client,
+              'File:KBS "The Producers" press conference, 11 May 2015 10.jpg')
+    iu_copy = File(client, iu.title)
+    File.load_many([buddha, normalized, redirected, missing, iu, iu_copy])
+    assert len(fx_client_opener.records) == 1
+    assert buddha.image_size == 823440
+    assert normalized.data == buddha.data
+    assert redirected.data == buddha.data
+    assert missing.data is not None and 'missing' in missing.data
+    assert iu.data is not None and iu_copy.data is iu.data
+    # Already loaded files are skipped:
+    File.load_many([buddha, iu])
+    assert len(fx_client_opener.records) == 1
+    # The result of each title is cached:
+    File(client, redirected.title).load()
+    File(client, iu.title).load()
+    assert len(fx_client_opener.records) == 1
+
+
+def test_file_load_many_chunks(fx_client_opener: FixtureOpener,
+                               fx_client: Client,
+                               monkeypatch):
+    monkeypatch.setattr(File, 'titles_per_request', 2)
+    files = [File(fx_client, 'File:{}.png'.format(i)) for i in range(5)]
+    File.load_many(files)
+    assert len(fx_client_opener.records) == 3
+    assert all(f.data is not None for f in files)
+
+
+def test_client_load_files(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener,
+                    cache_policy=MemoryCachePolicy())
+    entities = [client.get(EntityId('Q20145')), client.get(EntityId('Q1299'))]
+    files = client.load_files(entities)
+    assert [f.title for f in files] == [
+        'File:KBS "The Producers" press conference, 11 May 2015 10.jpg',
+        'File:Beatles logo.png',
+        'File:The Fabs.JPG',
+    ]
+    assert all(f.data is not None for f in files)
+    # An entities request and a files request:
+    assert len(fx_client_opener.records) == 2
+    # Files decoded again are loaded from the cache:
+    image = entities[0][client.get(EntityId('P18'))]
+    assert isinstance(image, File) and image is not files[0]
+    assert image.image_resolution == files[0].image_resolution
+    assert len(fx_client_opener.records) == 2
+
+
+def test_file_load_thumbnail_urls(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener)
+    titles = [
+        'File:Gandhara Buddha (tnm).jpeg',
+        'File:KBS "The Producers" press conference, 11 May 2015 10.jpg',
+        'File:Missing_file.png',
+    ]
+    files = [File(client, title) for title in titles]
+    File.load_thumbnail_urls(files, 200)
+    assert len(fx_client_opener.records) == 1
+    assert all(f.data is not None for f in files[:2])
+    assert files[0].thumbnail_url(200) == (
+        'https://upload.wikimedia.org/wikipedia/commons/thumb/b/b8/'
+        'Gandhara_Buddha_%28tnm%29.jpeg/200px-Gandhara_Buddha_%28tnm%29.jpeg'
+    )
+    assert files[1].thumbnail_url(200) is not None
+    assert files[2].thumbnail_url(200) is None
+    assert len(fx_client_opener.records) == 1
+    # Already resolved:
+    File.load_thumbnail_urls(files, 200)
+    assert len(fx_client_opener.records) == 1
+    # Thumbnails of other width aren't:
+    File.load_thumbnail_urls(files, 100)
+    assert len(fx_client_opener.records) == 2
+
+
+def test_file_open(fx_client_opener: FixtureOpener, fx_file: File):
+    content = upload_content(fx_file.image_url or '')
+    with fx_file.open() as f:
+        assert f.read() == content
+    with fx_file.open(offset=1000) as f:
+        assert f.read() == content[1000:]
+    with fx_file.open(width=200) as f:
+        thumbnail = f.read()
+    assert thumbnail != content[:len(thumbnail)]
+    assert fx_client_opener.records[-1][0].endswith(
+        '/thumb/b/b8/Gandhara_Buddha_%28tnm%29.jpeg/'
+        '200px-Gandhara_Buddha_%28tnm%29.jpeg'
+    )
+
+
+def test_file_download(fx_client_opener: FixtureOpener, fx_file: File,
+                       tmp_path: pathlib.Path):
+    content = upload_content(fx_file.image_url or '')
+    path = tmp_path / 'buddha.jpeg'
+    assert fx_file.download(path, chunk_size=4096) == len(content)
+    assert path.read_bytes() == content
+    records = len(fx_client_opener.records)
+    # Already complete:
+    assert fx_file.download(path) == len(content)
+    assert len(fx_client_opener.records) == records
+    # Resume an interrupted download:
+    path.write_bytes(content[:5000])
+    assert fx_file.download(path) == len(content)
+    assert path.read_bytes() == content
+    assert len(fx_client_opener.records) == records + 1
+    # Not resumed:
+    path.write_bytes(b'garbage')
+    assert fx_file.download(path, resume=False) == len(content)
+    assert path.read_bytes() == content
+    # Thumbnail:
+    thumbnail_path = tmp_path / 'thumbnail.jpeg'
+    size = fx_file.download(thumbnail_path, width=200)
+    assert size == thumbnail_path.stat().st_size
+    assert fx_file.download(thumbnail_path, width=200) == size  # 416
+    # A stale thumbnail larger than the remote one is downloaded again:
+    thumbnail_path.write_bytes(b'x' * (size + 10))
+    assert fx_file.download(thumbnail_path, width=200) == size
+    assert thumbnail_path.stat().st_size == size
+    # So is a stale image larger than the remote one, without a 416:
+    path.write_bytes(content + b'garbage')
+    records = len(fx_client_opener.records)
+    assert fx_file.download(path) == len(content)
+    assert path.read_bytes() == content
+    assert len(fx_client_opener.records) == records + 1
+
+
+def test_file_download_not_image(fx_client: Client, tmp_path: pathlib.Path):
+    with raises(FileError):
+        File(fx_client, 'File:Missing_file.png').download(tmp_path / 'x')
+
+
+def test_file_download_many(fx_client_opener: FixtureOpener,
+                            tmp_path: pathlib.Path):
+    client = Client(opener=fx_client_opener)
+    titles = [
+        'File:Gandhara Buddha (tnm).jpeg',
+        'File:KBS "The Producers" press conference, 11 May 2015 10.jpg',
+    ]
+    files = [File(client, title) for title in titles * 3]
+    result = dict(File.download_many(
+        ((f, tmp_path / str(i)) for i, f in enumerate(files)),
+        max_workers=2
+    ))
+    assert set(result) == set(files)
+    for i, f in enumerate(files):
+        content = upload_content(f.image_url or '')
+        assert result[f] == len(content)
+        assert (tmp_path / str(i)).read_bytes() == content
+    # A metadata request and a request per file:
+    assert len(fx_client_opener.records) == 1 + len(files)
+
+
+def test_file_download_many_thumbnails(fx_client_opener: FixtureOpener,
+                                       tmp_path: pathlib.Path):
+    threads = set()
+
+    class RecordingClient(Client):
+
+        def request(self, *args, **kwargs):
+            threads.add(threading.current_thread())
+            return super().request(*args, **kwargs)
+
+    client = RecordingClient(opener=fx_client_opener)
+    titles = [
+        'File:Gandhara Buddha (tnm).jpeg',
+        'File:KBS "The Producers" press conference, 11 May 2015 10.jpg',
+    ]
+    files = [File(client, title) for title in titles * 3]
+    result = dict(File.download_many(
+        ((f, tmp_path / str(i)) for i, f in enumerate(files)),
+        max_workers=2,
+        width=200
+    ))
+    assert set(result) == set(files)
+    for i, f in enumerate(files):
+        content = upload_content(f.thumbnail_url(200) or '')
+        assert result[f] == len(content)
+        assert (tmp_path / str(i)).read_bytes() == content
+    # A metadata request, a thumbnail url request, and a request per file:
+    assert len(fx_client_opener.records) == 2 + len(files)
+    # Requests through the client aren't made by worker threads:
+    assert threads == {threading.current_thread()}
@@ -0,0 +1,118 @@
+import json
+import typing
+
+from wikidata.cache import (CacheKey, CacheValue, MemoryCachePolicy,
+                            NullCachePolicy)
+from wikidata.cachecodec import JsonCodec, MarshalCodec, PickleCodec
+from wikidata.client import Client
+from wikidata.compression import (CompressedCachePolicy, CompressionStats,
+                                  dictionary_id, train_dictionary)
+from wikidata.entity import EntityId
+from wikidata.multilingual import Locale
+
+from .mock import ENTITY_FIXTURES_PATH, FixtureOpener
+
+
+def load_samples() -> typing.List[bytes]:
+    codec = JsonCodec()
+    return [
+        codec.encode(CacheValue(json.loads(path.read_bytes())))
+        for path in sorted(ENTITY_FIXTURES_PATH.glob('*.json'))
+    ]
+
+
+def test_train_dictionary():
+    samples = load_samples()
+    dictionary = train_dictionary(samples)
+    assert 0 < len(dictionary) <= 32 * 1024
+    assert dictionary.endswith(samples[-1][:4096])
+    assert len(train_dictionary(samples, 1024)) == 1024
+    assert train_dictionary([]) == b''
+    assert dictionary_id(None) == dictionary_id(b'') == 0
+    assert dictionary_id(dictionary) != 0
+
+
+def test_compressed_cache_policy():
+    samples = load_samples()
+    # Leave out the largest entity from training.
+    dictionary = train_dictionary(s for s in samples if len(s) < 400000)
+    memory = MemoryCachePolicy()
+    plain = CompressedCachePolicy(MemoryCachePolicy())
+    policy = CompressedCachePolicy(memory, dictionary)
+    key = CacheKey('Q8646')
+    value = CacheValue(json.loads(max(samples, key=len)))
+    for p in (plain, policy):
+        p.set(key, value)
+        assert p.get(key) == value
+    stored = memory.get(key)
+    assert isinstance(stored, bytes)
+    assert stored[:3] == b'WDZ'
+    stats = policy.compression_stats()
+    assert stats.compressions == stats.decompressions == 1
+    assert stats.raw_size == len(json.dumps(value, ensure_ascii=False,
+                                            separators=(',', ':')).encode())
+    assert stats.compressed_size == len(stored)
+    assert stats.ratio is not None and stats.ratio > 4
+    assert stats.compress_time > 0 and stats.decompress_time > 0
+    assert stats.compressed_size < \
+        plain.compression_stats().compressed_size
+    assert policy.stats().entries == 1
+    policy.set(key, None)
+    assert policy.get(key) is None
+    assert memory.get(key) is None
+    assert CompressionStats().ratio is None
+
+
+def test_compressed_cache_policy_dictionary_version():
+    samples = load_samples()
+    old = train_dictionary(samples[:8])
+    new = train_dictionary(samples[8:])
+    memory = MemoryCachePolicy()
+    key = CacheKey('key')
+    CompressedCachePolicy(memory, old).set(key, CacheValue({'a': 1}))
+    assert CompressedCachePolicy(memory, new).get(key) is None
+    rotated = CompressedCachePolicy(memory, new, old_dictionaries=[old])
+    assert rotated.get(key) == {'a': 1}
+    rotated.set(key, CacheValue({'a': 2}))
+    assert CompressedCachePolicy(memory, old).get(key) is None
+    # Values not compressed by the policy are misses as well.
+    memory.set(key, CacheValue({'a': 3}))
+    assert rotated.get(key) is None
+    memory.set(key, CacheValue(b'WDZ'))
+    assert rotated.get(key) is None
+    assert rotated.compression_stats().rejections == 2
+    assert CompressedCachePolicy(NullCachePolicy()).get(key) is None
+
+
+def test_compressed_cache_policy_codec():
+    memory = MemoryCachePolicy()
+    policy = CompressedCachePolicy(memory, codec=MarshalCodec())
+    policy.set(CacheKey('key'), CacheValue({'a': (1, 2)}))
+    assert policy.get(CacheKey('key')) == {'a': (1, 2)}
+
+
+def test_compressed_cache_policy_undecodable():
+    memory = MemoryCachePolicy()
+    key = CacheKey('key')
+    CompressedCachePolicy(memory).set(key, CacheValue({'a': 1}))
+    # Values which the codec fails to decode are rejected as well:
+    for codec in PickleCodec(), MarshalCodec():
+        policy = CompressedCachePolicy(memory, codec=codec)
+        assert policy.get(key) is None
+    policy = CompressedCachePolicy(memory)
+    data = memory.get(key)
+    assert isinstance(data, bytes)
+    memory.set(key, CacheValue(data[:-4]))  # truncated
+    assert policy.get(key) is None
+    assert policy.compression_stats().rejections == 1
+
+
+def test_client_compressed_cache_policy(fx_client_opener: FixtureOpener):
+    policy = CompressedCachePolicy(MemoryCachePolicy(),
+                                   train_dictionary(load_samples()))
+    client = Client(opener=fx_client_opener, cache_policy=policy)
+    client.get(EntityId('Q1299'), load=True)
+    other = Client(opener=fx_client_opener, cache_policy=policy)
+    beatles = other.get(EntityId('Q1299'), load=True)
+    assert len(fx_client_opener.records) == 1
+    assert beatles.label[Locale('en')] == 'The Beatles'
@@ -0,0 +1,127 @@
+import logging
+import pickle
+from typing import List
+
+from pytest import LogCaptureFixture
+
+from wikidata.cache import MemoryCachePolicy
+from wikidata.client import Client
+from wikidata.diagnostics import NPlusOneDetector, NPlusOneReport
+from wikidata.entity import Entity, EntityId
+
+from .mock import FixtureOpener
+
+
+ENTITY_IDS = ['Q1299', 'Q20145', 'Q494290', 'Q8646', 'Q33281', 'P434']
+
+
+def test_n_plus_one_detector(fx_client_opener: FixtureOpener):
+    reports: List[NPlusOneReport] = []
+    detector = NPlusOneDetector(threshold=3, callback=reports.append)
+    client = Client(opener=fx_client_opener, observers=[detector])
+    entities = [client.get(EntityId(i)) for i in ENTITY_IDS]
+    for entity in entities:
+        entity.label  # N+1
+    assert len(reports) == 1
+    report, = reports
+    assert detector.reports == [report]
+    assert report.count == len(ENTITY_IDS)
+    assert report.entity_ids == ENTITY_IDS
+    assert report.call_site[0] == __file__
+    assert report.call_site[2] == 'test_n_plus_one_detector'
+    assert report.stack[-1].line == 'entity.label  # N+1'
+    assert 'Client.load_entities()' in report.message
+    assert __file__ in report.message
+
+
+def test_n_plus_one_detector_ignores_batches(fx_client_opener: FixtureOpener):
+    detector = NPlusOneDetector(threshold=2, callback=lambda r: None)
+    client = Client(opener=fx_client_opener,
+                    cache_policy=MemoryCachePolicy(),
+                    observers=[detector])
+    entities = [client.get(EntityId(i)) for i in ENTITY_IDS]
+    client.load_entities(entities)
+    for entity in entities:
+        entity.label
+    assert not detector.reports
+    # Cache hits are not counted:
+    entities[0].unload()
+    entities[0].load()
+    entities[1].unload()
+    entities[1].load()
+    for entity in entities[:2]:
+        entity.unload()
+        entity.load()
+    assert not detector.reports
+
+
+def test_n_plus_one_detector_ignores_partial_batches(
+    fx_client_opener: FixtureOpener
+):
+    detector = NPlusOneDetector(threshold=2, callback=lambda r: None)
+    client = Client(opener=fx_client_opener, observers=[detector])
+    client.entities_per_request = 2
+    for offset in range(0, len(ENTITY_IDS), 3):
+        # The last batch of each call has only an entity:
+        client.load_entities(client.get(EntityId(i))
+                             for i in ENTITY_IDS[offset:offset + 3])
+    assert len(fx_client_opener.records) == 4
+    assert not detector.reports
+
+
+def test_n_plus_one_detector_call_sites(fx_client_opener: FixtureOpener):
+    detector = NPlusOneDetector(threshold=3, callback=lambda r: None)
+    client = Client(opener=fx_client_opener, observers=[detector])
+
+    def load(entity: Entity) -> None:
+        entity.load()
+    for i, entity_id in enumerate(ENTITY_IDS):
+        # Alternate call sites are tracked separately:
+        if i % 2:
+            load(client.get(EntityId(entity_id)))
+        else:
+            client.get(EntityId(entity_id)).load()
+    assert len(detector.reports) == 2
+    assert {r.call_site[2] for r in detector.reports} == {
+        'load', 'test_n_plus_one_detector_call_sites'
+    }
+    assert [r.count for r in detector.reports] == [3, 3]
+
+
+def test_n_plus_one_detector_window(fx_client_opener: FixtureOpener):
+    detector = NPlusOneDetector(threshold=2, window=0,
+                                callback=lambda r: None)
+    client = Client(opener=fx_client_opener, observers=[detector])
+    for entity_id in ENTITY_IDS:
+        client.get(EntityId(entity_id)).load()
+    assert not detector.reports
+
+
+def test_n_plus_one_detector_skips_stdlib(fx_client_opener: FixtureOpener):
+    detector = NPlusOneDetector(threshold=3, callback=lambda r: None)
+    client = Client(opener=fx_client_opener, observers=[detector])
+    entities = [client.get(EntityId(i)) for i in ENTITY_IDS]
+    for entity in entities:
+        entity.get(client.get(EntityId('P31')))  # through Mapping.get()
+    report, = detector.reports
+    assert report.call_site[0] == __file__
+    assert report.call_site[2] == 'test_n_plus_one_detector_skips_stdlib'
+    assert all(frame.filename != '<frozen _collections_abc>'
+               for frame in report.stack)
+
+
+def test_n_plus_one_detector_log(fx_client_opener: FixtureOpener,
+                                 caplog: LogCaptureFixture):
+    client = Client(opener=fx_client_opener, observers=[NPlusOneDetector()])
+    with caplog.at_level(logging.WARNING, logger='wikidata.diagnostics'):
+        for entity_id in ENTITY_IDS:
+            client.get(EntityId(entity_id), load=True)
+    assert len(caplog.records) == 1
+    assert 'Client.load_entities()' in caplog.records[0].getMessage()
+
+
+def test_n_plus_one_detector_pickle():
+    detector = NPlusOneDetector(threshold=2, callback=lambda r: None)
+    unpickled = pickle.loads(pickle.dumps(detector))
+    assert unpickled.threshold == 2
+    assert unpickled.callback is None
@@ -1,3 +1,4 @@
+import gc
 import json
 import pickle
 import urllib.request
@@ -6,10 +7,10 @@ from typing import Iterable
 from pytest import raises
 
 from wikidata.client import Client
-from wikidata.entity import Entity, EntityId, EntityType
-from wikidata.multilingual import Locale, MultilingualText
+from wikidata.entity import Entity, EntityId, EntityState, EntityType
+from wikidata.multilingual import LanguageFallback, Locale, MultilingualText
 
-from .mock import ENTITY_FIXTURES_PATH
+from .mock import ENTITY_FIXTURES_PATH, FixtureOpener
 
 
 def test_entity_equality(fx_client_opener: urllib.request.OpenerDirector,
@@ -179,3 +180,65 @@ def test_entity_getlist_novalue(fx_client: Client):
     locator_map_image = fx_client.get(EntityId('P242'))
     # There are 3 snaks for this property, but one has no associated value
     assert len(hong_kong.getlist(locator_map_image)) == 2
+
+
+def test_entity_unload(fx_client_opener: FixtureOpener, fx_client: Client):
+    entity = fx_client.get(EntityId('Q1299'), load=True)
+    assert entity.label[Locale('en')] == 'The Beatles'
+    records = len(fx_client_opener.records)
+    entity.unload()
+    assert entity.state is EntityState.not_loaded
+    assert entity.data is None
+    assert entity is fx_client.get(EntityId('Q1299'))
+    assert len(fx_client_opener.records) == records
+    assert entity.label[Locale('en')] == 'The Beatles'
+    assert entity.state is EntityState.loaded
+    assert len(fx_client_opener.records) == records + 1
+    missing = fx_client.get(EntityId('1299'), load=True)  # http 400
+    missing.unload()
+    assert missing.state is EntityState.non_existent
+
+
+def test_entity_label_language_fallback(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener,
+                    language_fallback=LanguageFallback(['ko-kp']))
+    entity = client.get(EntityId('Q494290'), load=True)
+    assert entity.label.fallback is client.language_fallback
+    assert str(entity.label) == entity.label[Locale('ko')]
+    assert pickle.loads(pickle.dumps(client)).language_fallback.locales == \
+        ('ko-kp', 'ko', 'en')
+
+
+def test_entity_linked_ids(fx_client: Client):
+    km = fx_client.get(EntityId('Q828224'))
+    assert km.linked_ids() == ['P31', 'Q1978718', 'P2370', 'Q11573']
+    hong_kong = fx_client.get(EntityId('Q8646'))
+    linked_ids = hong_kong.linked_ids()
+    assert len(linked_ids) == len(set(linked_ids))
+    assert 'Q8646' not in linked_ids
+    assert 'P625' in linked_ids
+    assert 'Q2' in linked_ids  # globe
+    assert 'P1001' in linked_ids  # qualifier only
+
+
+def test_entity_expand(fx_client_opener: FixtureOpener, fx_client: Client):
+    human = fx_client.get(EntityId('Q5'))
+    expanded = human.expand()
+    assert [e.id for e in expanded] == ['P279', 'Q154954', 'Q215627']
+    assert len(fx_client_opener.records) == 2
+    assert all(e.state is not EntityState.not_loaded for e in expanded)
+    assert human.expand() == expanded
+    assert len(fx_client_opener.records) == 2  # loaded ones are skipped
+    del fx_client_opener.records[:]
+    expanded = fx_client.get(EntityId('Q154954')).expand(depth=2)
+    assert [e.id for e in expanded] == ['P279', 'Q215627', 'P460', 'Q35120']
+    assert len(fx_client_opener.records) == 2  # a request per depth
+
+
+def test_client_get_expand(fx_client_opener: FixtureOpener, fx_client: Client):
+    human = fx_client.get(EntityId('Q5'), expand=1)
+    assert human.state is EntityState.loaded
+    # Expanded entities are kept alive as long as the entity lives:
+    gc.collect()
+    assert fx_client.get(EntityId('Q154954')).state is EntityState.loaded
+    assert len(fx_client_opener.records) == 2
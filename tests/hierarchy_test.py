@@ -0,0 +1,108 @@
+import io
+
+from pytest import fixture, raises
+
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.hierarchy import ClassHierarchy, ClassHierarchyIdentityMap
+from wikidata.identitymap import LRUIdentityMap
+
+from .mock import FixtureOpener
+
+
+@fixture
+def fx_hierarchy(fx_client: Client) -> ClassHierarchy:
+    hierarchy = ClassHierarchy()
+    human = fx_client.get(EntityId('Q5'))
+    subclass_of = fx_client.get(EntityId('P279'))
+    for cls, _, _ in fx_client.traverse([human], [subclass_of]):
+        hierarchy.add(cls)
+    return hierarchy
+
+
+def test_class_hierarchy_is_subclass(fx_client: Client,
+                                     fx_hierarchy: ClassHierarchy):
+    assert fx_hierarchy.is_subclass(EntityId('Q5'), EntityId('Q35120'))
+    assert fx_hierarchy.is_subclass(EntityId('Q154954'), EntityId('Q215627'))
+    assert fx_hierarchy.is_subclass(EntityId('Q5'), EntityId('Q5'))
+    assert fx_hierarchy.is_subclass(fx_client.get(EntityId('Q5')),
+                                    fx_client.get(EntityId('Q215627')))
+    assert not fx_hierarchy.is_subclass(EntityId('Q35120'), EntityId('Q5'))
+    assert not fx_hierarchy.is_subclass(EntityId('Q215627'),
+                                        EntityId('Q154954'))
+    assert not fx_hierarchy.is_subclass(EntityId('Q1'), EntityId('Q5'))
+    assert fx_hierarchy.is_subclass(EntityId('Q1'), EntityId('Q1'))
+    assert sorted(fx_hierarchy.ancestor_ids(EntityId('Q154954'))) == \
+        ['Q154954', 'Q215627', 'Q35120']
+    assert len(fx_hierarchy) == 4
+    assert EntityId('Q5') in fx_hierarchy
+
+
+def test_class_hierarchy_is_instance(fx_client: Client,
+                                     fx_hierarchy: ClassHierarchy):
+    shin = fx_client.get(EntityId('Q494290'))
+    beatles = fx_client.get(EntityId('Q1299'))
+    assert fx_hierarchy.is_instance(shin, EntityId('Q215627'))
+    assert not fx_hierarchy.is_instance(beatles, EntityId('Q215627'))
+
+
+def test_class_hierarchy_incremental():
+    h = ClassHierarchy()
+    h.set_parents(EntityId('Q3'), [EntityId('Q4')])
+    h.set_parents(EntityId('Q1'), [EntityId('Q2')])
+    assert not h.is_subclass(EntityId('Q1'), EntityId('Q4'))
+    h.set_parents(EntityId('Q2'), [EntityId('Q3')])
+    assert h.is_subclass(EntityId('Q1'), EntityId('Q4'))
+    # Cycles
+    h.set_parents(EntityId('Q4'), [EntityId('Q1')])
+    assert h.is_subclass(EntityId('Q4'), EntityId('Q2'))
+    assert h.is_subclass(EntityId('Q1'), EntityId('Q4'))
+    # Removing relations
+    h.set_parents(EntityId('Q2'), [])
+    assert not h.is_subclass(EntityId('Q1'), EntityId('Q3'))
+    assert not h.is_subclass(EntityId('Q1'), EntityId('Q4'))
+    assert h.is_subclass(EntityId('Q4'), EntityId('Q2'))
+    assert h.is_subclass(EntityId('Q3'), EntityId('Q2'))
+
+
+def test_class_hierarchy_identity_map(fx_client_opener: FixtureOpener):
+    hierarchy = ClassHierarchy()
+    lru = LRUIdentityMap(2)
+    identity_map = ClassHierarchyIdentityMap(hierarchy, lru)
+    client = Client(opener=fx_client_opener, identity_map=identity_map)
+    human = client.get(EntityId('Q5'), load=True)
+    assert EntityId('Q5') in hierarchy
+    assert EntityId('Q5') in identity_map and len(identity_map) == len(lru)
+    assert not hierarchy.is_subclass(EntityId('Q5'), EntityId('Q35120'))
+    # Loading superclasses updates the closure:
+    list(client.traverse([human], [client.get(EntityId('P279'))]))
+    assert hierarchy.is_subclass(EntityId('Q5'), EntityId('Q35120'))
+    # Entities which are not classes are not added:
+    client.get(EntityId('Q8646'), load=True)
+    assert EntityId('Q8646') not in hierarchy
+
+
+def test_class_hierarchy_save_load(fx_hierarchy: ClassHierarchy):
+    buffer = io.BytesIO()
+    fx_hierarchy.save(buffer)
+    buffer.seek(0)
+    loaded = ClassHierarchy.load(buffer)
+    assert loaded.classes == fx_hierarchy.classes
+    assert loaded.is_subclass(EntityId('Q5'), EntityId('Q35120'))
+    assert not loaded.is_subclass(EntityId('Q35120'), EntityId('Q5'))
+    loaded.set_parents(EntityId('Q35120'), [EntityId('Q7184903')])
+    assert loaded.is_subclass(EntityId('Q5'), EntityId('Q7184903'))
+    empty = io.BytesIO()
+    ClassHierarchy().save(empty)
+    empty.seek(0)
+    assert len(ClassHierarchy.load(empty)) == 0
+    with raises(ValueError):
+        ClassHierarchy.load(io.BytesIO(b'invalid'))
+
+
+def test_class_hierarchy_save_load_path(tmp_path,
+                                        fx_hierarchy: ClassHierarchy):
+    path = str(tmp_path / 'classes.bin')
+    fx_hierarchy.save(path)
+    loaded = ClassHierarchy.load(path)
+    assert loaded.is_subclass(EntityId('Q154954'), EntityId('Q35120'))
@@ -0,0 +1,171 @@
+import gc
+import pickle
+
+from pytest import MonkeyPatch
+
+from wikidata import identitymap
+from wikidata.client import Client
+from wikidata.entity import Entity, EntityId, EntityState
+from wikidata.identitymap import (LRUIdentityMap, MemoryBudgetIdentityMap,
+                                  WeakIdentityMap, approximate_size)
+from wikidata.multilingual import Locale
+
+from .mock import FixtureOpener
+
+
+def test_approximate_size():
+    shared = 'x' * 1000
+    assert approximate_size(shared) >= 1000
+    assert approximate_size([shared, shared]) < 2000
+    assert approximate_size({'a': [shared], 'b': ('y' * 1000,)}) > 2000
+
+
+def test_weak_identity_map(fx_client: Client):
+    identity_map = WeakIdentityMap()
+    entity = Entity(EntityId('Q1299'), fx_client)
+    identity_map[entity.id] = entity
+    assert identity_map[EntityId('Q1299')] is entity
+    assert list(identity_map) == ['Q1299']
+    assert len(identity_map) == 1
+    del entity
+    gc.collect()
+    assert EntityId('Q1299') not in identity_map
+    assert len(identity_map) == 0
+
+
+def test_lru_identity_map_max_size(fx_client: Client):
+    identity_map = LRUIdentityMap(max_size=2)
+    for i in range(1, 4):
+        entity_id = EntityId('Q{}'.format(i))
+        identity_map[entity_id] = Entity(entity_id, fx_client)
+    gc.collect()
+    assert set(identity_map) == {'Q2', 'Q3'}
+    identity_map[EntityId('Q2')]  # touch
+    identity_map[EntityId('Q4')] = Entity(EntityId('Q4'), fx_client)
+    gc.collect()
+    assert set(identity_map) == {'Q2', 'Q4'}
+    del identity_map[EntityId('Q2')]
+    assert list(identity_map.retained) == ['Q4']
+
+
+def test_lru_identity_map_max_bytes(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener,
+                    identity_map=LRUIdentityMap(max_size=None,
+                                                max_bytes=1000000))
+    identity_map = client.identity_map
+    assert isinstance(identity_map, LRUIdentityMap)
+    client.get(EntityId('Q1299'), load=True)
+    client.get(EntityId('Q494290'), load=True)
+    gc.collect()
+    assert set(identity_map) == {'Q1299', 'Q494290'}
+    assert 0 < identity_map.retained_bytes <= 1000000
+    # Hong Kong is large enough to evict all the others:
+    client.get(EntityId('Q8646'), load=True)
+    gc.collect()
+    assert set(identity_map) == {'Q8646'}
+    assert identity_map.retained_bytes > 1000000
+
+
+def test_lru_identity_map_measures_once(fx_client_opener: FixtureOpener,
+                                        monkeypatch: MonkeyPatch):
+    identity_map = LRUIdentityMap(max_size=None, max_bytes=10 ** 9)
+    client = Client(opener=fx_client_opener, identity_map=identity_map)
+    measured = []
+
+    def measure(value: object) -> int:
+        measured.append(value)
+        return approximate_size(value)
+    monkeypatch.setattr(identitymap, 'approximate_size', measure)
+    hong_kong = client.get(EntityId('Q8646'), load=True)
+    assert len(measured) == 1  # when loaded
+    size = identity_map.retained_bytes
+    for _ in range(10):
+        assert client.get(EntityId('Q8646')) is hong_kong
+    assert len(measured) == 1
+    assert identity_map.retained_bytes == size
+
+
+def test_lru_identity_map_redirect(fx_client_opener: FixtureOpener):
+    identity_map = LRUIdentityMap(max_size=None, max_bytes=1000000)
+    client = Client(opener=fx_client_opener, identity_map=identity_map)
+    redirected = client.get(EntityId('Q16231742'), load=True)
+    assert redirected.id == EntityId('Q3571994')
+    # The load is measured under the key the entity is retained under:
+    assert identity_map.sizes[EntityId('Q16231742')] > 0
+    assert identity_map.retained_bytes >= \
+        identity_map.sizes[EntityId('Q16231742')]
+    redirected.unload()
+    assert identity_map.sizes[EntityId('Q16231742')] == 0
+
+
+def test_client_identity_map_retains_loaded_data(
+    fx_client_opener: FixtureOpener
+):
+    client = Client(opener=fx_client_opener, identity_map=LRUIdentityMap())
+    client.get(EntityId('Q1299'), load=True)
+    gc.collect()
+    assert client.get(EntityId('Q1299')).data is not None
+    assert len(fx_client_opener.records) == 1
+
+
+def test_identity_map_pickle(fx_client: Client):
+    identity_map = LRUIdentityMap(max_size=3, max_bytes=1024)
+    identity_map[EntityId('Q1299')] = fx_client.get(EntityId('Q1299'))
+    loaded = pickle.loads(pickle.dumps(identity_map))
+    assert isinstance(loaded, LRUIdentityMap)
+    assert (loaded.max_size, loaded.max_bytes) == (3, 1024)
+    assert len(loaded) == 0
+    client = pickle.loads(pickle.dumps(
+        Client(identity_map=LRUIdentityMap(max_size=5))
+    ))
+    assert isinstance(client.identity_map, LRUIdentityMap)
+    assert client.identity_map.max_size == 5
+
+
+def test_memory_budget_identity_map(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener,
+                    identity_map=MemoryBudgetIdentityMap(500000))
+    identity_map = client.identity_map
+    assert isinstance(identity_map, MemoryBudgetIdentityMap)
+    hong = client.get(EntityId('Q494290'), load=True)
+    iu = client.get(EntityId('Q20145'), load=True)
+    assert hong.state is EntityState.loaded
+    assert iu.state is EntityState.loaded
+    assert 0 < identity_map.loaded_bytes <= 500000
+    hong.attributes  # touch; IU becomes the least recently used
+    beatles = client.get(EntityId('Q1299'), load=True)
+    assert iu.state is EntityState.not_loaded
+    assert iu.data is None
+    assert hong.state is EntityState.loaded
+    assert beatles.state is EntityState.loaded
+    assert identity_map.loaded_bytes == \
+        identity_map.sizes[id(hong)] + identity_map.sizes[id(beatles)]
+    # Unloaded entities are lazily loaded again:
+    records = len(fx_client_opener.records)
+    assert iu.label[Locale('en')] == 'IU'
+    assert len(fx_client_opener.records) == records + 1
+    assert iu.state is EntityState.loaded
+    assert pickle.loads(pickle.dumps(identity_map)).max_bytes == 500000
+
+
+def test_memory_budget_identity_map_redirect(fx_client_opener: FixtureOpener):
+    identity_map = MemoryBudgetIdentityMap(10 ** 9)
+    client = Client(opener=fx_client_opener, identity_map=identity_map)
+    canon = client.get(EntityId('Q3571994'))
+    redirected = client.get(EntityId('Q16231742'), load=True)
+    assert canon.state is EntityState.loaded
+    # Both the redirect and its canonical entity are counted:
+    assert set(identity_map.loaded_entities) == {id(redirected), id(canon)}
+    assert identity_map.loaded_bytes == \
+        identity_map.sizes[id(redirected)] + identity_map.sizes[id(canon)]
+
+
+def test_memory_budget_identity_map_forgets_collected(
+    fx_client_opener: FixtureOpener
+):
+    identity_map = MemoryBudgetIdentityMap(10 ** 9)
+    client = Client(opener=fx_client_opener, identity_map=identity_map)
+    client.get(EntityId('Q1299'), load=True)
+    gc.collect()
+    assert identity_map.loaded_bytes == 0
+    assert not identity_map.loaded_entities
@@ -0,0 +1,95 @@
+import io
+import json
+
+from pytest import raises
+
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.index import PostingList, PropertyValueIndex, snak_value_key
+
+from .mock import ENTITY_FIXTURES_PATH
+
+
+def test_posting_list():
+    p = PostingList([5, 1, 300, 1, 70000])
+    assert list(p) == [1, 5, 300, 70000]
+    assert len(p) == 4
+    assert 300 in p
+    assert 301 not in p
+    assert 0 not in p
+    assert 'a' not in p
+    p.append(70001)
+    with raises(ValueError):
+        p.append(3)
+    p.add(3)
+    p.add(5)
+    assert list(p) == [1, 3, 5, 300, 70000, 70001]
+    assert len(p) == 6
+    assert p == PostingList([70001, 70000, 300, 5, 3, 1])
+    assert repr(PostingList([2, 1])) == 'wikidata.index.PostingList([1, 2])'
+
+
+def test_posting_list_operators():
+    a = PostingList([1, 2, 3, 5, 8, 13, 21])
+    b = PostingList([2, 3, 4, 8, 16, 32])
+    assert list(a & b) == [2, 3, 8]
+    assert list(a | b) == [1, 2, 3, 4, 5, 8, 13, 16, 21, 32]
+    assert list(a & PostingList()) == []
+    assert list(PostingList() | b) == list(b)
+
+
+def test_snak_value_key():
+    assert snak_value_key({
+        'snaktype': 'value',
+        'datavalue': {
+            'type': 'wikibase-entityid',
+            'value': {'entity-type': 'item', 'numeric-id': 5, 'id': 'Q5'},
+        },
+    }) == 'Q5'
+    assert snak_value_key({
+        'snaktype': 'value',
+        'datavalue': {'type': 'string', 'value': 'abc'},
+    }) == 'abc'
+    assert snak_value_key({
+        'snaktype': 'value',
+        'datavalue': {'type': 'quantity', 'value': {'amount': '+1'}},
+    }) is None
+    assert snak_value_key({'snaktype': 'novalue'}) is None
+
+
+def test_property_value_index(fx_client: Client):
+    index = PropertyValueIndex()
+    for entity_id in 'Q494290', 'Q1299', 'Q20145':
+        index.add(fx_client.get(EntityId(entity_id)))
+    assert index.documents == ['Q494290', 'Q1299', 'Q20145']
+    human = EntityId('P31'), 'Q5'
+    korea = EntityId('P27'), 'Q884'
+    assert index.entity_ids(index[human]) == ['Q494290', 'Q20145']
+    assert index.intersection(human, korea) == ['Q494290', 'Q20145']
+    assert index.union((EntityId('P31'), 'Q5741069'), human) == \
+        ['Q494290', 'Q1299', 'Q20145']
+    assert index.intersection(human, (EntityId('P31'), 'Q5741069')) == []
+    assert index.intersection() == []
+    assert (EntityId('P31'), 'Q0') not in index
+    assert len(index[EntityId('P31'), 'Q0']) == 0
+    assert human in index
+    assert len(index) == len(list(index))
+    # Adding the same entity again doesn't make duplicates
+    index.add(fx_client.get(EntityId('Q494290')))
+    assert len(index.documents) == 3
+    assert index.entity_ids(index[human]) == ['Q494290', 'Q20145']
+
+
+def test_property_value_index_add_dump():
+    lines = ['[\n']
+    for entity_id in 'Q494290', 'Q1299', 'Q20145':
+        with (ENTITY_FIXTURES_PATH / (entity_id + '.json')).open() as f:
+            data = json.load(f)['entities'][entity_id]
+        lines.append(json.dumps(data) + ',\n')
+    lines[-1] = lines[-1].rstrip(',\n') + '\n'
+    lines.append(']\n')
+    dump = io.BytesIO(''.join(lines).encode('utf-8'))
+    index = PropertyValueIndex()
+    assert index.add_dump(dump) == 3
+    assert index.intersection((EntityId('P31'), 'Q5')) == \
+        ['Q494290', 'Q20145']
@@ -0,0 +1,50 @@
+import json
+
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.interning import MAX_INTERNED_LENGTH, intern_pairs
+
+from .mock import FixtureOpener
+
+
+def loads(text: str) -> object:
+    return json.loads(text, object_pairs_hook=intern_pairs)
+
+
+def test_intern_pairs():
+    a = loads('{"P31": [{"rank": "normal", "id": "Q5"}]}')
+    b = loads('{"P31": [{"rank": "normal", "id": "Q5"}]}')
+    assert isinstance(a, dict) and isinstance(b, dict)
+    assert a == b
+    key_a, = a
+    key_b, = b
+    assert key_a is key_b
+    assert a['P31'][0]['rank'] is b['P31'][0]['rank']
+    assert a['P31'][0]['id'] is b['P31'][0]['id']
+
+
+def test_intern_pairs_skip():
+    guid = 'Q1299$' + 'A' * MAX_INTERNED_LENGTH
+    a = loads(json.dumps({'id': guid, 'value': 'free text'}))
+    b = loads(json.dumps({'id': guid, 'value': 'free text'}))
+    assert isinstance(a, dict) and isinstance(b, dict)
+    assert a['id'] == b['id'] and a['id'] is not b['id']
+    assert a['value'] == b['value'] and a['value'] is not b['value']
+
+
+def test_intern_pairs_order():
+    a = loads('{"qualifiers-order": ["P580", 1]}')
+    b = loads('{"qualifiers-order": ["P580", 1]}')
+    assert isinstance(a, dict) and isinstance(b, dict)
+    assert a['qualifiers-order'][0] is b['qualifiers-order'][0]
+
+
+def test_client_intern_strings(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener, intern_strings=True)
+    a = client.get(EntityId('Q1299'), load=True)
+    b = client.get(EntityId('Q20145'), load=True)
+    assert a.data is not None and b.data is not None
+    a_type, = (k for k in a.data if k == 'type')
+    b_type, = (k for k in b.data if k == 'type')
+    assert a_type is b_type
+    assert a.data['type'] is b.data['type']
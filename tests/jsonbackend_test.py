@@ -0,0 +1,61 @@
+import collections
+
+from pytest import importorskip, mark, raises
+
+from wikidata.cachecodec import JsonCodec
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.interning import intern_pairs
+from wikidata.jsonbackend import JsonBackend, OrjsonBackend, StdlibJsonBackend
+
+from .mock import FixtureOpener
+
+DOCUMENT = '{"a": [1, 2.5, {"b": null}], "c": "서울", "d": true}'
+
+
+def backends():
+    yield StdlibJsonBackend()
+    try:
+        yield OrjsonBackend()
+    except ImportError:
+        pass
+
+
+@mark.parametrize('backend', list(backends()), ids=repr)
+def test_backend_loads(backend: JsonBackend):
+    data = DOCUMENT.encode('utf-8')
+    expected = {'a': [1, 2.5, {'b': None}], 'c': '서울', 'd': True}
+    assert backend.loads(data) == expected
+    result = backend.loads(data, collections.OrderedDict)
+    assert isinstance(result, collections.OrderedDict)
+    assert isinstance(result['a'][2], collections.OrderedDict)
+    assert result == expected
+    with raises(ValueError):
+        backend.loads(b'{')
+
+
+def test_default_backend():
+    assert isinstance(Client().json_backend, StdlibJsonBackend)
+    assert isinstance(JsonCodec().backend, StdlibJsonBackend)
+
+
+def test_orjson_backend(fx_client_opener: FixtureOpener):
+    importorskip('orjson')
+    client = Client(opener=fx_client_opener, json_backend=OrjsonBackend())
+    assert client.get(EntityId('Q1299'), load=True).data
+
+
+def test_client_json_backend(fx_client_opener: FixtureOpener):
+    class Backend(StdlibJsonBackend):
+        def __init__(self):
+            self.calls = []
+
+        def loads(self, data, object_pairs_hook=None):
+            self.calls.append((type(data), object_pairs_hook))
+            return super().loads(data, object_pairs_hook)
+
+    backend = Backend()
+    client = Client(opener=fx_client_opener, json_backend=backend,
+                    intern_strings=True)
+    assert client.get(EntityId('Q1299'), load=True).data
+    assert backend.calls == [(bytes, intern_pairs)]
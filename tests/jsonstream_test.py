@@ -0,0 +1,169 @@
+import io
+import json
+
+from pytest import mark, raises
+
+from wikidata.cache import MemoryCachePolicy
+from wikidata.client import Client
+from wikidata.entity import EntityId, EntityState
+from wikidata.interning import intern_pairs
+from wikidata.jsonstream import EntityStream, StreamError
+from wikidata.multilingual import Locale
+
+from .mock import ENTITY_FIXTURES_PATH, FixtureOpener
+from .observer_test import RecordingObserver
+
+
+def make_response(*entity_ids: str) -> bytes:
+    entities = {}
+    for entity_id in entity_ids:
+        path = ENTITY_FIXTURES_PATH / (entity_id + '.json')
+        entities.update(json.loads(path.read_bytes())['entities'])
+    return json.dumps({'entities': entities, 'success': 1},
+                      ensure_ascii=False, indent=1).encode('utf-8')
+
+
+@mark.parametrize('chunk_size', [1, 7, 8192])
+def test_entity_stream(chunk_size: int):
+    response = make_response('Q20145', 'P434', 'Q1299')
+    fp = io.BytesIO(response)
+    stream = EntityStream(fp, chunk_size=chunk_size)
+    entity_id, data = next(stream)
+    assert entity_id == 'Q20145'
+    assert data == json.loads(response)['entities']['Q20145']
+    assert fp.tell() < len(response)
+    assert list(stream) == [
+        (k, v) for k, v in json.loads(response)['entities'].items()
+        if k != 'Q20145'
+    ]
+    assert stream.members == {'success': 1}
+    assert stream.bytes_read == len(response)
+
+
+def test_entity_stream_members():
+    stream = EntityStream(io.BytesIO(
+        b'{"error": {"code": "no-such-entity"}, "servedby": "mw1"}'
+    ))
+    assert list(stream) == []
+    assert stream.members == {
+        'error': {'code': 'no-such-entity'},
+        'servedby': 'mw1',
+    }
+    stream = EntityStream(io.BytesIO(b' {"entities": {}} \n'))
+    assert list(stream) == []
+
+
+def test_entity_stream_numbers():
+    stream = EntityStream(io.BytesIO(b'{"success": 12345}'), chunk_size=1)
+    assert list(stream) == []
+    assert stream.members == {'success': 12345}
+
+
+def test_entity_stream_object_pairs_hook():
+    response = make_response('Q1299', 'Q20145')
+    a, b = (data for _, data in EntityStream(io.BytesIO(response),
+                                             intern_pairs, chunk_size=64))
+    assert isinstance(a['claims'], dict)
+    assert next(k for k in a['labels'] if k == 'en') is \
+        next(k for k in b['labels'] if k == 'en')
+
+
+@mark.parametrize('response', [
+    b'',
+    b'[]',
+    b'{"entities": {"Q1": []}}',
+    b'{"entities": {"Q1": {"id": "Q1"}}',
+    b'{"entities": {"Q1": {"id": "Q1"} "Q2": {}}}',
+    b'{"entities": {"Q1": {"id": "Q1}}}',
+    b'{"entities": {Q1: {}}}',
+    b'{"success": 1} {}',
+])
+def test_entity_stream_malformed(response: bytes):
+    with raises(StreamError):
+        list(EntityStream(io.BytesIO(response), chunk_size=4))
+
+
+def test_entity_stream_max_buffer_size():
+    response = make_response('Q1299', 'Q20145')
+    size = len(json.dumps(json.loads(response)['entities']['Q1299']))
+    stream = EntityStream(io.BytesIO(response), chunk_size=1024,
+                          max_buffer_size=size // 2)
+    with raises(StreamError):
+        list(stream)
+    stream = EntityStream(io.BytesIO(response), chunk_size=1024,
+                          max_buffer_size=size * 2)
+    assert [k for k, _ in stream] == ['Q1299', 'Q20145']
+
+
+def test_client_stream_responses(fx_client_opener: FixtureOpener):
+    observer = RecordingObserver()
+    client = Client(opener=fx_client_opener, stream_responses=True,
+                    observers=[observer])
+    beatles = client.get(EntityId('Q1299'))
+    redirected = client.get(EntityId('Q16231742'))
+    non_existent = client.get(EntityId('Q1'))
+    client.load_entities([beatles, redirected, non_existent])
+    assert len(fx_client_opener.records) == 1
+    assert beatles.state is EntityState.loaded
+    assert beatles.label[Locale('en')] == 'The Beatles'
+    assert redirected.id == EntityId('Q3571994')
+    assert redirected.data is not None
+    assert non_existent.state is EntityState.non_existent
+    assert [name for name, _ in observer.calls] == ['start', 'finish']
+    event = observer.calls[-1][1]
+    assert event.status == 200
+    assert event.size is not None and event.size > 0
+    assert not event.cache_hit
+
+
+def test_client_stream_responses_invalid_id(fx_client_opener: FixtureOpener):
+    client = Client(opener=fx_client_opener, stream_responses=True)
+    beatles = client.get(EntityId('Q1299'))
+    invalid = client.get(EntityId('1299'))
+    client.load_entities([beatles, invalid])
+    assert beatles.state is EntityState.loaded
+    assert invalid.state is EntityState.non_existent
+
+
+def test_client_stream_responses_cache(fx_client_opener: FixtureOpener):
+    cache_policy = MemoryCachePolicy()
+    client = Client(opener=fx_client_opener, stream_responses=True,
+                    cache_policy=cache_policy)
+    ids = [EntityId('Q1299'), EntityId('Q20145')]
+    client.load_entities(client.get(i) for i in ids)
+    assert len(fx_client_opener.records) == 1
+    # A client which doesn't stream shares the cached responses.
+    for stream_responses in (True, False):
+        other = Client(opener=fx_client_opener, cache_policy=cache_policy,
+                       stream_responses=stream_responses)
+        entities = [other.get(i) for i in ids]
+        other.load_entities(entities)
+        assert len(fx_client_opener.records) == 1
+        assert all(e.state is EntityState.loaded for e in entities)
+
+
+def test_client_request_entities_stop_early(fx_client_opener: FixtureOpener):
+    responses = []
+    open_ = fx_client_opener.open
+
+    def open(*args, **kwargs):
+        response = open_(*args, **kwargs)
+        responses.append(response)
+        return response
+    fx_client_opener.open = open  # type: ignore
+    observer = RecordingObserver()
+    cache_policy = MemoryCachePolicy()
+    client = Client(opener=fx_client_opener, stream_responses=True,
+                    cache_policy=cache_policy, observers=[observer])
+    path = './w/api.php?action=wbgetentities&format=json&ids=Q1299|Q20145'
+    entities = client.request_entities(path)
+    next(entities)
+    entities.close()
+    response, = responses
+    assert response.closed
+    assert [name for name, _ in observer.calls] == ['start', 'finish']
+    event = observer.calls[-1][1]
+    assert event.elapsed is not None
+    assert event.size is not None and event.size > 0
+    # An incomplete response is not cached.
+    assert cache_policy.get(event.cache_key) is None
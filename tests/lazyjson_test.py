@@ -0,0 +1,151 @@
+import json
+import pickle
+
+from pytest import mark, raises
+
+from wikidata.cache import MemoryCachePolicy, ProxyCachePolicy
+from wikidata.client import Client
+from wikidata.entity import EntityId, EntityState
+from wikidata.identitymap import approximate_size
+from wikidata.interning import intern_pairs
+from wikidata.lazyjson import LazyJsonBackend, LazyObject, loads
+from wikidata.multilingual import Locale
+
+from .cache_test import MockCache
+from .mock import ENTITY_FIXTURES_PATH, FixtureOpener
+
+
+@mark.parametrize('entity_id', ['Q8646', 'Q1299', 'Q16231742'])
+def test_loads_fixture(entity_id: str):
+    data = (ENTITY_FIXTURES_PATH / (entity_id + '.json')).read_bytes()
+    lazy = loads(data)
+    assert isinstance(lazy, LazyObject)
+    assert lazy == json.loads(data)
+
+
+def test_loads():
+    text = ' { "a" : {"b": {"c": {"d": 1}}, "e": []} , "f": "x" , "g": {} } '
+    lazy = loads(text, depth=3)
+    assert isinstance(lazy, LazyObject)
+    assert not lazy.parsed
+    assert bool(lazy)
+    a = lazy['a']
+    assert isinstance(a, LazyObject)
+    assert list(lazy.parsed) == ['a']
+    b = a['b']
+    assert isinstance(b, LazyObject)
+    assert type(b['c']) is dict
+    assert lazy['g'] == {} and not lazy['g']
+    assert list(lazy) == ['a', 'f', 'g']
+    assert len(lazy) == 3
+    assert 'h' not in lazy
+    assert loads('[1, {"a": 2}]') == [1, {'a': 2}]
+    assert type(loads('{"a": {}}', depth=1)['a']) is dict
+    assert loads('{"a": {"b": 1}}', object_pairs_hook=intern_pairs) == \
+        {'a': {'b': 1}}
+
+
+def test_lazy_object_contains():
+    text = '{"a": {"b": ["}", {"c": "\\"]"}]}, "d": "{", "e": 1, "f": [{}]}'
+    lazy = loads(text)
+    assert isinstance(lazy, LazyObject)
+    assert 'e' in lazy and 'f' in lazy
+    assert 'g' not in lazy and lazy.get('g') is None
+    assert lazy.get('g', 0) == 0
+    assert not lazy.parsed  # keys are only scanned
+    with raises(KeyError):
+        lazy['g']
+    assert not lazy.parsed
+    assert lazy.get('d') == '{'
+    assert list(lazy.parsed) == ['a', 'd']
+    assert lazy['a'] == {'b': ['}', {'c': '"]'}]}
+    assert 'a' in lazy and 'g' not in lazy
+    assert dict(lazy) == json.loads(text)
+
+
+@mark.parametrize('text', ['{"a": 1', '{"a" 1}', '{"a": 1,}', '{a: 1}',
+                           '{"a": 1 "b": 2}', '{"a": {"b": }}'])
+def test_loads_invalid(text: str):
+    lazy = loads(text)
+    assert isinstance(lazy, LazyObject)
+    with raises(json.JSONDecodeError):
+        lazy.finish()
+
+
+def test_lazy_object_pickle():
+    text = '{"entities": {"Q1": {"labels": {"en": "universe"}}}, "x": [1]}'
+    lazy = loads(text)
+    assert isinstance(lazy, LazyObject)
+    loaded = pickle.loads(pickle.dumps(lazy))
+    assert isinstance(loaded, LazyObject)
+    assert not loaded.parsed
+    entities = lazy['entities']
+    assert isinstance(entities, LazyObject)
+    entity = entities['Q1']
+    assert isinstance(entity, LazyObject)
+    assert loaded == lazy
+    # Nested objects not looked up are parsed at once:
+    assert type(loaded.parsed['entities']) is dict
+    # Nested objects are pickled as their own text:
+    loaded = pickle.loads(pickle.dumps(entity))
+    assert isinstance(loaded, LazyObject)
+    assert loaded.text == '{"labels": {"en": "universe"}}'
+    assert loaded == {'labels': {'en': 'universe'}}
+
+
+def test_approximate_size():
+    data = (ENTITY_FIXTURES_PATH / 'Q8646.json').read_bytes()
+    lazy = loads(data)
+    assert isinstance(lazy, LazyObject)
+    assert approximate_size(lazy) > len(data)
+    assert not lazy.parsed
+
+
+def test_client_lazy_json_backend(fx_client_opener: FixtureOpener):
+    cache = MemoryCachePolicy()
+    client = Client(opener=fx_client_opener,
+                    json_backend=LazyJsonBackend(),
+                    cache_policy=cache)
+    hong_kong = client.get(EntityId('Q8646'), load=True)
+    assert hong_kong.state is EntityState.loaded
+    assert isinstance(hong_kong.data, LazyObject)
+    assert hong_kong.label[Locale('en')] == 'Hong Kong'
+    assert 'claims' not in hong_kong.data.parsed
+    flag = hong_kong.getlist(client.get(EntityId('P41')))
+    claims = hong_kong.data.parsed['claims']
+    assert isinstance(claims, LazyObject)
+    assert claims.position is not None  # the rest are not parsed yet
+    assert flag
+    assert 'sitelinks' not in hong_kong.data.parsed
+    assert repr(hong_kong) == "<wikidata.entity.Entity Q8646 'Hong Kong'>"
+
+
+def test_client_lazy_json_backend_load_entities(
+    fx_client_opener: FixtureOpener
+):
+    client = Client(opener=fx_client_opener, json_backend=LazyJsonBackend())
+    entities = [client.get(EntityId(i)) for i in ('Q8646', 'Q1299', 'Q1')]
+    client.load_entities(entities)
+    assert len(fx_client_opener.records) == 1
+    hong_kong, beatles, non_existent = entities
+    assert non_existent.state is EntityState.non_existent
+    for entity in hong_kong, beatles:
+        assert entity.state is EntityState.loaded
+        assert isinstance(entity.data, LazyObject)
+        # Testing 'missing' and 'redirects' doesn't parse claims:
+        assert 'claims' not in entity.data.parsed
+    assert beatles.label[Locale('en')] == 'The Beatles'
+    assert isinstance(beatles.data, LazyObject)
+    assert 'claims' not in beatles.data.parsed
+
+
+def test_client_lazy_json_backend_proxy_cache(fx_client_opener: FixtureOpener):
+    mock = MockCache()
+    client = Client(opener=fx_client_opener,
+                    json_backend=LazyJsonBackend(),
+                    cache_policy=ProxyCachePolicy(mock, 60))
+    client.get(EntityId('Q1299'), load=True)
+    _, (_, value, _) = mock.records[-1]
+    # The original response is stored as it is:
+    raw = (ENTITY_FIXTURES_PATH / 'Q1299.json').read_text()
+    assert raw.strip() in pickle.loads(value).text
@@ -13,12 +13,36 @@ import urllib.request
 import urllib.response
 
 __all__ = ('ENTITY_FIXTURES_PATH', 'FIXTURES_PATH', 'MEDIA_FIXTURES_PATH',
-           'FixtureOpener')
+           'FixtureOpener', 'upload_content')
 
 
 FIXTURES_PATH = pathlib.Path(__file__).parent / 'fixtures'
 ENTITY_FIXTURES_PATH = FIXTURES_PATH / 'entities'
 MEDIA_FIXTURES_PATH = FIXTURES_PATH / 'media'
+MEDIA_REDIRECTS = {
+    'File:Gandhara Buddha.jpeg': 'File:Gandhara Buddha (tnm).jpeg',
+}
+
+
+UPLOAD_NETLOC = 'upload.wikimedia.org'
+THUMBNAIL_SIZE = 4096
+
+
+def upload_content(url: str) -> bytes:
+    """Generate the mock content of the given upload url.  Its size is
+    the same as the ``size`` in the media fixture of the image."""
+    size = THUMBNAIL_SIZE
+    if '/thumb/' not in url:
+        for path in MEDIA_FIXTURES_PATH.glob('*.json'):
+            with path.open('rb') as f:
+                page, = json.load(f)['query']['pages'].values()
+            if page['imageinfo'][0]['url'] == url:
+                size = page['imageinfo'][0]['size']
+                break
+        else:
+            raise LookupError(url)
+    seed = hashlib.sha256(url.encode('utf-8')).digest()
+    return (seed * (size // len(seed) + 1))[:size]
 
 
 class FixtureOpener(urllib.request.OpenerDirector):
@@ -39,6 +63,128 @@ class FixtureOpener(urllib.request.OpenerDirector):
         cls = type(self)
         return logging.getLogger(cls.__qualname__).getChild(cls.__name__)
 
+    def open_entities(self, fullurl: str,
+                      qs: typing.Mapping[str, typing.List[str]]):
+        # ./w/api.php?action=wbgetentities&format=json&ids={}
+        hdrs = http.client.HTTPMessage()
+        hdrs.add_header('Content-Type', 'application/json')
+        entities = {}  # type: typing.Dict[str, object]
+        result = {'entities': entities}  # type: typing.Dict[str, object]
+        for entity_id in qs['ids'][0].split('|'):
+            if not (entity_id[:1].isupper() and entity_id[1:].isdigit()):
+                result = {
+                    'error': {
+                        'code': 'no-such-entity',
+                        'info': 'Could not find an entity with the ID '
+                                '"{}".'.format(entity_id),
+                        'id': entity_id,
+                    },
+                }
+                break
+            path = ENTITY_FIXTURES_PATH / (entity_id + '.json')
+            if not path.is_file():
+                # It might be the canonical id of a redirect requested
+                # together, which has no fixture of its own.
+                entities.setdefault(entity_id,
+                                    {'id': entity_id, 'missing': ''})
+                continue
+            with path.open('rb') as f:
+                data = json.load(f)['entities']
+            canonical_id, entity = next(iter(data.items()))
+            if 'props' in qs:
+                props = qs['props'][0].split('|')
+                entity = {k: v for k, v in entity.items()
+                          if k in ('id', 'type') or k in props}
+            if 'languages' in qs:
+                languages = qs['languages'][0].split('|')
+                entity = {
+                    k: {lang: term for lang, term in v.items()
+                        if lang in languages}
+                    if k in ('labels', 'descriptions', 'aliases') else v
+                    for k, v in entity.items()
+                }
+            if canonical_id != entity_id:
+                entity = dict(entity)
+                entity['redirects'] = {'from': entity_id, 'to': canonical_id}
+            entities[canonical_id] = entity
+        fp = io.BytesIO(json.dumps(result).encode('utf-8'))
+        return urllib.response.addinfourl(fp, hdrs, fullurl, 200)
+
+    def open_media_batch(self, fullurl: str,
+                         qs: typing.Mapping[str, typing.List[str]]):
+        # ./w/api.php?action=query&...&titles={}|{}|...&redirects=1
+        hdrs = http.client.HTTPMessage()
+        hdrs.add_header('Content-Type', 'application/json')
+        query = {}  # type: typing.Dict[str, typing.List[object]]
+        pages = {}  # type: typing.Dict[str, object]
+        for title in qs['titles'][0].split('|'):
+            if '_' in title:
+                normalized = title.replace('_', ' ')
+                query.setdefault('normalized', []).append(
+                    {'from': title, 'to': normalized}
+                )
+                title = normalized
+            if 'redirects' in qs and title in MEDIA_REDIRECTS:
+                query.setdefault('redirects', []).append(
+                    {'from': title, 'to': MEDIA_REDIRECTS[title]}
+                )
+                title = MEDIA_REDIRECTS[title]
+            title_id = hashlib.md5(title.encode('utf-8')).hexdigest().lower()
+            path = MEDIA_FIXTURES_PATH / (title_id + '.json')
+            if path.is_file():
+                with path.open('rb') as f:
+                    page, = json.load(f)['query']['pages'].values()
+            else:
+                page = {
+                    'imagerepository': '',
+                    'missing': '',
+                    'ns': 6,
+                    'title': title,
+                }
+            if 'iiurlwidth' in qs and 'imageinfo' in page:
+                width, = qs['iiurlwidth']
+                url = page['imageinfo'][0]['url']
+                directory, name = url.replace(
+                    '/commons/', '/commons/thumb/'
+                ).rsplit('/', 1)
+                page['imageinfo'][0]['thumburl'] = '{}/{}/{}px-{}'.format(
+                    directory, name, width, name
+                )
+            pages[str(page.get('pageid', -1 - len(pages)))] = page
+        result = {
+            'batchcomplete': '',
+            'query': dict(query, pages=pages),
+        }
+        fp = io.BytesIO(json.dumps(result).encode('utf-8'))
+        return urllib.response.addinfourl(fp, hdrs, fullurl, 200)
+
+    def open_upload(self, fullurl: str,
+                    request_headers: typing.Mapping[str, str]):
+        hdrs = http.client.HTTPMessage()
+        hdrs.add_header('Content-Type', 'application/octet-stream')
+        content = upload_content(fullurl)
+        status = 200
+        range_ = request_headers.get('Range')
+        if range_ is not None:
+            assert range_.startswith('bytes=') and range_.endswith('-')
+            start = int(range_[6:-1])
+            if start >= len(content):
+                hdrs.add_header('Content-Range',
+                                'bytes */{}'.format(len(content)))
+                raise urllib.error.HTTPError(
+                    fullurl, 416, 'Range Not Satisfiable', hdrs,
+                    io.BytesIO()
+                )
+            hdrs.add_header('Content-Range', 'bytes {}-{}/{}'.format(
+                start, len(content) - 1, len(content)
+            ))
+            content = content[start:]
+            status = 206
+        hdrs.add_header('Content-Length', str(len(content)))
+        return urllib.response.addinfourl(
+            io.BytesIO(content), hdrs, fullurl, status
+        )
+
     @staticmethod
     def match_netloc(a: urllib.parse.ParseResult,
                      b: urllib.parse.ParseResult) -> bool:
@@ -55,15 +201,22 @@ class FixtureOpener(urllib.request.OpenerDirector):
 
     def open(self, fullurl, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
         logger = self.logger.getChild('open')
+        request_headers = {}
         if not isinstance(fullurl, str):
+            request_headers = dict(fullurl.header_items())
             fullurl = fullurl.get_full_url()
         self.records.append((fullurl, ''.join(traceback.format_stack())))
         parsed = urllib.parse.urlparse(fullurl)
         hdrs = http.client.HTTPMessage()
+        # uploaded media
+        if parsed.netloc == UPLOAD_NETLOC:
+            return self.open_upload(fullurl, request_headers)
         # media fixtures
         if self.match_netloc(parsed, self.media_base_url) and \
            parsed.path == self.media_base_url.path:
             qs = urllib.parse.parse_qs(parsed.query, strict_parsing=True)
+            if qs.get('action') == ['wbgetentities']:
+                return self.open_entities(fullurl, qs)
             if not (qs['action'] == ['query'] and
                     len(qs['prop']) == 1 and
                     set(qs['prop'][0].split('|')) == {'imageinfo', 'info'} and
@@ -83,6 +236,9 @@ class FixtureOpener(urllib.request.OpenerDirector):
                 )
                 return urllib.response.addinfourl(fp, hdrs, fullurl, 200)
             title, = qs['titles']
+            if '|' in title or '_' in title or 'redirects' in qs or \
+               'iiurlwidth' in qs:
+                return self.open_media_batch(fullurl, qs)
             title_id = hashlib.md5(title.encode('utf-8')).hexdigest().lower()
             path = MEDIA_FIXTURES_PATH / (title_id + '.json')
             if path.is_file():
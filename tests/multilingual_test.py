@@ -1,6 +1,8 @@
 from pytest import fixture
 
-from wikidata.multilingual import Locale, MonolingualText, MultilingualText
+from wikidata.multilingual import (DEFAULT_FALLBACK, LanguageFallback, Locale,
+                                   MonolingualText, MultilingualText,
+                                   TermValues)
 
 
 @fixture
@@ -58,3 +60,83 @@ def test_monolingual_text_repr():
     b = MonolingualText('周樹人', 'zh-hant')
     assert repr(b) == "'(zh-hant:) 周樹人'[11:]"
     assert eval(repr(b)) == str(b)
+
+
+def test_multilingual_text_from_terms():
+    terms = {
+        'ko': {'language': 'ko', 'value': '윤동주'},
+        'en': {'language': 'en', 'value': 'Yun Dong-ju'},
+    }
+    mt = MultilingualText.from_terms(terms)
+    assert isinstance(mt.texts, TermValues)
+    assert mt.texts.terms is terms
+    assert set(mt) == {'ko', 'en'}
+    assert len(mt) == 2
+    assert Locale('ko') in mt
+    assert Locale('ja') not in mt
+    assert mt[Locale('ko')] == '윤동주'
+    assert mt.get('ja') is None
+    assert str(mt) == 'Yun Dong-ju'
+    assert mt == MultilingualText({'ko': '윤동주', 'en': 'Yun Dong-ju'})
+    assert not MultilingualText.from_terms({})
+
+
+def test_multilingual_text_from_terms_languages():
+    terms = {
+        'ko': {'language': 'ko', 'value': '윤동주'},
+        'x': {'language': 'en', 'value': 'Yun Dong-ju'},
+        'ja': {'language': '', 'value': '尹東柱'},
+    }
+    mt = MultilingualText.from_terms(terms)
+    # Keyed by the languages of terms, and terms without them are omitted:
+    assert mt == MultilingualText({'ko': '윤동주', 'en': 'Yun Dong-ju'})
+    assert set(mt) == {'ko', 'en'}
+    assert len(mt) == 2
+    assert Locale('en') in mt
+    assert Locale('x') not in mt
+    assert Locale('ja') not in mt
+    assert mt[Locale('en')] == 'Yun Dong-ju'
+    assert str(mt) == 'Yun Dong-ju'
+
+
+def test_language_fallback():
+    fallback = LanguageFallback(['zh-mo'])
+    assert fallback.locales == ('zh-mo', 'zh-hk', 'zh-hant', 'zh-hans', 'en')
+    custom = LanguageFallback(['zh-hant'], {'zh-hant': ['zh-tw', 'zh']})
+    assert custom.locales == ('zh-hant', 'zh-tw', 'zh', 'en')
+    cyclic = LanguageFallback(['nb'])
+    assert cyclic.locales == ('nb', 'no', 'nn', 'en')
+    assert LanguageFallback([], last_resort=[]).locales == ()
+    texts = {Locale('ja'): '尹東柱', Locale('zh-hans'): '尹东柱'}
+    assert fallback.resolve(texts) == 'zh-hans'
+    assert custom.resolve(texts) == 'zh-hans'  # any available one
+    assert LanguageFallback(['ko']).resolve({}) is None
+
+
+def test_language_fallback_variant():
+    fallback = LanguageFallback()
+    variant = MultilingualText({'ko': '서울', 'en-gb': 'Seoul'})
+    assert fallback.resolve(variant) == 'en-gb'
+    assert fallback.resolve(MultilingualText({'ko': '서울'})) == 'ko'
+
+
+def test_multilingual_text_fallback(fx_multilingual_text: MultilingualText):
+    mt = fx_multilingual_text
+    assert mt.fallback is DEFAULT_FALLBACK
+    assert mt.resolve_locale() == 'en'
+    zh_tw = LanguageFallback(['zh-tw'])
+    assert mt.resolve_locale(zh_tw) == 'zh-hans'
+    assert mt.resolved == (zh_tw, 'zh-hans')
+    text = mt.resolve(zh_tw)
+    assert isinstance(text, MonolingualText)
+    assert text == '尹东柱' and text.locale == 'zh-hans'
+    assert MultilingualText({}).resolve() is None
+    ko = MultilingualText.from_terms(
+        {'ko': {'language': 'ko', 'value': '윤동주'},
+         'en': {'language': 'en', 'value': 'Yun Dong-ju'}},
+        LanguageFallback(['ko-kp'])
+    )
+    assert str(ko) == '윤동주'
+    assert ko.resolved is not None
+    ko.texts = {Locale('ko'): 'changed'}  # the resolved locale is cached
+    assert str(ko) == 'changed'
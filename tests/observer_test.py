@@ -0,0 +1,112 @@
+import math
+import pickle
+import urllib.error
+from typing import List, Tuple
+
+from pytest import approx, raises
+
+from wikidata.cache import MemoryCachePolicy
+from wikidata.client import Client
+from wikidata.entity import EntityId, EntityState
+from wikidata.observer import (Histogram, RequestEvent, RequestMetrics,
+                               RequestObserver)
+
+from .mock import FixtureOpener
+
+
+class RecordingObserver(RequestObserver):
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, RequestEvent]] = []
+
+    def on_start(self, event: RequestEvent) -> None:
+        assert event.elapsed is None
+        self.calls.append(('start', event))
+
+    def on_finish(self, event: RequestEvent) -> None:
+        self.calls.append(('finish', event))
+
+    def on_error(self, event: RequestEvent) -> None:
+        self.calls.append(('error', event))
+
+
+def test_histogram():
+    histogram = Histogram([1, 2, 4])
+    assert histogram.percentile(0.5) is None
+    assert histogram.mean is None
+    for value in 0.5, 1.5, 1.5, 3, 10:
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.mean == approx(3.3)
+    assert histogram.percentile(0) == 0.5
+    assert histogram.percentile(1) == 10
+    assert 1 <= histogram.percentile(0.5) <= 2
+    assert 4 <= histogram.percentile(0.99) <= 10
+    with raises(ValueError):
+        histogram.percentile(1.5)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == [(1, 1), (2, 3), (4, 4), (math.inf, 5)]
+    assert snapshot['min'] == 0.5 and snapshot['max'] == 10
+
+
+def test_client_observers(fx_client_opener: FixtureOpener):
+    observer = RecordingObserver()
+    client = Client(opener=fx_client_opener,
+                    cache_policy=MemoryCachePolicy(),
+                    observers=[observer])
+    client.get(EntityId('Q1299'), load=True)
+    assert [name for name, _ in observer.calls] == ['start', 'finish']
+    event = observer.calls[0][1]
+    assert observer.calls[1][1] is event
+    assert event.url.endswith('/wiki/Special:EntityData/Q1299.json')
+    assert event.cache_key == event.url
+    assert event.entity_ids == ('Q1299',)
+    assert event.cache_hit is False
+    assert event.status == 200
+    assert event.size is not None and event.size > 0
+    assert event.elapsed is not None and event.elapsed >= 0
+    assert event.error is None
+    client.get(EntityId('Q1299')).unload()
+    client.get(EntityId('Q1299'), load=True)
+    hit = observer.calls[-1][1]
+    assert hit.cache_hit is True
+    assert hit.status is None and hit.size is None
+    del observer.calls[:]
+    invalid = client.get(EntityId('1299'), load=True)
+    assert invalid.state is EntityState.non_existent
+    assert [name for name, _ in observer.calls] == ['start', 'error']
+    assert observer.calls[1][1].status == 400
+    del observer.calls[:]
+    with raises(urllib.error.HTTPError):
+        client.request('./no-such-path')
+    assert [name for name, _ in observer.calls] == ['start', 'error']
+    assert observer.calls[1][1].status == 404
+
+
+def test_request_metrics(fx_client_opener: FixtureOpener):
+    metrics = RequestMetrics()
+    client = Client(opener=fx_client_opener,
+                    cache_policy=MemoryCachePolicy(),
+                    observers=[metrics])
+    entities = [client.get(EntityId(i)) for i in ('Q1299', 'Q20145')]
+    client.load_entities(entities)
+    for entity in entities:
+        entity.unload()
+    client.load_entities(entities)
+    client.get(EntityId('1299'), load=True)
+    assert metrics.requests == 3
+    assert metrics.errors == 1
+    assert metrics.cache_hits == 1
+    assert metrics.cache_misses == 2
+    assert metrics.cache_hit_ratio == approx(1 / 3)
+    assert metrics.statuses == {200: 1, 400: 1}
+    assert metrics.bytes_read > 0
+    assert metrics.latency.count == 3
+    assert metrics.fetch_latency.count == 2
+    snapshot = metrics.snapshot()
+    assert snapshot['requests'] == 3
+    assert snapshot['bytes_read'] == metrics.size.sum
+    loaded = pickle.loads(pickle.dumps(client))
+    assert isinstance(loaded.observers[0], RequestMetrics)
+    assert loaded.observers[0].requests == 3
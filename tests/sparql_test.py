@@ -0,0 +1,232 @@
+import datetime
+import http.server
+import io
+import json
+import threading
+import typing
+import urllib.parse
+import urllib.request
+
+from pytest import fixture, raises
+
+from wikidata.client import Client, WIKIDATA_BASE_URL
+from wikidata.entity import Entity, EntityId
+from wikidata.globecoordinate import GlobeCoordinate
+from wikidata.multilingual import Locale, MonolingualText
+from wikidata.sparql import (SparqlError, decode_term, iter_json_bindings,
+                             iter_tsv_bindings)
+
+from .mock import FixtureOpener
+
+BINDINGS = [
+    {
+        'item': {'type': 'uri',
+                 'value': 'http://www.wikidata.org/entity/Q494290'},
+        'itemLabel': {'type': 'literal', 'value': 'Shin Jung-hyeon',
+                      'xml:lang': 'en'},
+        'birth': {
+            'type': 'literal', 'value': '1938-01-04T00:00:00Z',
+            'datatype': 'http://www.w3.org/2001/XMLSchema#dateTime',
+        },
+    },
+    {
+        'item': {'type': 'uri',
+                 'value': 'http://www.wikidata.org/entity/Q20145'},
+        'itemLabel': {'type': 'literal', 'value': 'IU', 'xml:lang': 'en'},
+    },
+]
+
+TSV = (
+    '?item\t?itemLabel\t?count\t?coord\t?name\n'
+    '<http://www.wikidata.org/entity/Q494290>\t"Shin Jung-hyeon"@en\t42\t'
+    '"Point(126.97 37.56)"^^<http://www.opengis.net/ont/geosparql#wktLiteral>'
+    '\t"tab\\there"\n'
+    '<http://www.wikidata.org/entity/Q20145>\t"IU"@en\t\t\t\n'
+)
+
+
+class SparqlHandler(http.server.BaseHTTPRequestHandler):
+
+    server: 'SparqlServer'
+
+    def do_POST(self) -> None:
+        length = int(self.headers['Content-Length'])
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode('ascii'))
+        self.server.queries.append(form['query'][0])
+        self.send_response(200)
+        if self.headers['Accept'] == 'text/tab-separated-values':
+            self.send_header('Content-Type', 'text/tab-separated-values')
+            self.end_headers()
+            self.wfile.write(TSV.encode('utf-8'))
+            return
+        self.send_header('Content-Type', 'application/sparql-results+json')
+        self.end_headers()
+        first = json.dumps(BINDINGS[0])
+        self.wfile.write(
+            '{"head": {"vars": ["item", "itemLabel", "birth"]}, '
+            '"results": {"bindings": [ '.encode('utf-8') +
+            first.encode('utf-8') + b', ' + b' ' * 16384
+        )
+        self.wfile.flush()
+        # The rest of results are sent after the client consumed the first
+        # row, so that it's ensured the client doesn't buffer the whole.
+        self.server.streamed = self.server.consumed.wait(5)
+        self.wfile.write(json.dumps(BINDINGS[1]).encode('utf-8') + b']}}')
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class SparqlServer(http.server.HTTPServer):
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), SparqlHandler)
+        self.queries: typing.List[str] = []
+        self.consumed = threading.Event()
+        self.streamed = False
+
+
+@fixture
+def fx_sparql_server() -> typing.Iterator[SparqlServer]:
+    server = SparqlServer()
+    thread = threading.Thread(target=server.serve_forever,
+                              kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@fixture
+def fx_sparql_client(fx_sparql_server: SparqlServer) -> Client:
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    return Client(opener=opener,
+                  sparql_url='http://127.0.0.1:{}/sparql'.format(
+                      fx_sparql_server.server_port
+                  ))
+
+
+def test_client_sparql_json(fx_sparql_server: SparqlServer,
+                            fx_sparql_client: Client):
+    query = 'SELECT ?item ?itemLabel WHERE { ?item wdt:P31 wd:Q5 }'
+    rows = fx_sparql_client.sparql(query)
+    row = next(rows)
+    fx_sparql_server.consumed.set()
+    assert row['item'] is fx_sparql_client.get(EntityId('Q494290'))
+    assert row['itemLabel'] == MonolingualText('Shin Jung-hyeon', Locale('en'))
+    assert row['itemLabel'].locale == 'en'
+    assert row['birth'] == datetime.datetime(
+        1938, 1, 4, tzinfo=datetime.timezone.utc
+    )
+    row = next(rows)
+    assert row['item'] is fx_sparql_client.get(EntityId('Q20145'))
+    assert 'birth' not in row
+    assert list(rows) == []
+    assert fx_sparql_server.queries == [query]
+    assert fx_sparql_server.streamed
+
+
+def test_client_sparql_tsv(fx_sparql_client: Client):
+    rows = list(fx_sparql_client.sparql('SELECT ...', format='tsv'))
+    assert len(rows) == 2
+    assert rows[0]['item'] is fx_sparql_client.get(EntityId('Q494290'))
+    assert rows[0]['itemLabel'] == 'Shin Jung-hyeon'
+    assert rows[0]['count'] == 42
+    coord = rows[0]['coord']
+    assert isinstance(coord, GlobeCoordinate)
+    assert (coord.latitude, coord.longitude) == (37.56, 126.97)
+    assert coord.globe is fx_sparql_client.get(EntityId('Q2'))
+    assert rows[0]['name'] == 'tab\there'
+    assert set(rows[1]) == {'item', 'itemLabel'}
+
+
+def test_client_sparql_unsupported_format(fx_sparql_client: Client):
+    with raises(ValueError):
+        next(fx_sparql_client.sparql('SELECT ...', format='xml'))
+
+
+class SparqlFixtureOpener(FixtureOpener):
+
+    def __init__(self, base_url: str, sparql_url: str) -> None:
+        super().__init__(base_url)
+        self.sparql_url = sparql_url
+        self.sparql_opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({})
+        )
+
+    def open(self, fullurl, *args, **kwargs):
+        if isinstance(fullurl, urllib.request.Request) and \
+           fullurl.full_url == self.sparql_url:
+            return self.sparql_opener.open(fullurl, *args, **kwargs)
+        return super().open(fullurl, *args, **kwargs)
+
+
+def test_client_sparql_prefetch_labels(fx_sparql_server: SparqlServer):
+    sparql_url = 'http://127.0.0.1:{}/sparql'.format(
+        fx_sparql_server.server_port
+    )
+    opener = SparqlFixtureOpener(WIKIDATA_BASE_URL, sparql_url)
+    client = Client(opener=opener, sparql_url=sparql_url)
+    rows = list(client.sparql('SELECT ...', format='tsv',
+                              prefetch_labels=True))
+    entities = [row['item'] for row in rows]
+    # Only labels are fetched by a single request, without loading entities:
+    assert len(opener.records) == 1
+    assert 'props=labels' in opener.records[0][0]
+    assert all(isinstance(e, Entity) and e.data is None for e in entities)
+    assert str(client.get(EntityId('Q20145')).label) == 'IU'
+    assert len(opener.records) == 1
+    # Labels already cached are not fetched again:
+    list(client.sparql('SELECT ...', format='tsv', prefetch_labels=True))
+    assert len(opener.records) == 1
+
+
+def test_iter_json_bindings():
+    data = json.dumps({
+        'head': {'vars': ['item']},
+        'results': {'bindings': BINDINGS},
+    }).encode('utf-8')
+    assert list(iter_json_bindings(io.BytesIO(data))) == BINDINGS
+    empty = b'{"head": {"vars": []}, "results": {"bindings": []}}'
+    assert list(iter_json_bindings(io.BytesIO(empty))) == []
+    with raises(SparqlError):
+        list(iter_json_bindings(io.BytesIO(b'{"head": {}}')))
+    with raises(SparqlError):
+        list(iter_json_bindings(io.BytesIO(data[:-20])))
+
+
+def test_iter_tsv_bindings():
+    bindings = list(iter_tsv_bindings(io.BytesIO(TSV.encode('utf-8'))))
+    assert bindings[0]['itemLabel'] == {
+        'type': 'literal', 'value': 'Shin Jung-hyeon', 'xml:lang': 'en'
+    }
+    assert bindings[0]['count'] == {
+        'type': 'literal', 'value': '42',
+        'datatype': 'http://www.w3.org/2001/XMLSchema#integer',
+    }
+    with raises(SparqlError):
+        list(iter_tsv_bindings(io.BytesIO(b'?a\t?b\n<x>\n')))
+
+
+def test_decode_term(fx_client: Client):
+    assert decode_term(fx_client, {
+        'type': 'uri', 'value': 'http://www.wikidata.org/entity/P31'
+    }) is fx_client.get(EntityId('P31'))
+    assert decode_term(fx_client, {
+        'type': 'uri', 'value': 'http://www.wikidata.org/entity/statement/x'
+    }) == 'http://www.wikidata.org/entity/statement/x'
+    assert decode_term(fx_client, {'type': 'literal', 'value': 'abc'}) == 'abc'
+    assert decode_term(fx_client, {
+        'type': 'literal', 'value': '1.5',
+        'datatype': 'http://www.w3.org/2001/XMLSchema#decimal',
+    }) == 1.5
+    assert decode_term(fx_client, {
+        'type': 'literal', 'value': 'true',
+        'datatype': 'http://www.w3.org/2001/XMLSchema#boolean',
+    }) is True
+    assert decode_term(fx_client, {
+        'type': 'literal', 'value': '-0500-01-01T00:00:00Z',
+        'datatype': 'http://www.w3.org/2001/XMLSchema#dateTime',
+    }) == '-0500-01-01T00:00:00Z'
+    assert decode_term(fx_client, {'type': 'bnode', 'value': 'b0'}) == 'b0'
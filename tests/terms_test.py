@@ -0,0 +1,32 @@
+from wikidata.entity import EntityId
+from wikidata.multilingual import LanguageFallback, Locale
+from wikidata.terms import TermCache
+
+
+def test_term_cache():
+    cache = TermCache(max_size=2)
+    q1 = EntityId('Q1')
+    assert cache.get(q1, 'labels') is None
+    assert cache.missing_languages(q1, 'labels', ['en', 'ko']) == \
+        {'en', 'ko'}
+    cache.update(q1, 'labels', ['en', 'ko'],
+                 {'en': {'language': 'en', 'value': 'universe'}})
+    assert cache.missing_languages(q1, 'labels', ['en', 'ko']) == set()
+    assert cache.missing_languages(q1, 'labels', ['ja']) == {'ja'}
+    fallback = LanguageFallback(['ja'])
+    cache.update(q1, 'labels', ['ja'],
+                 {'ja': {'language': 'ja', 'value': '宇宙'}}, fallback)
+    text = cache.get(q1, 'labels')
+    assert text is not None
+    assert text[Locale('en')] == 'universe'
+    assert str(text) == '宇宙'
+    assert (q1, 'labels') in cache
+    cache.update(q1, 'descriptions', ['en'], {})
+    cache.update(EntityId('Q2'), 'labels', ['en'], {})
+    assert len(cache) == 2
+    assert (q1, 'labels') not in cache
+    assert cache.missing_languages(q1, 'labels', ['en']) == {'en'}
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.sets, stats.evictions) == \
+        (1, 1, 4, 1)
+    assert stats.entries == 2
@@ -0,0 +1,64 @@
+from pytest import fixture
+
+from wikidata.client import Client
+from wikidata.entity import EntityId
+from wikidata.quantity import Quantity
+from wikidata.unit import UnitConverter
+
+from .mock import FixtureOpener
+
+
+@fixture
+def fx_converter(fx_client: Client) -> UnitConverter:
+    return UnitConverter(fx_client)
+
+
+def test_unit_converter_convert(fx_client: Client,
+                                fx_converter: UnitConverter):
+    kilometre = fx_client.get(EntityId('Q828224'))
+    metre = fx_client.get(EntityId('Q11573'))
+    assert fx_converter.conversion(kilometre) == (1000.0, metre)
+    assert fx_converter.conversion(metre) == (1.0, metre)
+    assert (fx_converter.convert(Quantity(1.5, 1.25, 1.75, kilometre)) ==
+            Quantity(1500.0, 1250.0, 1750.0, metre))
+    q = Quantity(7.0, None, None, metre)
+    assert fx_converter.convert(q) is q
+    unitless = Quantity(3.0, None, None, None)
+    assert fx_converter.convert(unitless) is unitless
+
+
+def test_unit_converter_no_conversion(fx_client: Client,
+                                      fx_converter: UnitConverter):
+    not_unit = fx_client.get(EntityId('Q1299'))
+    assert fx_converter.conversion(not_unit) is None
+    q = Quantity(1.0, None, None, not_unit)
+    assert fx_converter.convert(q) is q
+    non_existent = fx_client.get(EntityId('Q1'))
+    assert fx_converter.conversion(non_existent) is None
+
+
+def test_unit_converter_normalize(fx_client_opener: FixtureOpener,
+                                  fx_client: Client,
+                                  fx_converter: UnitConverter):
+    hong_kong = fx_client.get(EntityId('Q8646'), load=True)
+    area = fx_client.get(EntityId('P2046'))
+    elevation = fx_client.get(EntityId('P2044'))
+    quantities = [
+        q
+        for prop in (area, elevation)
+        for q in hong_kong.getlist(prop)
+        if isinstance(q, Quantity)
+    ]
+    records = len(fx_client_opener.records)
+    normalized = fx_converter.normalize(quantities)
+    # Both square kilometre and metre are loaded by a single request:
+    assert len(fx_client_opener.records) == records + 1
+    square_metre = fx_client.get(EntityId('Q25343'))
+    metre = fx_client.get(EntityId('Q11573'))
+    assert [q.unit for q in normalized] == [square_metre] * 3 + [metre]
+    assert [q.amount for q in normalized] == [
+        2755030000.0, 1105690000.0, 1649340000.0, 7.0
+    ]
+    # Conversions are cached:
+    fx_converter.normalize(quantities)
+    assert len(fx_client_opener.records) == records + 1
@@ -1,12 +1,21 @@
 import collections
+import concurrent.futures
+import copy
 import hashlib
 import logging
-import pickle
 import re
-from typing import NewType, Optional
+import threading
+import time
+from typing import (Callable, Deque, Dict, List, NewType, Optional, Sequence,
+                    Set, TYPE_CHECKING, Tuple)
 
-__all__ = ('CacheKey', 'CachePolicy', 'CacheValue',
-           'MemoryCachePolicy', 'NullCachePolicy', 'ProxyCachePolicy')
+if TYPE_CHECKING:
+    from .cachecodec import CacheCodec  # noqa: F401
+
+__all__ = ('CacheKey', 'CachePolicy', 'CacheStats', 'CacheValue',
+           'MemoryCachePolicy', 'NullCachePolicy', 'ProxyCachePolicy',
+           'RevalidatingCachePolicy', 'StatsCacheObject',
+           'TieredCachePolicy')
 
 
 #: The type of keys to look up cached values.  Alias of :class:`str`.
@@ -16,6 +25,90 @@ CacheKey = NewType('CacheKey', str)
 CacheValue = NewType('CacheValue', object)
 
 
+class CacheStats:
+    r"""Statistics of a cache.  Counters which a cache can't track stay
+    zero, and :attr:`entries` and :attr:`size` are :const:`None` if they're
+    unknown.
+
+    .. attribute:: hits
+
+       (:class:`int`) The number of lookups which found a value.
+
+    .. attribute:: misses
+
+       (:class:`int`) The number of lookups which found nothing.
+
+    .. attribute:: sets
+
+       (:class:`int`) The number of values stored.
+
+    .. attribute:: deletes
+
+       (:class:`int`) The number of values removed on purpose.
+
+    .. attribute:: evictions
+
+       (:class:`int`) The number of values removed to make room.
+
+    .. attribute:: expirations
+
+       (:class:`int`) The number of values removed since they're expired.
+
+    .. attribute:: entries
+
+       (:class:`~typing.Optional`\ [:class:`int`]) The number of values
+       currently stored.
+
+    .. attribute:: size
+
+       (:class:`~typing.Optional`\ [:class:`int`]) The approximate size
+       of values currently stored, in bytes.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    __slots__ = ('hits', 'misses', 'sets', 'deletes', 'evictions',
+                 'expirations', 'entries', 'size')
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.deletes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.entries: Optional[int] = None
+        self.size: Optional[int] = None
+
+    @property
+    def lookups(self) -> int:
+        """(:class:`int`) The number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        r"""(:class:`~typing.Optional`\ [:class:`float`]) The ratio of hits
+        to lookups, or :const:`None` if nothing is looked up.
+
+        """
+        lookups = self.lookups
+        return self.hits / lookups if lookups else None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a)
+                   for a in self.__slots__)
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}({1})'.format(
+            type(self),
+            ', '.join('{}={!r}'.format(a, getattr(self, a))
+                      for a in self.__slots__)
+        )
+
+
 class CachePolicy:
     """Interface for caching policies."""
 
@@ -48,19 +141,45 @@ class CachePolicy:
             'override .set() method'.format(CachePolicy)
         )
 
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache.  The returned object is
+        a snapshot; it doesn't change as the cache is used.
+
+        Policies that don't track statistics return empty statistics,
+        which is the default implementation.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        .. versionadded:: 0.10.0
+
+        """
+        return CacheStats()
+
 
 class NullCachePolicy(CachePolicy):
-    """No-op cache policy."""
+    """No-op cache policy.  Every lookup is counted as a miss."""
+
+    # An immutable class-level default, so that instances pickled by older
+    # versions (which have no state at all) count misses as well.
+    misses = 0
 
     def get(self, key: CacheKey) -> Optional[CacheValue]:
+        self.misses += 1
         return None
 
     def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
         pass
 
+    def stats(self) -> CacheStats:
+        stats = CacheStats()
+        stats.misses = self.misses
+        stats.entries = stats.size = 0
+        return stats
+
 
 class MemoryCachePolicy(CachePolicy):
-    """LRU (least recently used) cache in memory.
+    """LRU (least recently used) cache in memory.  It's thread-safe.
 
     :param max_size: The maximum number of values to cache.  128 by default.
     :type max_size: :class:`int`
@@ -71,26 +190,66 @@ class MemoryCachePolicy(CachePolicy):
         self.max_size = max_size  # type: int
         self.values = \
             collections.OrderedDict()  # type: collections.OrderedDict
+        self.counters = CacheStats()
+        self.lock = threading.Lock()
 
     def get(self, key: CacheKey) -> Optional[CacheValue]:
-        try:
-            v = self.values[key]
-        except KeyError:
-            v = None
-        else:
-            self.values.move_to_end(key)
+        with self.lock:
+            try:
+                v = self.values[key]
+            except KeyError:
+                v = None
+                self.counters.misses += 1
+            else:
+                self.values.move_to_end(key)
+                self.counters.hits += 1
         return v
 
     def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
-        try:
-            del self.values[key]
-        except KeyError:
-            pass
-        if value is None:
-            return
-        self.values[key] = value
-        while len(self.values) > self.max_size:
-            self.values.popitem(last=False)
+        with self.lock:
+            try:
+                del self.values[key]
+            except KeyError:
+                pass
+            else:
+                if value is None:
+                    self.counters.deletes += 1
+            if value is None:
+                return
+            self.values[key] = value
+            self.counters.sets += 1
+            while len(self.values) > self.max_size:
+                self.values.popitem(last=False)
+                self.counters.evictions += 1
+
+    def __getstate__(self) -> Dict[str, object]:
+        state = dict(self.__dict__)
+        state.pop('lock', None)
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        if 'counters' not in state:  # Pickled by older versions
+            self.counters = CacheStats()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache.  Note that measuring
+        :attr:`CacheStats.size` takes time proportional to the amount of
+        cached values.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        .. versionadded:: 0.10.0
+
+        """
+        from .identitymap import approximate_size
+        with self.lock:
+            stats = copy.copy(self.counters)
+            stats.entries = len(self.values)
+            stats.size = approximate_size(self.values)
+        return stats
 
 
 class ProxyCachePolicy(CachePolicy):
@@ -119,6 +278,13 @@ class ProxyCachePolicy(CachePolicy):
     :param namespace: The common prefix attached to every cache key.
                       ``'wd_'`` by default.
     :type namespace: :class:`str`
+    :param codec: The codec to serialize values into :class:`bytes`.
+                  :class:`~.cachecodec.PickleCodec` by default.
+                  See also :mod:`wikidata.cachecodec`.
+    :type codec: :class:`~.cachecodec.CacheCodec`
+
+    .. versionadded:: 0.10.0
+       The ``codec`` option.
 
     """
 
@@ -126,13 +292,19 @@ class ProxyCachePolicy(CachePolicy):
 
     def __init__(self, cache_object, timeout: int,
                  property_timeout: Optional[int] = None,
-                 namespace: str = 'wd_') -> None:
+                 namespace: str = 'wd_',
+                 codec: Optional['CacheCodec'] = None) -> None:
         self.cache_object = cache_object
         self.timeout = timeout  # type: int
         if property_timeout is None:
             property_timeout = timeout
         self.property_timeout = property_timeout  # type: int
         self.namespace = namespace  # type: str
+        if codec is None:
+            from .cachecodec import PickleCodec
+            codec = PickleCodec()
+        self.codec = codec  # type: CacheCodec
+        self.counters = CacheStats()
 
     def encode_key(self, key: CacheKey) -> str:
         k = self.namespace + hashlib.md5(key.encode('utf-8')).hexdigest()
@@ -148,15 +320,454 @@ class ProxyCachePolicy(CachePolicy):
     def get(self, key: CacheKey) -> Optional[CacheValue]:
         k = self.encode_key(key)
         v = self.cache_object.get(k)
-        if v is None:
+        value = None if v is None else self.codec.decode(v)
+        if value is None:
+            self.counters.misses += 1
             return None
-        return pickle.loads(v)
+        self.counters.hits += 1
+        return value
 
     def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
         k = self.encode_key(key)
         if value is None:
             self.cache_object.delete(k)
+            self.counters.deletes += 1
             return
-        v = pickle.dumps(value)
+        v = self.codec.encode(value)
         time = self.property_timeout if self.is_property(key) else self.timeout
         self.cache_object.set(k, v, time)
+        self.counters.sets += 1
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        # Pickled by older versions, which always pickled values:
+        if 'codec' not in state:
+            from .cachecodec import PickleCodec
+            self.codec = PickleCodec()
+        if 'counters' not in state:
+            self.counters = CacheStats()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of lookups and updates made through the policy.
+        Since the cache object may be shared with others and may evict or
+        expire values by itself, the other statistics are unknown.  Wrap
+        the cache object with :class:`StatsCacheObject` to know more.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        .. versionadded:: 0.10.0
+
+        """
+        return copy.copy(self.counters)
+
+
+class StatsCacheObject:
+    """Wrapper of a cache object for :class:`ProxyCachePolicy` which counts
+    operations made to the cache object, regardless of which policy or
+    client makes them:
+
+    .. code-block:: python
+
+       backend = StatsCacheObject(memcache.Client(['127.0.0.1:11211']))
+       client = Client(cache_policy=ProxyCachePolicy(backend, 3600))
+       ...
+       backend.stats().hit_ratio
+
+    It also tracks the number and the total size of values stored through
+    it (unless they're evicted or expired by the cache object itself,
+    which can't be noticed).
+
+    :param cache_object: The cache object to wrap.  It has to satisfy
+                         the interface described in
+                         :class:`ProxyCachePolicy`.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(self, cache_object) -> None:
+        self.cache_object = cache_object
+        self.counters = CacheStats()
+        self.counters.entries = self.counters.size = 0
+        self.sizes: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.cache_object.get(key)
+        if value is None:
+            self.counters.misses += 1
+            if self.sizes.pop(key, None) is not None:
+                # It was stored through this wrapper, but it's gone.
+                self.counters.expirations += 1
+        else:
+            self.counters.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, timeout: int = 0) -> None:
+        self.cache_object.set(key, value, timeout)
+        self.counters.sets += 1
+        self.sizes[key] = len(value)
+
+    def delete(self, key: str) -> None:
+        self.cache_object.delete(key)
+        self.counters.deletes += 1
+        self.sizes.pop(key, None)
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache object.  Values that disappeared
+        from the cache object are counted as :attr:`CacheStats.expirations`
+        when they're looked up, since evictions and expirations can't be
+        told apart from outside.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        """
+        stats = copy.copy(self.counters)
+        stats.entries = len(self.sizes)
+        stats.size = sum(self.sizes.values())
+        return stats
+
+
+class TieredCachePolicy(CachePolicy):
+    r"""Chain of cache policies, e.g., an in-process
+    :class:`MemoryCachePolicy` in front of a :class:`ProxyCachePolicy`
+    to memcached, so that hot values are served from the process memory:
+
+    .. code-block:: python
+
+       policy = TieredCachePolicy([
+           MemoryCachePolicy(1024),
+           ProxyCachePolicy(memcache_client, 3600),
+       ])
+
+    Values are looked up from the first tier to the last, and a value found
+    in a lower tier is promoted to the tiers above it.  Values are stored to
+    every tier: to the first tier at once, and to lower tiers either at once
+    (write-through, the default) or by a background thread
+    (write-behind).
+
+    :param tiers: The cache policies from the fastest to the slowest.
+    :type tiers: :class:`~typing.Sequence`\ [:class:`CachePolicy`]
+    :param write_behind: Whether to store values to lower tiers in
+                         a background thread, so that storing doesn't wait
+                         for them.  Use :meth:`flush()` to wait for pending
+                         writes.  Failed writes are only logged.
+                         :const:`False` by default.
+    :type write_behind: :class:`bool`
+    :param negative_ttl: Seconds to remember that no tier has a key,
+                         so that looking it up again doesn't reach lower
+                         tiers until a value is stored.  0 (default) means
+                         misses are not remembered.
+    :type negative_ttl: :class:`float`
+    :param max_negatives: The maximum number of missing keys to remember.
+                          1024 by default.
+    :type max_negatives: :class:`int`
+    :raise ValueError: When ``tiers`` is empty.
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(self,
+                 tiers: Sequence[CachePolicy],
+                 write_behind: bool = False,
+                 negative_ttl: float = 0,
+                 max_negatives: int = 1024) -> None:
+        if not tiers:
+            raise ValueError('tiers must not be empty')
+        #: (:class:`~typing.List`\ [:class:`CachePolicy`]) The tiers.
+        self.tiers = list(tiers)
+        self.write_behind = write_behind
+        self.negative_ttl = negative_ttl
+        self.max_negatives = max_negatives
+        #: (:class:`~collections.OrderedDict`) The missing keys and when
+        #: they expire, in the order of :func:`time.monotonic()`.
+        self.negatives: 'collections.OrderedDict[CacheKey, float]' = \
+            collections.OrderedDict()
+        self.counters = CacheStats()
+        self.tier_counters = [CacheStats() for _ in self.tiers]
+        #: (:class:`int`) The number of lookups answered by remembered
+        #: missing keys.  They are counted as misses as well.
+        self.negative_hits = 0
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.writes: Deque['concurrent.futures.Future[None]'] = \
+            collections.deque()
+        # Guards the bookkeeping above, but not the tiers, which are
+        # looked up and updated outside of it.
+        self.lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[CacheValue]:
+        with self.lock:
+            expires = self.negatives.get(key)
+            if expires is not None:
+                if expires > time.monotonic():
+                    self.negative_hits += 1
+                    self.counters.misses += 1
+                    return None
+                del self.negatives[key]
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            with self.lock:
+                if value is None:
+                    self.tier_counters[i].misses += 1
+                    continue
+                self.tier_counters[i].hits += 1
+                self.counters.hits += 1
+            if i:
+                self.tiers[0].set(key, value)
+                self.write(self.tiers[1:i], key, value)
+            return value
+        with self.lock:
+            self.counters.misses += 1
+            if self.negative_ttl > 0:
+                self.negatives[key] = time.monotonic() + self.negative_ttl
+                self.negatives.move_to_end(key)
+                while len(self.negatives) > self.max_negatives:
+                    self.negatives.popitem(last=False)
+        return None
+
+    def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
+        with self.lock:
+            self.negatives.pop(key, None)
+            if value is None:
+                self.counters.deletes += 1
+            else:
+                self.counters.sets += 1
+        self.tiers[0].set(key, value)
+        self.write(self.tiers[1:], key, value)
+
+    def write(self,
+              tiers: Sequence[CachePolicy],
+              key: CacheKey,
+              value: Optional[CacheValue]) -> None:
+        if not tiers:
+            return
+        if not self.write_behind:
+            for tier in tiers:
+                tier.set(key, value)
+            return
+        with self.lock:
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(
+                    1, thread_name_prefix='TieredCachePolicy'
+                )
+            writes = self.writes
+            while writes and writes[0].done():
+                writes.popleft()
+            writes.append(self.executor.submit(self.write_behind_to,
+                                               tiers, key, value))
+
+    @staticmethod
+    def write_behind_to(tiers: Sequence[CachePolicy],
+                        key: CacheKey,
+                        value: Optional[CacheValue]) -> None:
+        for tier in tiers:
+            try:
+                tier.set(key, value)
+            except Exception:
+                logging.getLogger(
+                    __name__ + '.TieredCachePolicy.write_behind_to'
+                ).exception('Failed to write %r to %r', key, tier)
+
+    def flush(self) -> None:
+        """Wait until pending writes to lower tiers are done.  It does
+        nothing unless ``write_behind`` is enabled.
+
+        """
+        writes = self.writes
+        while True:
+            with self.lock:
+                if not writes:
+                    return
+                future = writes.popleft()
+            future.result()
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of lookups and updates made through the policy.
+        A lookup is a hit if any tier has the value.  See also
+        :meth:`tier_stats()`.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        """
+        with self.lock:
+            return copy.copy(self.counters)
+
+    def tier_stats(self) -> List[CacheStats]:
+        r"""Get the statistics of lookups to each tier, which tell where
+        values are served from.  A tier is looked up only if the tiers above
+        it miss, and missing keys remembered by ``negative_ttl`` don't reach
+        any tier.
+
+        :return: The statistics of each tier, in the same order as
+                 :attr:`tiers`.
+        :rtype: :class:`~typing.List`\ [:class:`CacheStats`]
+
+        """
+        with self.lock:
+            return [copy.copy(counters) for counters in self.tier_counters]
+
+    def __reduce__(self) -> Tuple[Callable[..., 'TieredCachePolicy'],
+                                  Tuple[object, ...]]:
+        return type(self), (self.tiers, self.write_behind,
+                            self.negative_ttl, self.max_negatives)
+
+
+class RevalidatingCachePolicy(CachePolicy):
+    r"""Wrapper of a cache policy which keeps serving values for a while
+    after they expire, i.e., *stale-while-revalidate*.  When a stale value
+    is looked up through :meth:`Client.request()
+    <wikidata.client.Client.request>`, it's returned at once, and the client
+    requests the fresh value in the background to replace it.  Each key is
+    revalidated by only one request at a time, however many times its stale
+    value is looked up in the meantime.
+
+    .. code-block:: python
+
+       policy = RevalidatingCachePolicy(
+           ProxyCachePolicy(memcache_client, 3600 + 600),
+           max_age=3600, stale_window=600
+       )
+       client = Client(cache_policy=policy)
+
+    Values are stored to the wrapped ``policy`` with the time they're
+    stored, so its own lifespan of values (if any) should be longer than
+    ``max_age`` and ``stale_window`` combined.  It has to be the
+    :attr:`Client.cache_policy <wikidata.client.Client.cache_policy>`
+    itself to be revalidated, not be wrapped by other policies.
+
+    Since fresh values are stored from worker threads, the wrapped
+    ``policy`` has to be thread-safe.  :class:`MemoryCachePolicy` and
+    :class:`TieredCachePolicy` are, and so is :class:`ProxyCachePolicy`
+    if its cache object is.
+
+    :param policy: The cache policy to store values.
+    :type policy: :class:`CachePolicy`
+    :param max_age: Seconds during which a stored value is fresh.
+    :type max_age: :class:`float`
+    :param stale_window: Seconds after ``max_age`` during which a stored
+                         value is still returned, but revalidated.
+                         After that, it's a miss.
+    :type stale_window: :class:`float`
+    :param max_workers: The maximum number of revalidations at a time.
+                        2 by default.
+    :type max_workers: :class:`int`
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    def __init__(self,
+                 policy: CachePolicy,
+                 max_age: float,
+                 stale_window: float,
+                 max_workers: int = 2) -> None:
+        self.policy = policy
+        self.max_age = max_age
+        self.stale_window = stale_window
+        self.max_workers = max_workers
+        #: (:class:`~typing.Callable`\ [[], :class:`float`]) The clock of
+        #: the time values are stored, in seconds.  :func:`time.time()`,
+        #: so that it can be shared by processes.
+        self.clock = time.time
+        #: (:class:`int`) The number of stale values returned.
+        self.stale_hits = 0
+        #: (:class:`int`) The number of revalidations started.
+        self.revalidations = 0
+        self.lock = threading.Lock()
+        self.stale_keys: Set[CacheKey] = set()
+        self.revalidating: Dict[CacheKey,
+                                'concurrent.futures.Future[None]'] = {}
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def get(self, key: CacheKey) -> Optional[CacheValue]:
+        entry = self.policy.get(key)
+        if not isinstance(entry, (tuple, list)) or len(entry) != 2:
+            return None
+        stored_at, value = entry
+        age = self.clock() - stored_at
+        if age <= self.max_age:
+            return CacheValue(value)
+        elif age > self.max_age + self.stale_window:
+            return None
+        self.stale_hits += 1
+        with self.lock:
+            self.stale_keys.add(key)
+        return CacheValue(value)
+
+    def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
+        with self.lock:
+            self.stale_keys.discard(key)
+        self.policy.set(
+            key,
+            None if value is None else CacheValue((self.clock(), value))
+        )
+
+    def revalidate(self, key: CacheKey, fetch: Callable[[], object]) -> bool:
+        r"""Call ``fetch`` in the background to refresh the given ``key``
+        if its value has been found stale by :meth:`get()`, unless it's
+        already being revalidated.  ``fetch`` is expected to store the fresh
+        value through :meth:`set()`, as :meth:`Client.request()
+        <wikidata.client.Client.request>` does.  Errors it raises are only
+        logged, and the key is revalidated again on the next lookup.
+
+        :param key: The key to revalidate.
+        :type key: :const:`CacheKey`
+        :param fetch: The function to fetch and store the fresh value.
+        :type fetch: :class:`~typing.Callable`\ [[], :class:`object`]
+        :return: Whether a revalidation has started.
+        :rtype: :class:`bool`
+
+        """
+        with self.lock:
+            if key not in self.stale_keys or key in self.revalidating:
+                return False
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers,
+                    thread_name_prefix='RevalidatingCachePolicy'
+                )
+            self.revalidations += 1
+            self.revalidating[key] = self.executor.submit(
+                self.run_revalidation, key, fetch
+            )
+        return True
+
+    def run_revalidation(self,
+                         key: CacheKey,
+                         fetch: Callable[[], object]) -> None:
+        try:
+            fetch()
+        except Exception:
+            logging.getLogger(
+                __name__ + '.RevalidatingCachePolicy.revalidate'
+            ).exception('Failed to revalidate %r', key)
+        finally:
+            with self.lock:
+                del self.revalidating[key]
+
+    def flush(self) -> None:
+        """Wait until ongoing revalidations are done."""
+        while True:
+            with self.lock:
+                futures = list(self.revalidating.values())
+            if not futures:
+                return
+            concurrent.futures.wait(futures)
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the wrapped policy.  See also
+        :attr:`stale_hits` and :attr:`revalidations`.
+
+        :return: The statistics.
+        :rtype: :class:`CacheStats`
+
+        """
+        return self.policy.stats()
+
+    def __reduce__(self) -> Tuple[Callable[..., 'RevalidatingCachePolicy'],
+                                  Tuple[object, ...]]:
+        return type(self), (self.policy, self.max_age, self.stale_window,
+                            self.max_workers)
@@ -0,0 +1,174 @@
+r"""Codecs to serialize cached values.
+
+:class:`~.cache.ProxyCachePolicy` stores values into cache objects like
+memcached as :class:`bytes`, which are made by a codec.  Values are pickled
+by default (:class:`PickleCodec`), but other codecs can be chosen:
+
+:class:`JsonCodec`
+   Stores values as JSON, which is what the API responded.  Values parsed
+   by :class:`~.lazyjson.LazyJsonBackend` are stored without serialization
+   since they keep the original response, and hits can be lazily parsed
+   as well if the codec is given the backend.  Entries can be shared by
+   any version of Python and this library.
+
+:class:`MarshalCodec`
+   Stores values in the :mod:`marshal` format, which is compact and fast
+   to decode, but specific to a version of the format.  Entries written in
+   another version are treated as misses.
+
+.. code-block:: python
+
+   policy = ProxyCachePolicy(memcache_client, 3600,
+                             codec=JsonCodec(LazyJsonBackend()))
+   client = Client(cache_policy=policy, json_backend=LazyJsonBackend())
+
+.. versionadded:: 0.10.0
+
+"""
+import json
+import marshal
+import pickle
+from typing import Any, Mapping, Optional, Sequence, cast
+
+from .cache import CacheValue
+from .jsonbackend import JsonBackend, StdlibJsonBackend
+from .lazyjson import LazyObject
+
+__all__ = 'CacheCodec', 'JsonCodec', 'MarshalCodec', 'PickleCodec'
+
+
+class CacheCodec:
+    """Interface for codecs which turn cached values into :class:`bytes`
+    and vice versa.
+
+    """
+
+    def encode(self, value: CacheValue) -> bytes:
+        """Serialize the given ``value``.
+
+        :param value: The value to serialize.
+        :type value: :const:`~.cache.CacheValue`
+        :return: The serialized value.
+        :rtype: :class:`bytes`
+
+        """
+        raise NotImplementedError(
+            'Concreate subclasses of {0.__module__}.{0.__qualname__} have to '
+            'override .encode() method'.format(CacheCodec)
+        )
+
+    def decode(self, data: bytes) -> Optional[CacheValue]:
+        r"""Deserialize the given ``data``.
+
+        :param data: The serialized value.
+        :type data: :class:`bytes`
+        :return: The value, or :const:`None` if the ``data`` can't be
+                 decoded by the codec, e.g., it's written in an other format
+                 version, so that it's treated as a cache miss.
+        :rtype: :class:`~typing.Optional`\ [:const:`~.cache.CacheValue`]
+
+        """
+        raise NotImplementedError(
+            'Concreate subclasses of {0.__module__}.{0.__qualname__} have to '
+            'override .decode() method'.format(CacheCodec)
+        )
+
+
+class PickleCodec(CacheCodec):
+    r"""The default codec, which pickles values.
+
+    :param protocol: The :mod:`pickle` protocol version.  The default
+                     protocol of :func:`pickle.dumps()` by default.
+    :type protocol: :class:`~typing.Optional`\ [:class:`int`]
+
+    """
+
+    def __init__(self, protocol: Optional[int] = None) -> None:
+        self.protocol = protocol
+
+    def encode(self, value: CacheValue) -> bytes:
+        return pickle.dumps(value, self.protocol)
+
+    def decode(self, data: bytes) -> Optional[CacheValue]:
+        return CacheValue(pickle.loads(data))
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}({1!r})'.format(
+            type(self), self.protocol
+        )
+
+
+def plain(value: object) -> object:
+    r"""Turn mappings and sequences in the given ``value`` (e.g.,
+    :class:`~.lazyjson.LazyObject`) into :class:`dict`\ s and
+    :class:`list`\ s.
+
+    """
+    if isinstance(value, Mapping):
+        return {k: plain(v) for k, v in value.items()}
+    elif isinstance(value, Sequence) and not isinstance(value, str):
+        return [plain(v) for v in value]
+    return value
+
+
+class JsonCodec(CacheCodec):
+    r"""Codec which stores values as JSON.  Since
+    :class:`~.lazyjson.LazyObject`\ s are stored as their original JSON
+    text, pair it with :class:`~.lazyjson.LazyJsonBackend` to skip both
+    serialization and eager parsing.
+
+    :param backend: The JSON backend to parse stored values.
+                    :class:`~.jsonbackend.StdlibJsonBackend` by default.
+    :type backend: :class:`~.jsonbackend.JsonBackend`
+
+    """
+
+    def __init__(self, backend: Optional[JsonBackend] = None) -> None:
+        if backend is None:
+            backend = StdlibJsonBackend()
+        self.backend = backend
+
+    def encode(self, value: CacheValue) -> bytes:
+        if isinstance(value, LazyObject):
+            text = value.dumps()
+        else:
+            text = json.dumps(value, ensure_ascii=False,
+                              separators=(',', ':'), default=plain)
+        return text.encode('utf-8')
+
+    def decode(self, data: bytes) -> Optional[CacheValue]:
+        return CacheValue(self.backend.loads(data))
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}({1!r})'.format(
+            type(self), self.backend
+        )
+
+
+class MarshalCodec(CacheCodec):
+    r"""Codec which stores values in the :mod:`marshal` format.  It's more
+    compact and faster than pickles, but values are limited to built-in
+    types; other mappings and sequences are stored as :class:`dict`\ s and
+    :class:`list`\ s.  The format version is prepended to entries, and
+    entries of other versions are treated as misses.
+
+    """
+
+    #: (:class:`bytes`) The header of entries.
+    HEADER = b'WDM' + bytes([marshal.version])
+
+    def encode(self, value: CacheValue) -> bytes:
+        try:
+            data = marshal.dumps(cast(Any, value))
+        except ValueError:
+            data = marshal.dumps(cast(Any, plain(value)))
+        return self.HEADER + data
+
+    def decode(self, data: bytes) -> Optional[CacheValue]:
+        header = self.HEADER
+        if data[:len(header)] != header:
+            return None
+        return CacheValue(marshal.loads(data[len(header):]))
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}()'.format(type(self))
@@ -1,29 +1,41 @@
-import io
-import json
+import functools
 import logging
 import urllib.error
 import urllib.parse
 import urllib.request
-import weakref
 from typing import (
     Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
     Mapping,
-    MutableMapping,
     Optional,
     Sequence,
+    Set,
     TYPE_CHECKING,
     Tuple,
     Union,
     cast,
 )
 
-from .cache import CacheKey, CachePolicy, NullCachePolicy
-from .entity import Entity, EntityId, EntityType
+from .cache import (CacheKey, CachePolicy, CacheValue, NullCachePolicy,
+                    RevalidatingCachePolicy)
+from .entity import Entity, EntityId, EntityState, EntityType
+from .identitymap import IdentityMap, WeakIdentityMap
+from .interning import intern_pairs
+from .jsonbackend import JsonBackend, StdlibJsonBackend
+from .multilingual import (DEFAULT_FALLBACK, LanguageFallback,
+                           MultilingualText)
+from .observer import RequestEvent, RequestObserver
+from .terms import TermCache
 
 if TYPE_CHECKING:
+    from .commonsmedia import File  # noqa: F401
     from .datavalue import Decoder  # noqa: F401
 
-__all__ = 'WIKIDATA_BASE_URL', 'Client'
+__all__ = 'WIKIDATA_BASE_URL', 'WIKIDATA_SPARQL_URL', 'Client'
 
 
 #: (:class:`str`) The default ``base_url`` of :class:`Client` constructor.
@@ -35,6 +47,11 @@ __all__ = 'WIKIDATA_BASE_URL', 'Client'
 #:    ``wiki/``).
 WIKIDATA_BASE_URL = 'https://www.wikidata.org/'
 
+#: (:class:`str`) The default ``sparql_url`` of :class:`Client` constructor.
+#:
+#: .. versionadded:: 0.10.0
+WIKIDATA_SPARQL_URL = 'https://query.wikidata.org/sparql'
+
 
 class Client:
     """Wikidata client session.
@@ -53,6 +70,50 @@ class Client:
     :param cache_policy: A caching policy for API calls.  No cache
                         (:class:`~wikidata.cache.NullCachePolicy`) by default.
     :type cache_policy: :class:`~wikidata.cache.CachePolicy`
+    :param sparql_url: The endpoint url of the SPARQL query service.
+                       :const:`WIKIDATA_SPARQL_URL` is used by default.
+    :type sparql_url: :class:`str`
+    :param identity_map: The identity map to keep entities in.
+                         :class:`~.identitymap.WeakIdentityMap` by default.
+    :type identity_map: :class:`~.identitymap.IdentityMap`
+    :param language_fallback: The language fallback to resolve which
+                              locale of :attr:`Entity.label
+                              <wikidata.entity.Entity.label>` and
+                              :attr:`Entity.description
+                              <wikidata.entity.Entity.description>` to show.
+                              :const:`~.multilingual.DEFAULT_FALLBACK`
+                              (English) by default.
+    :type language_fallback: :class:`~.multilingual.LanguageFallback`
+    :param intern_strings: Whether to intern repeated strings in responses,
+                           e.g., property ids and language codes, using
+                           :func:`~.interning.intern_pairs()`.  It saves
+                           memory when many entities are kept loaded.
+                           :const:`False` by default.
+    :type intern_strings: :class:`bool`
+    :param json_backend: The parser of responses.
+                         :class:`~.jsonbackend.StdlibJsonBackend` by
+                         default.  See also :mod:`wikidata.jsonbackend`.
+    :type json_backend: :class:`~.jsonbackend.JsonBackend`
+    :param stream_responses: Whether to parse responses of
+                             :meth:`load_entities()` incrementally using
+                             :class:`~.jsonstream.EntityStream`, so that
+                             entities are loaded while a response is being
+                             received, without keeping the whole response
+                             in memory.  :const:`False` by default.
+    :type stream_responses: :class:`bool`
+    :param term_cache: The cache of labels and descriptions fetched by
+                       :meth:`get_labels()`.  A new
+                       :class:`~.terms.TermCache` by default.
+    :type term_cache: :class:`~.terms.TermCache`
+    :param observers: The observers to be notified of every request made by
+                      :meth:`request()`.  See also :mod:`wikidata.observer`.
+    :type observers: :class:`~typing.Iterable`\
+                     [:class:`~.observer.RequestObserver`]
+
+    .. versionadded:: 0.10.0
+       The ``sparql_url``, ``identity_map``, ``language_fallback``,
+       ``intern_strings``, ``observers``, ``term_cache``, ``json_backend``,
+       and ``stream_responses`` options.
 
     .. versionadded:: 0.5.0
        The ``cache_policy`` option.
@@ -87,6 +148,13 @@ class Client:
     #: .. versionadded:: 0.5.0
     cache_policy = NullCachePolicy()  # type: CachePolicy
 
+    #: (:class:`int`) The maximum number of entities to load by a single
+    #: request in :meth:`load_entities()`.  It's the limit of the ``ids``
+    #: parameter of the ``wbgetentities`` API.
+    #:
+    #: .. versionadded:: 0.10.0
+    entities_per_request = 50
+
     def __init__(self,
                  # CHECK: If the signature of this function changes,
                  #        the implementation of __reduce__() also should be
@@ -99,12 +167,20 @@ class Client:
                                                    object],
                                           None] = None,
                  entity_type_guess: bool = True,
-                 cache_policy: CachePolicy = NullCachePolicy(),
+                 cache_policy: Optional[CachePolicy] = None,
                  repr_string: Optional[str] = None,
                  user_agent: str = (
                       'WikidataClientPython '
                       '(https://github.com/dahlia/wikidata; hong@minhee.org)'
-                  )) -> None:
+                  ),
+                 sparql_url: str = WIKIDATA_SPARQL_URL,
+                 identity_map: Optional[IdentityMap] = None,
+                 language_fallback: LanguageFallback = DEFAULT_FALLBACK,
+                 intern_strings: bool = False,
+                 observers: Iterable[RequestObserver] = (),
+                 term_cache: Optional[TermCache] = None,
+                 json_backend: Optional[JsonBackend] = None,
+                 stream_responses: bool = False) -> None:
         self._using_default_opener = opener is None
         if self._using_default_opener:
             if urllib.request._opener is None:  # type: ignore
@@ -122,13 +198,44 @@ class Client:
         self.opener = opener  # type: urllib.request.OpenerDirector
         self.datavalue_decoder = datavalue_decoder
         self.entity_type_guess = entity_type_guess
+        if cache_policy is None:
+            cache_policy = NullCachePolicy()
         self.cache_policy = cache_policy  # type: CachePolicy
-        self.identity_map = cast(MutableMapping[EntityId, Entity],
-                                 weakref.WeakValueDictionary())
+        if identity_map is None:
+            identity_map = WeakIdentityMap()
+        #: (:class:`~.identitymap.IdentityMap`) The identity map to keep
+        #: only one :class:`~.entity.Entity` object per
+        #: :class:`~.entity.EntityId`.
+        self.identity_map = identity_map
+        #: (:class:`~.multilingual.LanguageFallback`) The language fallback
+        #: of :attr:`Entity.label <wikidata.entity.Entity.label>` and
+        #: :attr:`Entity.description <wikidata.entity.Entity.description>`.
+        self.language_fallback = language_fallback
+        #: (:class:`bool`) Whether to intern repeated strings in responses.
+        self.intern_strings = intern_strings
+        #: (:class:`~typing.List`\ [:class:`~.observer.RequestObserver`])
+        #: The observers to be notified of every request.
+        self.observers: List[RequestObserver] = list(observers)
+        if term_cache is None:
+            term_cache = TermCache()
+        #: (:class:`~.terms.TermCache`) The cache of labels and descriptions
+        #: fetched by :meth:`get_labels()`.
+        self.term_cache = term_cache
+        if json_backend is None:
+            json_backend = StdlibJsonBackend()
+        #: (:class:`~.jsonbackend.JsonBackend`) The parser of responses.
+        self.json_backend = json_backend
+        #: (:class:`bool`) Whether to parse responses of
+        #: :meth:`load_entities()` incrementally.
+        self.stream_responses = stream_responses
         self.repr_string = repr_string
         self.user_agent = user_agent
+        self.sparql_url = sparql_url
 
-    def get(self, entity_id: EntityId, load: bool = False) -> Entity:
+    def get(self,
+            entity_id: EntityId,
+            load: bool = False,
+            expand: int = 0) -> Entity:
         """Get a Wikidata entity by its :class:`~.entity.EntityId`.
 
         :param entity_id: The :attr:`~.entity.Entity.id` of
@@ -137,9 +244,18 @@ class Client:
         :param load: Eager loading on :const:`True`.
                      Lazy loading (:const:`False`) by default.
         :type load: :class:`bool`
+        :param expand: How many hops of the entities which the statements
+                       refer to are eagerly loaded in batches as well.
+                       See also :meth:`Entity.expand()
+                       <wikidata.entity.Entity.expand>`.  It implies
+                       ``load``.  0 (no expansion) by default.
+        :type expand: :class:`int`
         :return: The found entity.
         :rtype: :class:`~.entity.Entity`
 
+        .. versionadded:: 0.10.0
+           The ``expand`` option.
+
         .. versionadded:: 0.3.0
            The ``load`` option.
 
@@ -149,10 +265,282 @@ class Client:
         except KeyError:
             entity = Entity(entity_id, self)
             self.identity_map[entity_id] = entity
-        if load:
+        if expand > 0:
+            entity.expand(expand)
+        elif load:
             entity.load()
         return entity
 
+    def load_entities(self, entities: Iterable[Entity]) -> None:
+        r"""Load the given ``entities`` at once.  Unlike calling
+        :meth:`Entity.load() <wikidata.entity.Entity.load>` for each entity,
+        it makes only a request per :attr:`entities_per_request` entities.
+        Entities that are already loaded or known to be non-existent are
+        skipped.
+
+        :param entities: The entities to load.
+        :type entities: :class:`~typing.Iterable`\ [:class:`~.entity.Entity`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        pending: Dict[EntityId, List[Entity]] = {}
+        for entity in entities:
+            if entity.data is None and \
+               entity.state is not EntityState.non_existent:
+                pending.setdefault(entity.id, []).append(entity)
+        ids = list(pending)
+        size = self.entities_per_request
+        for offset in range(0, len(ids), size):
+            chunk = ids[offset:offset + size]
+            path = './w/api.php?action=wbgetentities&format=json&ids={}'
+            path = path.format(urllib.parse.quote('|'.join(chunk), safe='|'))
+            entities_data: Iterable[Tuple[str, Mapping[str, object]]]
+            if self.stream_responses:
+                entities_data = self.request_entities(path, chunk,
+                                                      batched=True)
+            else:
+                result = self.request(path, chunk, batched=True)
+                if isinstance(result, Mapping) and 'entities' in result:
+                    found = result['entities']
+                    assert isinstance(found, Mapping)
+                    entities_data = cast(Mapping[str, Mapping[str, object]],
+                                         found).items()
+                else:
+                    entities_data = ()
+            loaded = False
+            for key, data in entities_data:
+                loaded = True
+                redirects = data.get('redirects')
+                if isinstance(redirects, Mapping):
+                    requested_id = redirects['from']
+                else:
+                    requested_id = key
+                for entity in pending.get(requested_id, ()):
+                    if 'missing' in data:
+                        entity.state = EntityState.non_existent
+                    else:
+                        entity._set_data(cast(EntityId, data['id']), data)
+            if not loaded:
+                # The whole batch fails if it contains even an invalid id,
+                # so fall back to loading them one by one.
+                for entity_id in chunk:
+                    for entity in pending[entity_id]:
+                        entity.load()
+
+    def load_files(self, entities: Iterable[Entity]) -> List['File']:
+        r"""Decode all :class:`~.commonsmedia.File` values of the given
+        ``entities``' statements (i.e., values of ``commonsMedia``
+        properties) and load them at once using
+        :meth:`File.load_many() <wikidata.commonsmedia.File.load_many>`.
+        Entities are loaded if they are not loaded yet.
+
+        Since the results of files are also cached by their titles,
+        files decoded later from the same statements can be loaded without
+        requests as well.
+
+        :param entities: The entities whose files to load.
+        :type entities: :class:`~typing.Iterable`\ [:class:`~.entity.Entity`]
+        :return: The loaded files in order of appearance.
+        :rtype: :class:`~typing.List`\ [:class:`~.commonsmedia.File`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        from .commonsmedia import File  # noqa: F811
+        entities = list(entities)
+        self.load_entities(entities)
+        files: List[File] = []
+        for entity in entities:
+            if entity.state is not EntityState.loaded:
+                continue
+            claims = entity.attributes.get('claims') or {}
+            assert isinstance(claims, Mapping)
+            for statements in claims.values():
+                for statement in statements:
+                    snak = statement['mainsnak']
+                    if snak.get('datatype') != 'commonsMedia' or \
+                       snak['snaktype'] != 'value':
+                        continue
+                    value = self.decode_datavalue(snak['datatype'],
+                                                  snak['datavalue'])
+                    if isinstance(value, File):
+                        files.append(value)
+        File.load_many(files)
+        return files
+
+    def get_labels(
+        self,
+        entity_ids: Iterable[EntityId],
+        languages: Iterable[str] = ('en',),
+        descriptions: bool = False
+    ) -> Dict[EntityId, MultilingualText]:
+        r"""Fetch only labels (and optionally descriptions) of the given
+        entities in the given ``languages``, which is far lighter than
+        loading whole entities.  It makes only a request per
+        :attr:`entities_per_request` entities, and the fetched texts are
+        kept in :attr:`term_cache`; entities whose texts in all
+        ``languages`` are already cached are not requested again.
+
+        :attr:`Entity.label <wikidata.entity.Entity.label>` and
+        :attr:`Entity.description <wikidata.entity.Entity.description>` of
+        entities that are not loaded are filled from :attr:`term_cache`
+        without loading them:
+
+        .. code-block:: python
+
+           labels = client.get_labels(ids, ['ko', 'en'])
+           str(labels[ids[0]])
+           str(client.get(ids[0]).label)  # no request
+
+        :param entity_ids: The ids of entities.
+        :type entity_ids: :class:`~typing.Iterable`\
+                          [:class:`~.entity.EntityId`]
+        :param languages: The language codes to fetch.  English by default.
+        :type languages: :class:`~typing.Iterable`\ [:class:`str`]
+        :param descriptions: Fetch descriptions as well if :const:`True`.
+        :type descriptions: :class:`bool`
+        :return: The labels by entity id.  Non-existent entities are
+                 omitted.
+        :rtype: :class:`~typing.Dict`\ [:class:`~.entity.EntityId`,
+                :class:`~.multilingual.MultilingualText`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        languages = list(dict.fromkeys(languages))
+        attributes = ['labels']
+        if descriptions:
+            attributes.append('descriptions')
+        ids = list(dict.fromkeys(entity_ids))
+        term_cache = self.term_cache
+        pending = [
+            entity_id for entity_id in ids
+            if any(term_cache.missing_languages(entity_id, attr, languages)
+                   for attr in attributes)
+        ]
+        size = self.entities_per_request
+        for offset in range(0, len(pending), size):
+            self.fetch_terms(pending[offset:offset + size],
+                             languages, attributes)
+        result = {}
+        for entity_id in ids:
+            labels = term_cache.get(entity_id, 'labels')
+            if labels is not None:
+                result[entity_id] = labels
+        return result
+
+    def fetch_terms(self,
+                    entity_ids: Sequence[EntityId],
+                    languages: Sequence[str],
+                    attributes: Sequence[str]) -> None:
+        path = './w/api.php?action=wbgetentities&format=json' \
+            '&props={}&languages={}&ids={}'
+        quote = urllib.parse.quote
+        result = self.request(path.format(
+            quote('|'.join(attributes), safe='|'),
+            quote('|'.join(languages), safe='|'),
+            quote('|'.join(entity_ids), safe='|')
+        ), entity_ids, batched=True)
+        if not isinstance(result, Mapping) or 'entities' not in result:
+            # The whole batch fails if it contains even an invalid id,
+            # so fall back to fetching them one by one.
+            if len(entity_ids) > 1:
+                for entity_id in entity_ids:
+                    self.fetch_terms([entity_id], languages, attributes)
+            return
+        entities_data = result['entities']
+        assert isinstance(entities_data, Mapping)
+        for key, data in entities_data.items():
+            assert isinstance(data, Mapping)
+            if 'missing' in data:
+                continue
+            redirects = data.get('redirects')
+            if isinstance(redirects, Mapping):
+                entity_id = EntityId(redirects['from'])
+            else:
+                entity_id = EntityId(key)
+            for attr in attributes:
+                terms = data.get(attr) or {}
+                assert isinstance(terms, Mapping)
+                self.term_cache.update(entity_id, attr, languages, terms,
+                                       self.language_fallback)
+
+    def traverse(
+        self,
+        roots: Iterable[Entity],
+        props: Iterable[Union[Entity, EntityId]],
+        max_depth: Optional[int] = None
+    ) -> Iterator[Tuple[Entity, int, Tuple[Entity, ...]]]:
+        r"""Traverse the graph of entities breadth-first, following
+        the entity values of the given ``props``, e.g., *subclass of*
+        (``P279``) or *located in* (``P131``).  Entities of each depth are
+        loaded at once using :meth:`load_entities()`, and every entity is
+        visited only once even if there are cycles.
+
+        It yields triples of an entity, its depth, and the path from its
+        root to the entity (both ends inclusive).  Roots are yielded with
+        depth 0, and non-existent entities are never yielded.
+
+        .. code-block:: python
+
+           subclass_of = client.get('P279')
+           for cls, depth, path in client.traverse([human], [subclass_of]):
+               print('  ' * depth, cls.label)
+
+        :param roots: The entities to start from.
+        :type roots: :class:`~typing.Iterable`\ [:class:`~.entity.Entity`]
+        :param props: The properties to follow.  Property ids are also
+                      accepted.
+        :type props: :class:`~typing.Iterable`\ [:class:`~typing.Union`\
+                     [:class:`~.entity.Entity`, :class:`~.entity.EntityId`]]
+        :param max_depth: The maximum depth to traverse.  Unlimited if
+                          :const:`None` (default).
+        :type max_depth: :class:`~typing.Optional`\ [:class:`int`]
+        :return: The triples of an entity, its depth, and its path.
+        :rtype: :class:`~typing.Iterator`\ [:class:`~typing.Tuple`\
+                [:class:`~.entity.Entity`, :class:`int`,
+                :class:`~typing.Tuple`\ [:class:`~.entity.Entity`, ...]]]
+
+        .. versionadded:: 0.10.0
+
+        """
+        properties = [
+            p if isinstance(p, Entity) else self.get(p)
+            for p in props
+        ]
+        visited: Set[EntityId] = set()
+        yielded: Set[EntityId] = set()
+        frontier: List[Tuple[Entity, ...]] = []
+        for root in roots:
+            if root.id not in visited:
+                visited.add(root.id)
+                frontier.append((root,))
+        depth = 0
+        while frontier:
+            self.load_entities(path[-1] for path in frontier)
+            next_frontier: List[Tuple[Entity, ...]] = []
+            for path in frontier:
+                entity = path[-1]
+                # The entity id may have changed if it was a redirect, so
+                # entities are deduplicated by their canonical ids as well:
+                if entity.state is EntityState.non_existent or \
+                   entity.id in yielded:
+                    continue
+                yielded.add(entity.id)
+                visited.add(entity.id)
+                yield entity, depth, path
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for prop in properties:
+                    for value in entity.getlist(prop):
+                        if isinstance(value, Entity) and \
+                           value.id not in visited:
+                            visited.add(value.id)
+                            next_frontier.append(path + (value,))
+            frontier = next_frontier
+            depth += 1
+
     def guess_entity_type(self, entity_id: EntityId) -> Optional[EntityType]:
         r"""Guess :class:`~.entity.EntityType` from the given
         :class:`~.entity.EntityId`.  It could return :const:`None` when it
@@ -191,38 +579,346 @@ class Client:
                       self.datavalue_decoder)
         return decode(self, datatype, datavalue)
 
-    def request(self, path: str) -> Union[
+    def request(
+        self,
+        path: str,
+        entity_ids: Sequence[EntityId] = (),
+        refresh: bool = False,
+        batched: bool = False
+    ) -> Union[
         bool, int, float, str,
         Mapping[str, Union[bool, int, float, str,
                            Mapping[str, object], Sequence]],
         Sequence[Union[bool, int, float, str, Mapping[str, object], Sequence]],
         None
     ]:
+        r"""Request the API at the given ``path`` and parse its response as
+        JSON, or look up the cache.
+
+        :param path: The path relative to :attr:`base_url`.
+        :type path: :class:`str`
+        :param entity_ids: The ids of entities which trigger the request.
+                           They are passed to :attr:`observers` through
+                           :attr:`RequestEvent.entity_ids
+                           <wikidata.observer.RequestEvent.entity_ids>`.
+        :type entity_ids: :class:`~typing.Sequence`\
+                          [:class:`~.entity.EntityId`]
+        :param refresh: Whether to skip looking up the cache and store
+                        the fresh response to it.  :const:`False` by
+                        default.
+        :type refresh: :class:`bool`
+        :param batched: Whether the request loads ``entity_ids`` in
+                        a batch.  It's passed to :attr:`observers` through
+                        :attr:`RequestEvent.batched
+                        <wikidata.observer.RequestEvent.batched>`.
+                        :const:`False` by default.
+        :type batched: :class:`bool`
+        :return: The parsed response, or :const:`None` if the server says
+                 the requested entity id is invalid.
+
+        .. versionadded:: 0.10.0
+           The ``entity_ids`` and ``refresh`` options.
+
+        """
         logger = logging.getLogger(__name__ + '.Client.request')
         url = urllib.parse.urljoin(self.base_url, path)
-        result = self.cache_policy.get(CacheKey(url))
-        if result is None:
-            logger.debug('%r: no cache; make a request...', url)
-            self.opener.addheaders = [(
-                'User-Agent',
-                self.user_agent
-            )]
-            try:
-                response = self.opener.open(url)
-            except urllib.error.HTTPError as e:
-                logger.debug('HTTP error code: %s', e.code, exc_info=True)
-                if e.code == 400 and b'Invalid ID' in e.read():
-                    return None
-                else:
-                    raise e
+        observers = self.observers
+        event = None
+        if observers:
+            event = RequestEvent(url, CacheKey(url), entity_ids, batched)
+            for observer in observers:
+                observer.on_start(event)
+        try:
+            policy = self.cache_policy
+            result = None if refresh else policy.get(CacheKey(url))
+            if event is not None:
+                event.cache_hit = result is not None
+            if result is None:
+                logger.debug('%r: no cache; make a request...', url)
+                self.opener.addheaders = [(
+                    'User-Agent',
+                    self.user_agent
+                )]
+                try:
+                    response = self.opener.open(url)
+                except urllib.error.HTTPError as e:
+                    logger.debug('HTTP error code: %s', e.code, exc_info=True)
+                    if event is not None:
+                        event.status = e.code
+                    if e.code == 400 and b'Invalid ID' in e.read():
+                        if event is not None:
+                            event.error = e
+                            event.finish()
+                            for observer in observers:
+                                observer.on_error(event)
+                        return None
+                    else:
+                        raise e
+                body = response.read()
+                if event is not None:
+                    event.status = response.getcode()
+                    event.size = len(body)
+                result = CacheValue(self.json_backend.loads(
+                    body,
+                    intern_pairs if self.intern_strings else None
+                ))
+                self.cache_policy.set(CacheKey(url), result)
+            else:
+                logger.debug('%r: cache hit', url)
+                if isinstance(policy, RevalidatingCachePolicy) and \
+                   policy.revalidate(CacheKey(url),
+                                     functools.partial(self._refresh, url)):
+                    logger.debug('%r: stale; revalidate...', url)
+        except Exception as e:
+            if event is not None:
+                event.error = e
+                event.finish()
+                for observer in observers:
+                    observer.on_error(event)
+            raise
+        if event is not None:
+            event.finish()
+            for observer in observers:
+                observer.on_finish(event)
+        return result  # type: ignore
+
+    def request_entities(
+        self,
+        path: str,
+        entity_ids: Sequence[EntityId] = (),
+        batched: bool = False
+    ) -> Generator[Tuple[str, Mapping[str, object]], None, None]:
+        r"""Request the ``wbgetentities`` API at the given ``path`` like
+        :meth:`request()`, but yield each entity as soon as it's read from
+        the response using :class:`~.jsonstream.EntityStream`.  Entities
+        in the cache are yielded as well.
+
+        The response is stored to the :attr:`cache_policy` after it's
+        completely read.  Entities read so far are kept until then unless
+        the policy is :class:`~.cache.NullCachePolicy`.  If the iteration
+        stops early, the response is not cached; close the iterator
+        (e.g., using :func:`contextlib.closing()`) to close the response
+        at once.
+
+        :param path: The path relative to :attr:`base_url`.
+        :type path: :class:`str`
+        :param entity_ids: The ids of entities which trigger the request.
+                           They are passed to :attr:`observers`.
+        :type entity_ids: :class:`~typing.Sequence`\
+                          [:class:`~.entity.EntityId`]
+        :param batched: Whether the request loads ``entity_ids`` in
+                        a batch, as :meth:`request()` takes.
+        :type batched: :class:`bool`
+        :return: The pairs of entity ids and their data.  Nothing is
+                 yielded if the server responds an error, e.g., when any of
+                 the requested entity ids is invalid.
+        :rtype: :class:`~typing.Generator`\ [:class:`~typing.Tuple`\
+                [:class:`str`, :class:`~typing.Mapping`\
+                [:class:`str`, :class:`object`]], :const:`None`,
+                :const:`None`]
+        :raise wikidata.jsonstream.StreamError: When the response is
+                                                malformed.
+
+        .. versionadded:: 0.10.0
+
+        """
+        from .jsonstream import EntityStream
+        logger = logging.getLogger(__name__ + '.Client.request_entities')
+        url = urllib.parse.urljoin(self.base_url, path)
+        observers = self.observers
+        event = None
+        if observers:
+            event = RequestEvent(url, CacheKey(url), entity_ids, batched)
+            for observer in observers:
+                observer.on_start(event)
+        try:
+            cached = self.cache_policy.get(CacheKey(url))
+            if event is not None:
+                event.cache_hit = cached is not None
+            if cached is not None:
+                logger.debug('%r: cache hit', url)
+                policy = self.cache_policy
+                if isinstance(policy, RevalidatingCachePolicy):
+                    policy.revalidate(CacheKey(url),
+                                      functools.partial(self._refresh, url))
+                if isinstance(cached, Mapping):
+                    entities = cached.get('entities')
+                    if isinstance(entities, Mapping):
+                        yield from entities.items()
+            else:
+                logger.debug('%r: no cache; stream a request...', url)
+                self.opener.addheaders = [('User-Agent', self.user_agent)]
+                try:
+                    response = self.opener.open(url)
+                except urllib.error.HTTPError as e:
+                    logger.debug('HTTP error code: %s', e.code, exc_info=True)
+                    if event is not None:
+                        event.status = e.code
+                    if e.code == 400 and b'Invalid ID' in e.read():
+                        if event is not None:
+                            event.error = e
+                            event.finish()
+                            for observer in observers:
+                                observer.on_error(event)
+                        return
+                    raise
+                stream = None
+                try:
+                    if event is not None:
+                        event.status = response.getcode()
+                    stream = EntityStream(
+                        response,
+                        intern_pairs if self.intern_strings else None
+                    )
+                    keep = not isinstance(self.cache_policy, NullCachePolicy)
+                    read: Dict[str, Mapping[str, object]] = {}
+                    for entity_id, data in stream:
+                        if keep:
+                            read[entity_id] = data
+                        yield entity_id, data
+                    # Only a completely read response is cached; if the
+                    # consumer stops early, the rest is never read.
+                    if keep:
+                        result = dict(stream.members)
+                        if 'error' not in result:
+                            result['entities'] = read
+                        self.cache_policy.set(CacheKey(url),
+                                              CacheValue(result))
+                finally:
+                    response.close()
+                    if event is not None and stream is not None:
+                        event.size = stream.bytes_read
+        except Exception as e:
+            if event is not None:
+                event.error = e
+                event.finish()
+                for observer in observers:
+                    observer.on_error(event)
+            raise
+        finally:
+            # Also reached when the consumer stops early (GeneratorExit).
+            if event is not None and event.elapsed is None:
+                event.finish()
+                for observer in observers:
+                    observer.on_finish(event)
+
+    def _refresh(self, url: str) -> None:
+        # Refresh a stale value of RevalidatingCachePolicy.  It runs on
+        # a worker thread of the policy, so observers (which aren't
+        # thread-safe and would see the worker's stack) aren't notified,
+        # the shared opener.addheaders isn't touched, and the parsed value
+        # isn't touched after it's stored.
+        logger = logging.getLogger(__name__ + '.Client._refresh')
+        logger.debug('%r: refresh a stale value...', url)
+        request = urllib.request.Request(
+            url, headers={'User-Agent': self.user_agent}
+        )
+        response = self.opener.open(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        result = CacheValue(self.json_backend.loads(
+            body,
+            intern_pairs if self.intern_strings else None
+        ))
+        self.cache_policy.set(CacheKey(url), result)
+
+    def sparql(self,
+               query: str,
+               format: str = 'json',
+               prefetch_labels: bool = False) -> Iterator[Dict[str, object]]:
+        r"""Run the SPARQL ``query`` on the query service at
+        :attr:`sparql_url`, and stream its results.  Results are read
+        incrementally rather than buffered as a whole.
+
+        Values in results are decoded using
+        :func:`~.sparql.decode_term()`: entity URIs become
+        :class:`~.entity.Entity` objects through :meth:`get()`, and literals
+        are decoded through :meth:`decode_datavalue()`.
+
+        .. code-block:: python
+
+           cats = 'SELECT ?item WHERE { ?item wdt:P31 wd:Q146 }'
+           for row in client.sparql(cats):
+               print(row['item'])
+
+        Note that query results are not cached.
+
+        :param query: The SPARQL query.
+        :type query: :class:`str`
+        :param format: The format of results to request: ``'json'``
+                       (default) or ``'tsv'``.
+        :type format: :class:`str`
+        :param prefetch_labels: If :const:`True` labels of entities in
+                                results are fetched by :meth:`get_labels()`
+                                in the languages of
+                                :attr:`language_fallback`, before the rows
+                                are yielded.  Rows are buffered until
+                                :attr:`entities_per_request` entities
+                                which are neither loaded nor cached are
+                                found.
+        :type prefetch_labels: :class:`bool`
+        :return: The rows, i.e., mappings of variable names to values.
+                 Unbound variables are omitted.
+        :rtype: :class:`~typing.Iterator`\ [:class:`~typing.Dict`\
+                [:class:`str`, :class:`object`]]
+        :raise ValueError: When the ``format`` is unsupported.
+        :raise wikidata.sparql.SparqlError: When results are malformed.
+
+        .. versionadded:: 0.10.0
 
-            buffer_ = io.TextIOWrapper(response,
-                                       encoding='utf-8')
-            result = json.load(buffer_)
-            self.cache_policy.set(CacheKey(url), result)
+        """
+        from .sparql import decode_term, iter_json_bindings, iter_tsv_bindings
+        if format == 'json':
+            accept = 'application/sparql-results+json'
+            parse = iter_json_bindings
+        elif format == 'tsv':
+            accept = 'text/tab-separated-values'
+            parse = iter_tsv_bindings
         else:
-            logger.debug('%r: cache hit', url)
-        return result  # type: ignore
+            raise ValueError('unsupported format: ' + repr(format))
+        logger = logging.getLogger(__name__ + '.Client.sparql')
+        logger.debug('%r: query:\n%s', self.sparql_url, query)
+        request = urllib.request.Request(
+            self.sparql_url,
+            data=urllib.parse.urlencode({'query': query}).encode('ascii'),
+            headers={'Accept': accept, 'User-Agent': self.user_agent},
+        )
+        response = self.opener.open(request)
+        try:
+            rows = (
+                {var: decode_term(self, term) for var, term in binding.items()}
+                for binding in parse(response)
+            )
+            if not prefetch_labels:
+                yield from rows
+                return
+            languages = self.language_fallback.locales
+            term_cache = self.term_cache
+            batch: List[Dict[str, object]] = []
+            pending: Dict[EntityId, None] = {}
+            for row in rows:
+                batch.append(row)
+                for value in row.values():
+                    # Entities already loaded or whose labels are already
+                    # cached don't need to be fetched.
+                    if isinstance(value, Entity) and value.data is None and \
+                       value.state is not EntityState.non_existent and \
+                       value.id not in pending and \
+                       term_cache.missing_languages(value.id, 'labels',
+                                                    languages):
+                        pending[value.id] = None
+                if len(pending) >= self.entities_per_request:
+                    self.get_labels(pending, languages)
+                    yield from batch
+                    batch = []
+                    pending = {}
+            if pending:
+                self.get_labels(pending, languages)
+            yield from batch
+        finally:
+            response.close()
 
     def __reduce__(self) -> Tuple[Callable[..., 'Client'], Tuple[object, ...]]:
         return type(self), (
@@ -232,6 +928,15 @@ class Client:
             self.entity_type_guess,
             self.cache_policy,
             self.repr_string,
+            self.user_agent,
+            self.sparql_url,
+            self.identity_map,
+            self.language_fallback,
+            self.intern_strings,
+            self.observers,
+            self.term_cache,
+            self.json_backend,
+            self.stream_responses,
         )
 
     def __repr__(self) -> str:
@@ -1,21 +1,40 @@
 import collections.abc
+import concurrent.futures
+import os
+import urllib.error
 import urllib.parse
-from typing import Mapping, Optional, Tuple, cast
+import urllib.request
+from typing import (Any, ClassVar, Dict, IO, Iterable, Iterator, List,
+                    Mapping, Optional, Sequence, Set, Tuple, Union, cast)
 
+from .cache import CacheKey, CacheValue
 from .client import Client
 
-__all__ = 'File', 'FileError'
+__all__ = 'File', 'FileError', 'Path'
+
+QUERY_PATH = './w/api.php?action=query&prop=imageinfo|info&inprop=url&iiprop=url|size|mime&format=json&titles={}'  # noqa: E501
+
+#: The type of file system paths to download files to.
+Path = Union[str, 'os.PathLike[str]']
 
 
 class File:
     """Represent a file on `Wikimedia Commons`_."""
 
-    __slots__ = 'client', 'title', 'data'
+    __slots__ = 'client', 'title', 'data', 'thumbnails'
+
+    #: (:class:`int`) The maximum number of titles :meth:`load_many()`
+    #: requests at once.  The API accepts up to 50.
+    #:
+    #: .. versionadded:: 0.10.0
+    titles_per_request: ClassVar[int] = 50
 
     def __init__(self, client: Client, title: str) -> None:
         self.client = client
         self.title = title
         self.data = None  # type: Optional[Mapping[str, object]]
+        # Thumbnail urls by width, resolved so far.
+        self.thumbnails: Dict[int, Optional[str]] = {}
 
     @property
     def page_url(self) -> str:
@@ -77,22 +96,401 @@ class File:
         assert self.data is not None
         return self.data
 
+    def thumbnail_url(self, width: int) -> Optional[str]:
+        r"""Get the url of the thumbnail of the image scaled to the given
+        ``width`` by the server.  It makes a request unless the url of
+        the same ``width`` has been resolved, e.g., by
+        :meth:`load_thumbnail_urls()`.
+
+        :param width: The width of the thumbnail in pixels.
+        :type width: :class:`int`
+        :return: The thumbnail url.  It may be :const:`None` if it's not
+                 an image.
+        :rtype: :class:`~typing.Optional`\ [:class:`str`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        try:
+            return self.thumbnails[width]
+        except KeyError:
+            pass
+        url = QUERY_PATH.format(urllib.parse.quote(self.title))
+        query = query_result(
+            self.client.request('{}&iiurlwidth={:d}'.format(url, width))
+        )
+        page = next(iter(query['pages'].values()))
+        thumbnail = self.thumbnails[width] = thumbnail_url_of(page)
+        return thumbnail
+
+    def open(self, width: Optional[int] = None, offset: int = 0) -> IO[bytes]:
+        r"""Open the image (or its thumbnail if ``width`` is given) as
+        a binary stream through :attr:`Client.opener
+        <wikidata.client.Client.opener>`, so that it can be read in chunks
+        without buffering the whole image in memory.
+
+        :param width: The width of the thumbnail to open in pixels.
+                      The original image is opened if it's omitted.
+        :type width: :class:`~typing.Optional`\ [:class:`int`]
+        :param offset: The byte offset to start reading from.  It's
+                       requested using HTTP ``Range``, so the response
+                       status is ``206 Partial Content`` if the server
+                       honors it.
+        :type offset: :class:`int`
+        :return: The response stream.  It should be closed after use.
+        :rtype: :class:`~typing.IO`\ [:class:`bytes`]
+        :raise FileError: When it's not an image.
+
+        .. versionadded:: 0.10.0
+
+        """
+        return open_url(self.client, resolve_url(self, width), offset)
+
+    def download(self,
+                 path: Path,
+                 chunk_size: int = 64 * 1024,
+                 width: Optional[int] = None,
+                 resume: bool = True) -> int:
+        r"""Download the image (or its thumbnail if ``width`` is given) to
+        the given ``path``, ``chunk_size`` bytes at a time.
+
+        If ``resume`` is :const:`True` and the ``path`` already exists
+        (e.g., an earlier download was interrupted), only the rest of it is
+        requested using HTTP ``Range``.  If the server doesn't honor it,
+        or the existing file turns out to be larger than the image, the whole
+        file is downloaded again.
+
+        :param path: The path to download to.
+        :type path: :class:`str`, :class:`os.PathLike`
+        :param chunk_size: The number of bytes to read at a time.
+                           64 KiB by default.
+        :type chunk_size: :class:`int`
+        :param width: The width of the thumbnail to download in pixels.
+                      The original image is downloaded if it's omitted.
+        :type width: :class:`~typing.Optional`\ [:class:`int`]
+        :param resume: Whether to resume the existing partial file.
+                       :const:`True` by default.
+        :type resume: :class:`bool`
+        :return: The size of the downloaded file in bytes.
+        :rtype: :class:`int`
+        :raise FileError: When it's not an image.
+
+        .. versionadded:: 0.10.0
+
+        """
+        url = resolve_url(self, width)
+        size = self.image_size if width is None else None
+        return download_url(self.client, url, path, chunk_size, size, resume)
+
+    @classmethod
+    def download_many(cls,
+                      downloads: Iterable[Tuple['File', Path]],
+                      max_workers: int = 4,
+                      chunk_size: int = 64 * 1024,
+                      width: Optional[int] = None,
+                      resume: bool = True) -> Iterator[Tuple['File', int]]:
+        r"""Download many files concurrently, in at most ``max_workers``
+        threads.  Downloads are taken from the ``downloads`` lazily, so that
+        no more than ``max_workers`` files are in progress at a time
+        regardless of the number of files.  Metadata of files (and
+        thumbnail urls if ``width`` is given) are loaded in batches using
+        :meth:`load_many()` (and :meth:`load_thumbnail_urls()`) beforehand,
+        so that the threads only download the resolved urls.
+
+        .. code-block:: python
+
+           for file, size in File.download_many(
+               (file, os.path.join('images', file.title)) for file in files
+           ):
+               print(file.title, size)
+
+        :param downloads: Pairs of a file and the path to download to.
+        :type downloads: :class:`~typing.Iterable`\
+                         [:class:`~typing.Tuple`\ [:class:`File`,
+                         :const:`Path`]]
+        :param max_workers: The maximum number of concurrent downloads.
+                            4 by default.
+        :type max_workers: :class:`int`
+        :param chunk_size: Passed to :meth:`download()`.
+        :type chunk_size: :class:`int`
+        :param width: Passed to :meth:`download()`.
+        :type width: :class:`~typing.Optional`\ [:class:`int`]
+        :param resume: Passed to :meth:`download()`.
+        :type resume: :class:`bool`
+        :return: Pairs of a downloaded file and its size in bytes, in order
+                 of completion.
+        :rtype: :class:`~typing.Iterator`\
+                [:class:`~typing.Tuple`\ [:class:`File`, :class:`int`]]
+        :raise FileError: When one of files is not an image.
+
+        .. versionadded:: 0.10.0
+
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be greater than 0, not ' +
+                             repr(max_workers))
+        pending: Set['concurrent.futures.Future[Tuple[File, int]]'] = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for batch in batches(downloads, cls.titles_per_request):
+                files = [file for file, _ in batch]
+                cls.load_many(files)
+                if width is not None:
+                    cls.load_thumbnail_urls(files, width)
+                for file, path in batch:
+                    # Urls are resolved in this thread, since requests
+                    # through the client (which notify its observers and
+                    # touch its cache policy) aren't thread-safe.
+                    url = resolve_url(file, width)
+                    size = file.image_size if width is None else None
+                    while len(pending) >= max_workers:
+                        done, pending = concurrent.futures.wait(
+                            pending,
+                            return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            yield future.result()
+                    pending.add(executor.submit(
+                        download, file, url, path, chunk_size, size, resume
+                    ))
+            for future in concurrent.futures.as_completed(pending):
+                yield future.result()
+
     def load(self) -> None:
-        url = './w/api.php?action=query&prop=imageinfo|info&inprop=url&iiprop=url|size|mime&format=json&titles={}'  # noqa: E501
-        url = url.format(urllib.parse.quote(self.title))
-        result = cast(Mapping[str, object], self.client.request(url))
-        if result.get('error'):
-            raise FileError('the server respond an error: ' +
-                            repr(result['error']))
-        query = result['query']
-        assert isinstance(query, collections.abc.Mapping)
+        url = QUERY_PATH.format(urllib.parse.quote(self.title))
+        query = query_result(self.client.request(url))
         self.data = next(iter(query['pages'].values()))
 
+    @classmethod
+    def load_many(cls, files: Iterable['File']) -> None:
+        r"""Load the given ``files`` at once.  It makes only a request per
+        :attr:`titles_per_request` titles instead of a request per file,
+        and files which are already loaded are skipped.
+
+        Normalized and redirected titles are resolved, so that the files are
+        filled with the pages they finally refer to.  The result of each
+        title is also stored to the cache of the client as if it were
+        loaded by :meth:`load()`, so that other :class:`File` objects of
+        the same title can be loaded without requests.
+
+        :param files: The files to load.
+        :type files: :class:`~typing.Iterable`\ [:class:`File`]
+        :raise FileError: When the server responds an error.
+
+        .. versionadded:: 0.10.0
+
+        """
+        groups = group_titles(file for file in files if file.data is None)
+        for client, titles in groups:
+            for title, page_id, page in query_pages(client, list(titles), '',
+                                                    cls.titles_per_request):
+                for file in titles[title]:
+                    file.data = page
+
+    @classmethod
+    def load_thumbnail_urls(cls, files: Iterable['File'], width: int) -> None:
+        r"""Resolve the thumbnail urls of the given ``files`` scaled to
+        the given ``width`` at once, so that :meth:`thumbnail_url()` of them
+        makes no request.  Like :meth:`load_many()`, it makes only a request
+        per :attr:`titles_per_request` titles, and files which are not
+        loaded yet are loaded as well.
+
+        :param files: The files to resolve thumbnail urls of.
+        :type files: :class:`~typing.Iterable`\ [:class:`File`]
+        :param width: The width of thumbnails in pixels.
+        :type width: :class:`int`
+        :raise FileError: When the server responds an error.
+
+        .. versionadded:: 0.10.0
+
+        """
+        groups = group_titles(file for file in files
+                              if width not in file.thumbnails)
+        params = '&iiurlwidth={:d}'.format(width)
+        for client, titles in groups:
+            for title, page_id, page in query_pages(client, list(titles),
+                                                    params,
+                                                    cls.titles_per_request):
+                thumbnail = thumbnail_url_of(page)
+                for file in titles[title]:
+                    file.thumbnails[width] = thumbnail
+                    if file.data is None:
+                        file.data = page
+
     def __repr__(self) -> str:
         return '<{0.__module__}.{0.__qualname__} {1!r}>'.format(
             type(self), self.title
         )
 
 
+def resolve_url(file: File, width: Optional[int]) -> str:
+    url = file.image_url if width is None else file.thumbnail_url(width)
+    if url is None:
+        raise FileError('{0!r} is not an image'.format(file.title))
+    return url
+
+
+def thumbnail_url_of(page: Mapping[str, Any]) -> Optional[str]:
+    images = page.get('imageinfo', [])
+    if images and isinstance(images, collections.abc.Sequence):
+        return images[0].get('thumburl')
+    return None
+
+
+def open_url(client: Client, url: str, offset: int = 0) -> IO[bytes]:
+    # It doesn't go through Client.request(), so that it can be called
+    # from worker threads of File.download_many().
+    request = urllib.request.Request(
+        url,
+        headers={'User-Agent': client.user_agent},
+    )
+    if offset:
+        request.add_header('Range', 'bytes={0:d}-'.format(offset))
+    return cast(IO[bytes], client.opener.open(request))
+
+
+def download_url(client: Client,
+                 url: str,
+                 path: Path,
+                 chunk_size: int,
+                 size: Optional[int],
+                 resume: bool) -> int:
+    # The size is of the original image, which is None for thumbnails.
+    offset = 0
+    if resume:
+        try:
+            offset = os.path.getsize(path)
+        except OSError:
+            offset = 0
+        if offset and size is not None:
+            if offset == size:
+                return offset
+            elif offset > size:
+                offset = 0  # Stale file larger than the image
+    try:
+        response = open_url(client, url, offset)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # Range Not Satisfiable: complete, unless the file on the server
+        # is of other size, e.g., a stale local file is larger.
+        total = content_range_total(e.headers.get('Content-Range'))
+        e.close()
+        if total is None or total == offset:
+            return offset
+        offset = 0
+        response = open_url(client, url)
+    with response:
+        if getattr(response, 'status', None) != 206:
+            offset = 0  # The server sent the whole file.
+        with open(path, 'ab' if offset else 'wb') as f:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+                offset += len(chunk)
+    return offset
+
+
+def download(file: File,
+             url: str,
+             path: Path,
+             chunk_size: int,
+             size: Optional[int],
+             resume: bool) -> Tuple[File, int]:
+    return file, download_url(file.client, url, path, chunk_size, size,
+                              resume)
+
+
+def group_titles(
+    files: Iterable[File]
+) -> Iterable[Tuple[Client, Dict[str, List[File]]]]:
+    # Client objects aren't necessarily hashable, so group by their ids.
+    groups: Dict[int, Tuple[Client, Dict[str, List[File]]]] = {}
+    for file in files:
+        _, titles = groups.setdefault(id(file.client), (file.client, {}))
+        titles.setdefault(file.title, []).append(file)
+    return groups.values()
+
+
+def query_pages(
+    client: Client,
+    titles: Sequence[str],
+    params: str,
+    size: int
+) -> Iterator[Tuple[str, str, Mapping[str, Any]]]:
+    # Query the pages of the given titles in chunks of the given size, and
+    # yield triples of each title, and the id and the page it refers to.
+    # Normalized and redirected titles are resolved.  The result of each
+    # title is also stored to the cache of the client as if it were queried
+    # alone, e.g., by File.load() if there are no params.
+    quote = urllib.parse.quote
+    for offset in range(0, len(titles), size):
+        chunk = titles[offset:offset + size]
+        path = QUERY_PATH.format(quote('|'.join(chunk), safe='|'))
+        query = query_result(client.request(path + params + '&redirects=1'))
+        aliases: Dict[str, str] = {}
+        for key in 'normalized', 'redirects':
+            for pair in query.get(key) or ():
+                aliases[pair['from']] = pair['to']
+        pages = query['pages']
+        assert isinstance(pages, collections.abc.Mapping)
+        pages_by_title = {page['title']: (page_id, page)
+                          for page_id, page in pages.items()}
+        for title in chunk:
+            resolved = title
+            visited = {title}
+            while resolved in aliases:
+                resolved = aliases[resolved]
+                if resolved in visited:
+                    break
+                visited.add(resolved)
+            try:
+                page_id, page = pages_by_title[resolved]
+            except KeyError:
+                continue
+            url = urllib.parse.urljoin(
+                client.base_url, QUERY_PATH.format(quote(title)) + params
+            )
+            client.cache_policy.set(
+                CacheKey(url),
+                CacheValue({'query': {'pages': {page_id: page}}})
+            )
+            yield title, page_id, page
+
+
+def batches(pairs: Iterable[Tuple[File, Path]],
+            size: int) -> Iterator[List[Tuple[File, Path]]]:
+    batch: List[Tuple[File, Path]] = []
+    for pair in pairs:
+        batch.append(pair)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def content_range_total(value: Optional[str]) -> Optional[int]:
+    # Content-Range: bytes */1234 (or bytes 0-99/1234)
+    if not value:
+        return None
+    _, _, total = value.rpartition('/')
+    try:
+        return int(total)
+    except ValueError:  # bytes 0-99/*
+        return None
+
+
+def query_result(result: object) -> Mapping[str, Any]:
+    result = cast(Mapping[str, object], result)
+    if result.get('error'):
+        raise FileError('the server respond an error: ' +
+                        repr(result['error']))
+    query = result['query']
+    assert isinstance(query, collections.abc.Mapping)
+    return query
+
+
 class FileError(ValueError, RuntimeError):
     """Exception raised when something goes wrong with :class:`File`."""
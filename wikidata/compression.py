@@ -0,0 +1,315 @@
+r"""Compression of cached values.
+
+:class:`CompressedCachePolicy` wraps any :class:`~.cache.CachePolicy` to
+store values compressed by :mod:`zlib`, e.g., to keep more entities in
+the same memory of memcached, or of the process:
+
+.. code-block:: python
+
+   codec = JsonCodec()
+   dictionary = train_dictionary(codec.encode(v) for v in sample_values)
+   policy = CompressedCachePolicy(ProxyCachePolicy(memcache_client, 3600),
+                                  dictionary, codec)
+
+Since entity documents share the same keys, datatypes, property ids, and
+urls, a preset dictionary trained from sample entities makes especially
+small documents compress better.  Every compressed value is prefixed by
+the id of the dictionary it's compressed with, so that values compressed
+with a dictionary other than the current one (or the previous ones given
+through ``old_dictionaries``) are treated as misses instead of being
+decompressed wrongly.
+
+.. versionadded:: 0.10.0
+
+"""
+import copy
+import logging
+import struct
+import time
+import zlib
+from typing import Dict, Iterable, Optional
+
+from .cache import CacheKey, CachePolicy, CacheStats, CacheValue
+from .cachecodec import CacheCodec, JsonCodec
+
+__all__ = ('DICTIONARY_SIZE', 'CompressedCachePolicy', 'CompressionStats',
+           'dictionary_id', 'train_dictionary')
+
+
+#: (:class:`int`) The default size of dictionaries in bytes, which is
+#: the size of the window of :mod:`zlib`; preceding bytes of a dictionary
+#: can't be referred.
+DICTIONARY_SIZE = 32 * 1024
+
+#: (:class:`int`) The minimum number of bytes to take from each sample
+#: to train a dictionary.
+MIN_EXCERPT_SIZE = 4096
+
+HEADER = struct.Struct('>3sI')
+MAGIC = b'WDZ'
+
+
+def train_dictionary(samples: Iterable[bytes],
+                     size: int = DICTIONARY_SIZE) -> bytes:
+    r"""Make a preset dictionary for :mod:`zlib` from the given ``samples``
+    of serialized values.
+
+    The dictionary consists of the heads of samples, which are where
+    the most common members of entities (e.g., ``type``, ``id``, ``labels``)
+    are.  Samples are taken in order, and the earlier ones are dropped if
+    they don't fit in the ``size``.
+
+    :param samples: The serialized values, e.g., encoded by the codec to be
+                    used with :class:`CompressedCachePolicy`.
+    :type samples: :class:`~typing.Iterable`\ [:class:`bytes`]
+    :param size: The maximum size of the dictionary in bytes.
+                 :const:`DICTIONARY_SIZE` by default.
+    :type size: :class:`int`
+    :return: The dictionary.
+    :rtype: :class:`bytes`
+
+    """
+    samples = list(samples)
+    if not samples:
+        return b''
+    excerpt_size = max(size // len(samples), MIN_EXCERPT_SIZE)
+    return b''.join(s[:excerpt_size] for s in samples)[-size:]
+
+
+def dictionary_id(dictionary: Optional[bytes]) -> int:
+    r"""Get the id of the given ``dictionary``, which is written to
+    the header of compressed values.  It's the Adler-32 checksum of
+    the dictionary as zlib does, or 0 if there's no dictionary.
+
+    :param dictionary: The dictionary.
+    :type dictionary: :class:`~typing.Optional`\ [:class:`bytes`]
+    :return: The id.
+    :rtype: :class:`int`
+
+    """
+    return zlib.adler32(dictionary) if dictionary else 0
+
+
+class CompressionStats:
+    r"""Statistics of compression made by :class:`CompressedCachePolicy`.
+
+    .. attribute:: compressions
+
+       (:class:`int`) The number of values compressed.
+
+    .. attribute:: decompressions
+
+       (:class:`int`) The number of values decompressed.
+
+    .. attribute:: raw_size
+
+       (:class:`int`) The total size of compressed values in bytes,
+       before compression.
+
+    .. attribute:: compressed_size
+
+       (:class:`int`) The total size of compressed values in bytes,
+       after compression.
+
+    .. attribute:: compress_time
+
+       (:class:`float`) The total seconds taken to compress values,
+       including serialization.
+
+    .. attribute:: decompress_time
+
+       (:class:`float`) The total seconds taken to decompress values,
+       including deserialization.
+
+    .. attribute:: rejections
+
+       (:class:`int`) The number of stored values which are treated as
+       misses since they are compressed with an unknown dictionary or
+       aren't compressed by :class:`CompressedCachePolicy` at all.
+
+    """
+
+    __slots__ = ('compressions', 'decompressions', 'raw_size',
+                 'compressed_size', 'compress_time', 'decompress_time',
+                 'rejections')
+
+    def __init__(self) -> None:
+        self.compressions = 0
+        self.decompressions = 0
+        self.raw_size = 0
+        self.compressed_size = 0
+        self.compress_time = 0.0
+        self.decompress_time = 0.0
+        self.rejections = 0
+
+    @property
+    def ratio(self) -> Optional[float]:
+        r"""(:class:`~typing.Optional`\ [:class:`float`]) The compression
+        ratio, i.e., how many times values became smaller, or :const:`None`
+        if nothing is compressed.
+
+        """
+        if not self.compressed_size:
+            return None
+        return self.raw_size / self.compressed_size
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a)
+                   for a in self.__slots__)
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}({1})'.format(
+            type(self),
+            ', '.join('{}={!r}'.format(a, getattr(self, a))
+                      for a in self.__slots__)
+        )
+
+
+class CompressedCachePolicy(CachePolicy):
+    r"""Wrapper of a cache policy which stores values compressed.  Values
+    are serialized by the ``codec``, compressed with the ``dictionary``,
+    and then stored to the wrapped ``policy`` as :class:`bytes`.
+
+    :param policy: The cache policy to store compressed values.
+    :type policy: :class:`~.cache.CachePolicy`
+    :param dictionary: The preset dictionary made by
+                       :func:`train_dictionary()`.  No dictionary by
+                       default.
+    :type dictionary: :class:`~typing.Optional`\ [:class:`bytes`]
+    :param codec: The codec to serialize values.
+                  :class:`~.cachecodec.JsonCodec` by default, which makes
+                  the most of dictionaries trained from JSON.
+    :type codec: :class:`~.cachecodec.CacheCodec`
+    :param level: The compression level from 0 to 9.  6 by default.
+    :type level: :class:`int`
+    :param old_dictionaries: Dictionaries used before, to keep
+                             decompressing values compressed with them
+                             while a new ``dictionary`` is rolled out.
+    :type old_dictionaries: :class:`~typing.Iterable`\ [:class:`bytes`]
+
+    """
+
+    def __init__(self,
+                 policy: CachePolicy,
+                 dictionary: Optional[bytes] = None,
+                 codec: Optional[CacheCodec] = None,
+                 level: int = 6,
+                 old_dictionaries: Iterable[bytes] = ()) -> None:
+        self.policy = policy
+        self.dictionary = dictionary or None
+        self.dictionary_id = dictionary_id(self.dictionary)
+        if codec is None:
+            codec = JsonCodec()
+        self.codec = codec
+        self.level = level
+        self.dictionaries: Dict[int, Optional[bytes]] = {
+            dictionary_id(d): d or None for d in old_dictionaries
+        }
+        self.dictionaries[self.dictionary_id] = self.dictionary
+        self.counters = CompressionStats()
+
+    def compress(self, value: CacheValue) -> bytes:
+        """Serialize and compress the given ``value``.
+
+        :param value: The value to compress.
+        :type value: :const:`~.cache.CacheValue`
+        :return: The compressed value with its header.
+        :rtype: :class:`bytes`
+
+        """
+        started = time.perf_counter()
+        data = self.codec.encode(value)
+        compressor = (
+            zlib.compressobj(self.level, zdict=self.dictionary)
+            if self.dictionary else zlib.compressobj(self.level)
+        )
+        compressed = b''.join([
+            HEADER.pack(MAGIC, self.dictionary_id),
+            compressor.compress(data),
+            compressor.flush(),
+        ])
+        counters = self.counters
+        counters.compress_time += time.perf_counter() - started
+        counters.compressions += 1
+        counters.raw_size += len(data)
+        counters.compressed_size += len(compressed)
+        return compressed
+
+    def decompress(self, data: bytes) -> Optional[CacheValue]:
+        r"""Decompress and deserialize the given ``data``.
+
+        :param data: The compressed value with its header.
+        :type data: :class:`bytes`
+        :return: The value, or :const:`None` if the ``data`` is not
+                 compressed by :class:`CompressedCachePolicy`, compressed
+                 with an unknown dictionary, corrupted, or can't be
+                 decoded by the codec.
+        :rtype: :class:`~typing.Optional`\ [:const:`~.cache.CacheValue`]
+
+        """
+        started = time.perf_counter()
+        if len(data) < HEADER.size:
+            return None
+        magic, id_ = HEADER.unpack_from(data)
+        if magic != MAGIC or id_ not in self.dictionaries:
+            return None
+        dictionary = self.dictionaries[id_]
+        decompressor = (
+            zlib.decompressobj(zdict=dictionary)
+            if dictionary else zlib.decompressobj()
+        )
+        try:
+            raw = decompressor.decompress(data[HEADER.size:])
+            raw += decompressor.flush()
+            if not decompressor.eof:
+                raise zlib.error('truncated data')
+            value = self.codec.decode(raw)
+        except Exception:
+            # Corrupted data, or data serialized in an other way than
+            # the codec, e.g., UnpicklingError or ValueError.
+            logger = logging.getLogger(
+                __name__ + '.CompressedCachePolicy.decompress'
+            )
+            logger.debug('failed to decompress a value', exc_info=True)
+            return None
+        self.counters.decompress_time += time.perf_counter() - started
+        self.counters.decompressions += 1
+        return value
+
+    def get(self, key: CacheKey) -> Optional[CacheValue]:
+        data = self.policy.get(key)
+        if data is None:
+            return None
+        value = (self.decompress(data)
+                 if isinstance(data, bytes) else None)
+        if value is None:
+            self.counters.rejections += 1
+        return value
+
+    def set(self, key: CacheKey, value: Optional[CacheValue]) -> None:
+        self.policy.set(
+            key,
+            None if value is None else CacheValue(self.compress(value))
+        )
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the wrapped policy.  Note that its sizes
+        are of compressed values.  See also :meth:`compression_stats()`.
+
+        :return: The statistics.
+        :rtype: :class:`~.cache.CacheStats`
+
+        """
+        return self.policy.stats()
+
+    def compression_stats(self) -> CompressionStats:
+        """Get the statistics of compression.  The returned object is
+        a snapshot; it doesn't change as the cache is used.
+
+        :return: The statistics.
+        :rtype: :class:`CompressionStats`
+
+        """
+        return copy.copy(self.counters)
@@ -0,0 +1,209 @@
+"""Diagnostics of inefficient access patterns.
+
+The most common performance problem of lazy loading is the *N+1 fetch*:
+a loop over values touching each value entity, e.g.:
+
+.. code-block:: python
+
+   for prop, values in entity.lists():
+       for value in values:
+           print(prop.label, value.label)  # a request per entity!
+
+:class:`NPlusOneDetector` is an observer (see also :mod:`wikidata.observer`)
+which notices bursts of single-entity loads made from the same line of code,
+and reports them along with the stack and a suggestion to batch them using
+:meth:`Client.load_entities() <wikidata.client.Client.load_entities>`:
+
+.. code-block:: python
+
+   client = Client(observers=[NPlusOneDetector()])
+
+.. versionadded:: 0.10.0
+
+"""
+import collections
+import logging
+import os.path
+import sys
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .entity import EntityId
+from .observer import RequestEvent, RequestObserver
+
+__all__ = 'CallSite', 'NPlusOneDetector', 'NPlusOneReport'
+
+
+#: The call site of a request: a tuple of filename, line number, and
+#: function name.
+CallSite = Tuple[str, int, str]
+
+PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# Frames of the standard library (and installed packages) are skipped as
+# well as this package's, e.g., Mapping.get() which calls Entity.__getitem__().
+EXCLUDED_PATHS = tuple(
+    os.path.join(os.path.abspath(prefix), '')
+    for prefix in dict.fromkeys([sys.prefix, sys.exec_prefix,
+                                 sys.base_prefix, sys.base_exec_prefix])
+) + (PACKAGE_PATH, '<frozen ')
+
+
+def is_user_frame(frame: traceback.FrameSummary) -> bool:
+    return not frame.filename.startswith(EXCLUDED_PATHS)
+
+
+class NPlusOneReport:
+    r"""A burst of single-entity loads made from the same call site.
+    The report keeps being updated while the burst goes on.
+
+    .. attribute:: call_site
+
+       (:const:`CallSite`) The innermost line of code outside this package
+       and the standard library which made the loads.
+
+    .. attribute:: stack
+
+       (:class:`traceback.StackSummary`) The stack of the first load in the
+       burst, excluding frames of this package and the standard library.
+
+    .. attribute:: count
+
+       (:class:`int`) The number of loads in the burst so far.
+
+    .. attribute:: entity_ids
+
+       (:class:`~typing.List`\ [:class:`~.entity.EntityId`]) The ids of
+       the loaded entities, up to :attr:`NPlusOneDetector.max_entity_ids`.
+
+    .. attribute:: elapsed
+
+       (:class:`float`) The total seconds taken by the loads.
+
+    """
+
+    def __init__(self,
+                 call_site: CallSite,
+                 stack: traceback.StackSummary) -> None:
+        self.call_site = call_site
+        self.stack = stack
+        self.count = 0
+        self.entity_ids: List[EntityId] = []
+        self.elapsed = 0.0
+
+    @property
+    def message(self) -> str:
+        """(:class:`str`) The human-readable report."""
+        filename, lineno, name = self.call_site
+        return (
+            '{0} entities were loaded one by one from {1}:{2} (in {3}), '
+            'taking {4:.3f} seconds: {5}{6}\n'
+            'Consider loading them at once using Client.load_entities().\n'
+            'Stack (most recent call last):\n{7}'
+        ).format(
+            self.count, filename, lineno, name, self.elapsed,
+            ', '.join(self.entity_ids),
+            ', ...' if self.count > len(self.entity_ids) else '',
+            ''.join(self.stack.format()).rstrip()
+        )
+
+    def __repr__(self) -> str:
+        return '<{0.__module__}.{0.__qualname__} {1}:{2} x{3}>'.format(
+            type(self), self.call_site[0], self.call_site[1], self.count
+        )
+
+
+class NPlusOneDetector(RequestObserver):
+    r"""Observer which detects bursts of single-entity loads (i.e.,
+    :meth:`Entity.load() <wikidata.entity.Entity.load>` which missed
+    the cache) made from the same call site.
+
+    Capturing the stack of every load has some overhead, so it's meant for
+    profiling rather than being always turned on.
+
+    :param threshold: The number of sequential loads from the same call
+                      site to report.  5 by default.
+    :type threshold: :class:`int`
+    :param window: The maximum seconds between two loads in a burst.
+                   1 second by default.
+    :type window: :class:`float`
+    :param callback: The function called with a :class:`NPlusOneReport`
+                     when a burst reaches the ``threshold``.  By default
+                     the report is logged as a warning.  It's not pickled
+                     with the detector.
+    :type callback: :class:`~typing.Optional`\ [:class:`~typing.Callable`\
+                    [[:class:`NPlusOneReport`], :const:`None`]]
+    :param stack_limit: The maximum number of frames in reported stacks.
+                        8 by default.
+    :type stack_limit: :class:`int`
+
+    """
+
+    #: (:class:`int`) The maximum number of entity ids kept in a report.
+    max_entity_ids = 10
+
+    def __init__(self,
+                 threshold: int = 5,
+                 window: float = 1.0,
+                 callback: Optional[Callable[[NPlusOneReport], None]] = None,
+                 stack_limit: int = 8) -> None:
+        self.threshold = threshold
+        self.window = window
+        self.callback = callback
+        self.stack_limit = stack_limit
+        #: (:class:`~typing.List`\ [:class:`NPlusOneReport`]) The reports
+        #: made so far.
+        self.reports: List[NPlusOneReport] = []
+        # Bursts going on by call site, with their last loads, in order of
+        # the last loads.
+        self.bursts: Dict[CallSite, Tuple[float, NPlusOneReport]] = \
+            collections.OrderedDict()
+
+    def on_finish(self, event: RequestEvent) -> None:
+        if event.cache_hit or event.batched or len(event.entity_ids) != 1:
+            return
+        stack = traceback.StackSummary.from_list([
+            frame for frame in traceback.extract_stack()
+            if is_user_frame(frame)
+        ][-self.stack_limit:])
+        if not stack:
+            return
+        frame = stack[-1]
+        call_site: CallSite = (frame.filename, frame.lineno or 0, frame.name)
+        now = time.perf_counter()
+        bursts = self.bursts
+        # Bursts of which the last loads are older than the window are over:
+        while bursts:
+            site, (last_load, _) = next(iter(bursts.items()))
+            if now - last_load <= self.window:
+                break
+            del bursts[site]
+        try:
+            _, burst = bursts.pop(call_site)
+        except KeyError:
+            burst = NPlusOneReport(call_site, stack)
+        bursts[call_site] = now, burst
+        burst.count += 1
+        burst.elapsed += event.elapsed or 0.0
+        if len(burst.entity_ids) < self.max_entity_ids:
+            burst.entity_ids.append(event.entity_ids[0])
+        if burst.count == self.threshold:
+            self.reports.append(burst)
+            self.report(burst)
+
+    def report(self, report: NPlusOneReport) -> None:
+        if self.callback is None:
+            logger = logging.getLogger(__name__ + '.NPlusOneDetector')
+            logger.warning('%s', report.message)
+        else:
+            self.callback(report)
+
+    def __getstate__(self):
+        # Reports and callbacks might not be picklable, so they are dropped;
+        # unpickled detectors log reports instead.
+        state = dict(self.__dict__)
+        state['bursts'] = collections.OrderedDict()
+        state['reports'] = []
+        state['callback'] = None
+        return state
@@ -4,6 +4,7 @@ import logging
 import pprint
 from typing import (
     Iterator,
+    List,
     Mapping,
     NewType,
     Optional,
@@ -26,12 +27,47 @@ __all__ = 'Entity', 'EntityId', 'EntityState', 'EntityType'
 #: The identifier of each :class:`Entity`.  Alias of :class:`str`.
 EntityId = NewType('EntityId', str)
 
+ENTITY_URL_PREFIX = 'http://www.wikidata.org/entity/'
+
+
+def iter_snak_entity_ids(snak: Mapping[str, object]) -> Iterator[EntityId]:
+    # Yield the property of the snak, and the entities its value refers to:
+    # items, properties, units of quantities, and globes of coordinates.
+    yield EntityId(str(snak['property']))
+    if snak.get('snaktype') != 'value':
+        return
+    datavalue = snak.get('datavalue')
+    if not isinstance(datavalue, collections.abc.Mapping):
+        return
+    value = datavalue.get('value')
+    if not isinstance(value, collections.abc.Mapping):
+        return
+    type_ = datavalue.get('type')
+    if type_ == 'wikibase-entityid':
+        if 'id' in value:
+            yield EntityId(str(value['id']))
+        return
+    elif type_ == 'quantity':
+        url = value.get('unit')
+    elif type_ == 'globecoordinate':
+        url = value.get('globe')
+    else:
+        return
+    if isinstance(url, str) and url.startswith(ENTITY_URL_PREFIX):
+        yield EntityId(url[len(ENTITY_URL_PREFIX):])
+
 
 class multilingual_attribute:
-    """Define accessor to a multilingual attribute of entity."""
+    """Define accessor to a multilingual attribute of entity.  The value is
+    cached in the slot named ``'_' + attribute``, e.g., ``_labels``, which
+    the entity class has to have.
+
+    """
 
     def __init__(self, attribute: str) -> None:
         self.attribute = attribute
+        # The name of the slot to cache the value in, e.g., '_labels'.
+        self.cache_slot = '_' + attribute
 
     @overload
     def __get__(
@@ -52,18 +88,21 @@ class multilingual_attribute:
     def __get__(self, obj, cls=None):
         if obj is None or isinstance(obj, type):
             return self
-        cache_id = '$' + self.attribute
-        try:
-            value = obj.__dict__[cache_id]
-        except KeyError:
+        value = getattr(obj, self.cache_slot)
+        if value is None:
+            if obj.data is None:
+                # Texts fetched by Client.get_labels() are used if the entity
+                # is not loaded.
+                cached = obj.client.term_cache.get(obj.id, self.attribute)
+                if cached is not None:
+                    return cached
             attr = obj.attributes.get(self.attribute) or {}
             assert isinstance(attr, collections.abc.Mapping)
-            pairs = (
-                (item['language'], item['value'])
-                for item in attr.values()
+            value = MultilingualText.from_terms(
+                attr,
+                obj.client.language_fallback
             )
-            value = MultilingualText({k: v for k, v in pairs if k})
-            obj.__dict__[cache_id] = value
+            setattr(obj, self.cache_slot, value)
         return value
 
 
@@ -160,8 +199,16 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
 
        .. versionadded:: 0.7.0
 
+    .. versionchanged:: 0.10.0
+
+       It became to have :attr:`~object.__slots__` so that a large number of
+       entities take less memory.
+
     """
 
+    __slots__ = ('id', 'client', 'data', 'state', 'expanded', '_labels',
+                 '_descriptions', '__weakref__')
+
     label = multilingual_attribute('labels')
     description = multilingual_attribute('descriptions')
 
@@ -170,6 +217,16 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
         self.client = client
         self.data: Optional[Mapping[str, object]] = None
         self.state = EntityState.not_loaded  # type: EntityState
+        #: (:class:`~typing.Optional`\ [:class:`~typing.List`\
+        #: [:class:`Entity`]]) The entities loaded by :meth:`expand()`.
+        #: The entity holds them so that they stay loaded as long as it
+        #: lives.
+        #:
+        #: .. versionadded:: 0.10.0
+        self.expanded: Optional[List[Entity]] = None
+        # The caches of multilingual_attribute values:
+        self._labels: Optional[MultilingualText] = None
+        self._descriptions: Optional[MultilingualText] = None
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, type(self)):
@@ -228,6 +285,81 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
                 for snak in (claim['mainsnak'] for claim in claims)
                 if snak['snaktype'] == 'value']
 
+    def linked_ids(self) -> List[EntityId]:
+        r"""Get the ids of entities which the statements refer to: their
+        properties, item and property values, units of quantities, and
+        globes of coordinates, in claims and their qualifiers.  The entity
+        is loaded if it's not loaded yet.
+
+        :return: The ids in order of appearance, without duplicates and
+                 the entity's own id.
+        :rtype: :class:`~typing.List`\ [:class:`EntityId`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        claims_map = self.attributes.get('claims') or {}
+        assert isinstance(claims_map, collections.abc.Mapping)
+        seen = {self.id}
+        result = []
+        for claims in claims_map.values():
+            for claim in claims:
+                snaks = [claim['mainsnak']]
+                for qualifiers in (claim.get('qualifiers') or {}).values():
+                    snaks.extend(qualifiers)
+                for snak in snaks:
+                    for entity_id in iter_snak_entity_ids(snak):
+                        if entity_id not in seen:
+                            seen.add(entity_id)
+                            result.append(entity_id)
+        return result
+
+    def expand(self, depth: int = 1) -> List['Entity']:
+        r"""Load the entity and the entities which it refers to (see also
+        :meth:`linked_ids()`) in batches, so that rendering their labels
+        and values takes no more request.  Unlike touching each of them,
+        it makes only a request per :attr:`Client.entities_per_request
+        <wikidata.client.Client.entities_per_request>` entities:
+
+        .. code-block:: python
+
+           entity.expand()
+           for prop, values in entity.lists():
+               print(prop.label, [str(v.label) for v in values])
+
+        :param depth: How many hops to follow.  1 by default, which loads
+                      only the entities the statements directly refer to.
+        :type depth: :class:`int`
+        :return: The expanded entities, except the entity itself.
+                 They are kept in :attr:`expanded` as well.
+        :rtype: :class:`~typing.List`\ [:class:`Entity`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        client = self.client
+        if self.data is None:
+            self.load()
+        seen = {self.id}
+        frontier = [self]
+        result: List[Entity] = []
+        for _ in range(depth):
+            linked = []
+            for entity in frontier:
+                if entity.data is None:
+                    continue
+                for entity_id in entity.linked_ids():
+                    if entity_id not in seen:
+                        seen.add(entity_id)
+                        linked.append(client.get(entity_id))
+            if not linked:
+                break
+            client.load_entities(linked)
+            result.extend(linked)
+            frontier = linked
+        self.expanded = result
+        return result
+
     def iterlists(self) -> Iterator[Tuple['Entity', Sequence[object]]]:
         for prop in self:
             yield prop, self.getlist(prop)
@@ -270,6 +402,7 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
         if self.data is None:
             self.load()
         assert self.data is not None
+        self.client.identity_map.accessed(self)
         return self.data
 
     def load(self) -> None:
@@ -277,7 +410,7 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
             return
 
         url = './wiki/Special:EntityData/{}.json'.format(self.id)
-        result = self.client.request(url)
+        result = self.client.request(url, (self.id,))
         if result is None:
             self.state = EntityState.non_existent
             return
@@ -285,24 +418,55 @@ class Entity(collections.abc.Mapping, collections.abc.Hashable):
         assert isinstance(result, collections.abc.Mapping)
         entities = result['entities']
         assert isinstance(entities, collections.abc.Mapping)
-        assert len(entities) == 1
-        redirected = False
         entity_id = self.id
         try:
             data = entities[entity_id]
-            self.state = EntityState.loaded
         except KeyError:
             entity_id = cast(EntityId, next(iter(entities)))
             data = entities[entity_id]
-            redirected = True
-            self.state = EntityState.not_loaded
         assert isinstance(data, collections.abc.Mapping)
+        self._set_data(entity_id, data)
+
+    def unload(self) -> None:
+        """Drop the loaded data so that its memory can be freed, and turn
+        the entity back to :attr:`EntityState.not_loaded`.  The entity keeps
+        its :attr:`id` and identity, and is lazily loaded again when its
+        :attr:`attributes` are accessed.
+
+        An entity known to be :attr:`~EntityState.non_existent` stays so,
+        since it has no data to drop.
+
+        .. versionadded:: 0.10.0
+
+        """
+        if self.state is not EntityState.non_existent:
+            self.state = EntityState.not_loaded
+        if self.data is None:
+            return
+        self.data = None
+        self.expanded = self._labels = self._descriptions = None
+        self.client.identity_map.unloaded(self)
+
+    def _set_data(self,
+                  entity_id: EntityId,
+                  data: Mapping[str, object]) -> None:
+        # Fill the entity with the loaded ``data``.  If the ``entity_id`` is
+        # not the same as the entity's own id, the entity is a redirect to
+        # the ``entity_id``, so that the canonical entity is filled as well.
+        redirected = entity_id != self.id
+        if redirected:
+            self.state = EntityState.not_loaded
+        else:
+            self.state = EntityState.loaded
         self.data = data
         self.id = entity_id
+        self.client.identity_map.loaded(self)
         if redirected:
             canon = self.client.get(entity_id, load=False)
             if canon.data is None:
-                canon.data = dict(data)
+                # Through the identity map as well, e.g., to be counted
+                # toward the budget of MemoryBudgetIdentityMap.
+                canon._set_data(entity_id, dict(data))
 
     def __repr__(self) -> str:
         if self.data:
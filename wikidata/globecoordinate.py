@@ -9,10 +9,12 @@ class GlobeCoordinate:
     in gms or decimal degrees for the given stellar body.
     """
 
-    latitude = None  # type: float
-    longitude = None  # type: float
-    globe = None  # type: Entity
-    precision = None  # type: float
+    __slots__ = 'latitude', 'longitude', 'globe', 'precision'
+
+    latitude: float
+    longitude: float
+    globe: Entity
+    precision: float
 
     def __init__(self,
                  latitude: float,
@@ -0,0 +1,405 @@
+"""Precomputed transitive closure of the class hierarchy.
+
+Answering whether an item is an instance of a class, i.e., *instance of*
+(``P31``) followed by zero or more *subclass of* (``P279``), means walking
+the class hierarchy up.  :class:`ClassHierarchy` instead keeps every
+class's ancestors as a sorted array, so that the answer takes a dictionary
+lookup and a binary search:
+
+.. code-block:: python
+
+   hierarchy = ClassHierarchy()
+   for cls, _, _ in client.traverse([human], [client.get('P279')]):
+       hierarchy.add(cls)
+   hierarchy.save('classes.bin')
+   hierarchy.is_subclass('Q5', 'Q215627')  # human is a person
+
+Classes are not added by merely loading them through a client.  To keep
+a hierarchy up to date as entities are loaded, use
+:class:`ClassHierarchyIdentityMap` as the identity map of the client:
+
+.. code-block:: python
+
+   hierarchy = ClassHierarchy.load('classes.bin')
+   client = Client(identity_map=ClassHierarchyIdentityMap(hierarchy))
+
+.. versionadded:: 0.10.0
+
+"""
+import array
+import bisect
+import collections.abc
+import struct
+import sys
+from typing import (
+    Dict,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
+
+from .entity import Entity, EntityId
+from .identitymap import IdentityMap, WeakIdentityMap
+from .index import snak_value_key
+
+__all__ = ('INSTANCE_OF', 'SUBCLASS_OF', 'ClassHierarchy',
+           'ClassHierarchyIdentityMap')
+
+
+#: (:class:`~.entity.EntityId`) The property *instance of*.
+INSTANCE_OF = EntityId('P31')
+
+#: (:class:`~.entity.EntityId`) The property *subclass of*.
+SUBCLASS_OF = EntityId('P279')
+
+
+class ClassHierarchy:
+    """Transitive closure of *subclass of* (:const:`SUBCLASS_OF`) relations.
+    Each class is numbered, and its ancestors (including itself) are kept
+    as a sorted array of numbers.  Adding relations updates ancestors of
+    the affected classes incrementally; cycles are allowed.
+
+    It can be persisted to a file using :meth:`save()` and loaded back
+    using :meth:`load()`.
+
+    """
+
+    #: (:class:`bytes`) The magic number of files written by :meth:`save()`.
+    MAGIC = b'WDCH'
+
+    #: (:class:`int`) The version of the file format.
+    VERSION = 1
+
+    def __init__(self) -> None:
+        #: (:class:`~typing.List`\ [:class:`~.entity.EntityId`])
+        #: The known classes, in order of their numbers.
+        self.classes: List[EntityId] = []
+        self.numbers: Dict[EntityId, int] = {}
+        self.parents: List[Set[int]] = []
+        self.children: List[Set[int]] = []
+        self.ancestors: List[array.array] = []
+
+    def number(self, class_id: EntityId) -> int:
+        """Get the number of the given class.  A new number is assigned
+        if the class is unknown.
+
+        :param class_id: The class id.
+        :type class_id: :class:`~.entity.EntityId`
+        :return: The number of the class.
+        :rtype: :class:`int`
+
+        """
+        try:
+            return self.numbers[class_id]
+        except KeyError:
+            pass
+        number = len(self.classes)
+        self.classes.append(class_id)
+        self.numbers[class_id] = number
+        self.parents.append(set())
+        self.children.append(set())
+        self.ancestors.append(array.array('I', [number]))
+        return number
+
+    def add(self, entity: Entity) -> None:
+        """Add the *subclass of* relations of the given ``entity``.
+        The entity is loaded if it's not loaded yet.
+
+        :param entity: The class entity.
+        :type entity: :class:`~.entity.Entity`
+
+        """
+        self.add_data(entity.attributes)
+
+    def add_data(self, data: Mapping[str, object]) -> None:
+        r"""Add the *subclass of* relations of the given raw entity
+        ``data``, e.g., :attr:`Entity.data <wikidata.entity.Entity.data>`.
+        If the class was added before, its relations are replaced.
+
+        :param data: The raw entity data.
+        :type data: :class:`~typing.Mapping`\ [:class:`str`, :class:`object`]
+
+        """
+        claims_map = data.get('claims') or {}
+        assert isinstance(claims_map, collections.abc.Mapping)
+        parent_ids = set()
+        for claim in claims_map.get(SUBCLASS_OF, ()):
+            parent_id = snak_value_key(claim['mainsnak'])
+            if parent_id is not None:
+                parent_ids.add(EntityId(parent_id))
+        self.set_parents(EntityId(str(data['id'])), parent_ids)
+
+    def set_parents(self,
+                    class_id: EntityId,
+                    parent_ids: Iterable[EntityId]) -> None:
+        r"""Replace the direct superclasses of the given class.
+
+        :param class_id: The class id.
+        :type class_id: :class:`~.entity.EntityId`
+        :param parent_ids: The ids of its direct superclasses.
+        :type parent_ids: :class:`~typing.Iterable`\
+                          [:class:`~.entity.EntityId`]
+
+        """
+        number = self.number(class_id)
+        new_parents = {self.number(parent_id) for parent_id in parent_ids}
+        old_parents = self.parents[number]
+        for parent in old_parents - new_parents:
+            self.children[parent].discard(number)
+        for parent in new_parents - old_parents:
+            self.children[parent].add(number)
+        self.parents[number] = new_parents
+        if old_parents - new_parents:
+            # Removing relations can shrink ancestors, so recompute them
+            # from scratch for the class and its descendants.
+            affected = self.descendants(number)
+            for n in affected:
+                self.ancestors[n] = array.array('I', [n])
+            self.propagate(affected)
+        elif new_parents - old_parents:
+            self.propagate({number})
+
+    def descendants(self, number: int) -> Set[int]:
+        """Get the numbers of the given class and all of its subclasses.
+
+        :param number: The class number.
+        :type number: :class:`int`
+        :return: The numbers of the class and its descendants.
+        :rtype: :class:`~typing.Set`\\ [:class:`int`]
+
+        """
+        result = {number}
+        stack = [number]
+        children = self.children
+        while stack:
+            for child in children[stack.pop()]:
+                if child not in result:
+                    result.add(child)
+                    stack.append(child)
+        return result
+
+    def propagate(self, numbers: Iterable[int]) -> None:
+        # Merge parents' ancestors into the given classes' ancestors,
+        # and then into their descendants' until nothing changes.
+        ancestors = self.ancestors
+        stack = list(numbers)
+        while stack:
+            n = stack.pop()
+            merged = set(ancestors[n])
+            size = len(merged)
+            for parent in self.parents[n]:
+                merged.update(ancestors[parent])
+            if len(merged) > size:
+                ancestors[n] = array.array('I', sorted(merged))
+                stack.extend(self.children[n])
+
+    def is_subclass(self,
+                    subclass: Union[Entity, EntityId],
+                    superclass: Union[Entity, EntityId]) -> bool:
+        """Test whether the ``subclass`` is the ``superclass`` itself or
+        a direct or indirect subclass of it.
+
+        :param subclass: The class to test.
+        :type subclass: :class:`~typing.Union`\\ [:class:`~.entity.Entity`,
+                        :class:`~.entity.EntityId`]
+        :param superclass: The class expected to be an ancestor.
+        :type superclass: :class:`~typing.Union`\\ [:class:`~.entity.Entity`,
+                          :class:`~.entity.EntityId`]
+        :return: :const:`True` if it's a subclass.
+        :rtype: :class:`bool`
+
+        """
+        sub_id = subclass.id if isinstance(subclass, Entity) else subclass
+        super_id = \
+            superclass.id if isinstance(superclass, Entity) else superclass
+        try:
+            sub = self.numbers[sub_id]
+            sup = self.numbers[super_id]
+        except KeyError:
+            return sub_id == super_id
+        ancestors = self.ancestors[sub]
+        i = bisect.bisect_left(ancestors, sup)
+        return i < len(ancestors) and ancestors[i] == sup
+
+    def is_instance(self,
+                    entity: Entity,
+                    superclass: Union[Entity, EntityId]) -> bool:
+        """Test whether the ``entity`` is an instance (:const:`INSTANCE_OF`)
+        of the ``superclass`` or its subclasses.  The ``entity`` is loaded
+        if it's not loaded yet, but its classes have to be added to
+        the hierarchy beforehand.
+
+        :param entity: The entity to test.
+        :type entity: :class:`~.entity.Entity`
+        :param superclass: The class.
+        :type superclass: :class:`~typing.Union`\\ [:class:`~.entity.Entity`,
+                          :class:`~.entity.EntityId`]
+        :return: :const:`True` if it's an instance.
+        :rtype: :class:`bool`
+
+        """
+        claims_map = entity.attributes.get('claims') or {}
+        assert isinstance(claims_map, collections.abc.Mapping)
+        for claim in claims_map.get(INSTANCE_OF, ()):
+            class_id = snak_value_key(claim['mainsnak'])
+            if class_id is not None and \
+               self.is_subclass(EntityId(class_id), superclass):
+                return True
+        return False
+
+    def ancestor_ids(self, class_id: EntityId) -> List[EntityId]:
+        """Get the ids of the given class and all of its superclasses.
+
+        :param class_id: The class id.
+        :type class_id: :class:`~.entity.EntityId`
+        :return: The ids of the class and its ancestors.
+        :rtype: :class:`~typing.List`\\ [:class:`~.entity.EntityId`]
+
+        """
+        try:
+            number = self.numbers[class_id]
+        except KeyError:
+            return [class_id]
+        return [self.classes[n] for n in self.ancestors[number]]
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __contains__(self, class_id: object) -> bool:
+        return class_id in self.numbers
+
+    def save(self, file: Union[str, IO[bytes]]) -> None:
+        """Persist the hierarchy to the given ``file``.
+
+        :param file: The path or the binary file object to write to.
+        :type file: :class:`~typing.Union`\\ [:class:`str`,
+                    :class:`~typing.IO`\\ [:class:`bytes`]]
+
+        """
+        if isinstance(file, str):
+            with open(file, 'wb') as f:
+                self.save(f)
+            return
+        names = '\n'.join(self.classes).encode('utf-8')
+        file.write(self.MAGIC)
+        file.write(struct.pack('<HII', self.VERSION,
+                               len(self.classes), len(names)))
+        file.write(names)
+        for parents, ancestors in zip(self.parents, self.ancestors):
+            write_array(file, array.array('I', sorted(parents)))
+            write_array(file, ancestors)
+
+    @classmethod
+    def load(cls, file: Union[str, IO[bytes]]) -> 'ClassHierarchy':
+        """Load a hierarchy persisted by :meth:`save()`.
+
+        :param file: The path or the binary file object to read from.
+        :type file: :class:`~typing.Union`\\ [:class:`str`,
+                    :class:`~typing.IO`\\ [:class:`bytes`]]
+        :return: The loaded hierarchy.
+        :rtype: :class:`ClassHierarchy`
+        :raise ValueError: When the file is not in the expected format.
+
+        """
+        if isinstance(file, str):
+            with open(file, 'rb') as f:
+                return cls.load(f)
+        if file.read(len(cls.MAGIC)) != cls.MAGIC:
+            raise ValueError('not a class hierarchy file')
+        version, count, names_size = struct.unpack('<HII', file.read(10))
+        if version != cls.VERSION:
+            raise ValueError(
+                'unsupported class hierarchy file version: {}'.format(version)
+            )
+        self = cls()
+        names = file.read(names_size).decode('utf-8')
+        self.classes = [EntityId(n) for n in names.split('\n')] \
+            if count else []
+        self.numbers = {class_id: n for n, class_id in enumerate(self.classes)}
+        self.children = [set() for _ in range(count)]
+        for n in range(count):
+            parents = read_array(file)
+            self.parents.append(set(parents))
+            for parent in parents:
+                self.children[parent].add(n)
+            self.ancestors.append(read_array(file))
+        return self
+
+
+class ClassHierarchyIdentityMap(IdentityMap):
+    """Identity map which adds the *subclass of* relations of loaded
+    entities to the given ``hierarchy``, so that the closure is updated
+    incrementally as classes are loaded.  Entities which have no *subclass
+    of* statements are skipped unless they are already in the hierarchy.
+    Keeping entities is delegated to the wrapped ``identity_map``.
+
+    :param hierarchy: The hierarchy to update.
+    :type hierarchy: :class:`ClassHierarchy`
+    :param identity_map: The identity map to keep entities in.
+                         :class:`~.identitymap.WeakIdentityMap` by default.
+    :type identity_map: :class:`~.identitymap.IdentityMap`
+
+    """
+
+    def __init__(self,
+                 hierarchy: ClassHierarchy,
+                 identity_map: Optional[IdentityMap] = None) -> None:
+        if identity_map is None:
+            identity_map = WeakIdentityMap()
+        self.hierarchy = hierarchy
+        self.identity_map = identity_map
+
+    def __getitem__(self, entity_id: EntityId) -> Entity:
+        return self.identity_map[entity_id]
+
+    def __setitem__(self, entity_id: EntityId, entity: Entity) -> None:
+        self.identity_map[entity_id] = entity
+
+    def __delitem__(self, entity_id: EntityId) -> None:
+        del self.identity_map[entity_id]
+
+    def __iter__(self) -> Iterator[EntityId]:
+        return iter(self.identity_map)
+
+    def __len__(self) -> int:
+        return len(self.identity_map)
+
+    def loaded(self, entity: Entity) -> None:
+        self.identity_map.loaded(entity)
+        data = entity.data
+        if data is None:
+            return
+        claims_map = data.get('claims') or {}
+        assert isinstance(claims_map, collections.abc.Mapping)
+        # Only the key is tested first, so that claims of entities which
+        # are not classes are not parsed if they are lazy.
+        if SUBCLASS_OF in claims_map or entity.id in self.hierarchy:
+            self.hierarchy.add_data(data)
+
+    def accessed(self, entity: Entity) -> None:
+        self.identity_map.accessed(entity)
+
+    def unloaded(self, entity: Entity) -> None:
+        self.identity_map.unloaded(entity)
+
+
+def write_array(file: IO[bytes], numbers: array.array) -> None:
+    if sys.byteorder == 'big':
+        numbers = array.array(numbers.typecode, numbers)
+        numbers.byteswap()
+    file.write(struct.pack('<I', len(numbers)))
+    file.write(numbers.tobytes())
+
+
+def read_array(file: IO[bytes]) -> array.array:
+    size, = struct.unpack('<I', file.read(4))
+    numbers = array.array('I')
+    numbers.frombytes(file.read(size * numbers.itemsize))
+    if sys.byteorder == 'big':
+        numbers.byteswap()
+    return numbers
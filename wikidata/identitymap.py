@@ -0,0 +1,326 @@
+"""Identity maps which :class:`~.client.Client` uses to keep only one
+:class:`~.entity.Entity` object per :class:`~.entity.EntityId`.
+
+By default (:class:`WeakIdentityMap`) an entity is kept only while the user
+code holds it, so that its loaded data is gone as soon as it's dropped.
+:class:`LRUIdentityMap` additionally retains recently used entities, which
+is useful for long-lived processes that repeatedly look up the same hot
+entities, e.g., properties and units:
+
+.. code-block:: python
+
+   client = Client(identity_map=LRUIdentityMap(max_size=10000))
+
+On the other hand, :class:`MemoryBudgetIdentityMap` bounds the memory taken
+by loaded data, for processes that hold references to too many entities.
+
+.. versionadded:: 0.10.0
+
+"""
+import collections
+import collections.abc
+import sys
+import weakref
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+)
+
+from .entity import EntityId
+from .lazyjson import LazyObject
+
+if TYPE_CHECKING:
+    from .entity import Entity  # noqa: F401
+
+__all__ = ('IdentityMap', 'LRUIdentityMap', 'MemoryBudgetIdentityMap',
+           'WeakIdentityMap', 'approximate_size')
+
+
+def approximate_size(value: object) -> int:
+    """Approximate the memory size of the given ``value`` in bytes,
+    including the objects it contains, e.g., a JSON document.  Objects
+    shared by multiple containers are counted only once.
+
+    :param value: The object to measure.
+    :return: The approximate size in bytes.
+    :rtype: :class:`int`
+
+    """
+    seen: Set[int] = set()
+    size = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj, 0)
+        if isinstance(obj, LazyObject):
+            # Count only the text and the members parsed so far, so that
+            # measuring doesn't parse the rest.
+            stack.append(obj.text)
+            stack.extend(obj.parsed.keys())
+            stack.extend(obj.parsed.values())
+        elif isinstance(obj, collections.abc.Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+class IdentityMap(MutableMapping[EntityId, 'Entity']):
+    """The interface of identity maps.  Subclasses have to implement
+    the :class:`~typing.MutableMapping` protocol.
+
+    """
+
+    def loaded(self, entity: 'Entity') -> None:
+        """Called when the data of the ``entity`` is loaded.
+        Does nothing by default.
+
+        :param entity: The loaded entity.
+        :type entity: :class:`~.entity.Entity`
+
+        """
+
+    def accessed(self, entity: 'Entity') -> None:
+        """Called when the loaded data of the ``entity`` is accessed through
+        :attr:`Entity.attributes <wikidata.entity.Entity.attributes>`.
+        Does nothing by default.
+
+        :param entity: The accessed entity.
+        :type entity: :class:`~.entity.Entity`
+
+        """
+
+    def unloaded(self, entity: 'Entity') -> None:
+        """Called when the data of the ``entity`` is dropped by
+        :meth:`Entity.unload() <wikidata.entity.Entity.unload>`.
+        Does nothing by default.
+
+        :param entity: The unloaded entity.
+        :type entity: :class:`~.entity.Entity`
+
+        """
+
+
+class WeakIdentityMap(IdentityMap):
+    """Identity map which holds entities only by weak references.
+    This is the default identity map.
+
+    """
+
+    def __init__(self) -> None:
+        self.entities: MutableMapping[EntityId, 'Entity'] = \
+            weakref.WeakValueDictionary()
+
+    def __getitem__(self, entity_id: EntityId) -> 'Entity':
+        return self.entities[entity_id]
+
+    def __setitem__(self, entity_id: EntityId, entity: 'Entity') -> None:
+        self.entities[entity_id] = entity
+
+    def __delitem__(self, entity_id: EntityId) -> None:
+        del self.entities[entity_id]
+
+    def __iter__(self) -> Iterator[EntityId]:
+        return iter(list(self.entities))
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __reduce__(self) -> Tuple[Callable[..., 'WeakIdentityMap'],
+                                  Tuple[object, ...]]:
+        # Entities are not pickled.
+        return type(self), ()
+
+
+class LRUIdentityMap(WeakIdentityMap):
+    r"""Identity map which retains recently used entities by strong
+    references, in addition to weak references to all entities.
+    Retained entities are not garbage-collected even if the user code
+    drops them, so that their loaded data survive.
+
+    :param max_size: The maximum number of entities to retain.
+                     128 by default.  :const:`None` means no limit
+                     by count.
+    :type max_size: :class:`~typing.Optional`\ [:class:`int`]
+    :param max_bytes: The maximum total size of the retained entities' data
+                      in bytes, measured by :func:`approximate_size()`.
+                      :const:`None` (default) means no limit by size.
+    :type max_bytes: :class:`~typing.Optional`\ [:class:`int`]
+
+    """
+
+    def __init__(self,
+                 max_size: Optional[int] = 128,
+                 max_bytes: Optional[int] = None) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.retained: collections.OrderedDict = collections.OrderedDict()
+        # The keys of retained entities by their object ids, since the id of
+        # a redirected entity is no more the key it's retained under.
+        self.retained_keys: Dict[int, EntityId] = {}
+        self.sizes: Dict[EntityId, int] = {}
+        #: (:class:`int`) The total size of the retained entities' data,
+        #: if :attr:`max_bytes` is set.  Otherwise, always zero.
+        self.retained_bytes = 0
+
+    def retain(self, entity_id: EntityId, entity: 'Entity') -> None:
+        retained = self.retained
+        old = retained.get(entity_id)
+        if old is entity:
+            # Its size is kept up to date by loaded() and unloaded(), so
+            # that looking up a retained entity doesn't measure it again.
+            retained.move_to_end(entity_id)
+            return
+        if old is not None:
+            del retained[entity_id]
+            self.forget(entity_id, old)
+        retained[entity_id] = entity
+        self.retained_keys[id(entity)] = entity_id
+        if self.max_bytes is not None:
+            self.measure(entity_id, entity)
+        self.evict()
+
+    def measure(self, entity_id: EntityId, entity: 'Entity') -> None:
+        old_size = self.sizes.get(entity_id, 0)
+        size = 0 if entity.data is None else approximate_size(entity.data)
+        self.sizes[entity_id] = size
+        self.retained_bytes += size - old_size
+
+    def evict(self) -> None:
+        retained = self.retained
+        max_size = self.max_size
+        max_bytes = self.max_bytes
+        while retained and (
+            max_size is not None and len(retained) > max_size or
+            max_bytes is not None and self.retained_bytes > max_bytes and
+            len(retained) > 1
+        ):
+            entity_id, entity = retained.popitem(last=False)
+            self.forget(entity_id, entity)
+
+    def forget(self, entity_id: EntityId, entity: 'Entity') -> None:
+        self.retained_keys.pop(id(entity), None)
+        self.retained_bytes -= self.sizes.pop(entity_id, 0)
+
+    def loaded(self, entity: 'Entity') -> None:
+        entity_id = self.retained_keys.get(id(entity))
+        if self.max_bytes is not None and entity_id is not None:
+            self.measure(entity_id, entity)
+            self.evict()
+
+    def unloaded(self, entity: 'Entity') -> None:
+        entity_id = self.retained_keys.get(id(entity))
+        if self.max_bytes is not None and entity_id is not None:
+            self.measure(entity_id, entity)
+
+    def __getitem__(self, entity_id: EntityId) -> 'Entity':
+        entity = self.entities[entity_id]
+        self.retain(entity_id, entity)
+        return entity
+
+    def __setitem__(self, entity_id: EntityId, entity: 'Entity') -> None:
+        self.entities[entity_id] = entity
+        self.retain(entity_id, entity)
+
+    def __delitem__(self, entity_id: EntityId) -> None:
+        del self.entities[entity_id]
+        entity = self.retained.pop(entity_id, None)
+        if entity is not None:
+            self.forget(entity_id, entity)
+
+    def __reduce__(self) -> Tuple[Callable[..., 'LRUIdentityMap'],
+                                  Tuple[object, ...]]:
+        # Entities are not pickled.
+        return type(self), (self.max_size, self.max_bytes)
+
+
+class MemoryBudgetIdentityMap(WeakIdentityMap):
+    r"""Identity map which keeps the total size of loaded entities' data
+    under the given budget.  When the budget is exceeded, the data of the
+    least recently accessed entities are dropped using :meth:`Entity.unload()
+    <wikidata.entity.Entity.unload>`; the entities themselves remain as they
+    are, and are lazily loaded again when their :attr:`Entity.attributes
+    <wikidata.entity.Entity.attributes>` are accessed.
+
+    It lets a long crawl hold references to a huge number of entities
+    without unbounded memory growth:
+
+    .. code-block:: python
+
+       client = Client(identity_map=MemoryBudgetIdentityMap(256 * 1024 ** 2))
+
+    Like :class:`WeakIdentityMap`, entities are held only by weak
+    references.
+
+    :param max_bytes: The budget of the total size of loaded entities' data
+                      in bytes, measured by :func:`approximate_size()`.
+                      The most recently loaded entity is never unloaded
+                      even if it alone exceeds the budget.
+    :type max_bytes: :class:`int`
+
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        # Loaded entities are keyed by their object ids rather than entity
+        # ids, since a redirect and its canonical entity share the same id
+        # after they're loaded.  Keys are forgotten when entities are
+        # garbage-collected, so that they aren't reused meanwhile.
+        self.loaded_entities: collections.OrderedDict = \
+            collections.OrderedDict()
+        self.sizes: Dict[int, int] = {}
+        #: (:class:`int`) The total size of the loaded entities' data.
+        self.loaded_bytes = 0
+
+    def forget(self, key: int) -> None:
+        self.loaded_entities.pop(key, None)
+        self.loaded_bytes -= self.sizes.pop(key, 0)
+
+    def loaded(self, entity: 'Entity') -> None:
+        key = id(entity)
+
+        def callback(ref: 'weakref.ref[Entity]') -> None:
+            # The entity was garbage-collected along with its data.
+            if self.loaded_entities.get(key) is ref:
+                self.forget(key)
+        self.forget(key)
+        size = 0 if entity.data is None else approximate_size(entity.data)
+        self.loaded_entities[key] = weakref.ref(entity, callback)
+        self.sizes[key] = size
+        self.loaded_bytes += size
+        self.evict()
+
+    def accessed(self, entity: 'Entity') -> None:
+        try:
+            self.loaded_entities.move_to_end(id(entity))
+        except KeyError:
+            pass
+
+    def unloaded(self, entity: 'Entity') -> None:
+        self.forget(id(entity))
+
+    def evict(self) -> None:
+        loaded_entities = self.loaded_entities
+        while self.loaded_bytes > self.max_bytes and len(loaded_entities) > 1:
+            key, ref = loaded_entities.popitem(last=False)
+            self.loaded_bytes -= self.sizes.pop(key, 0)
+            entity = ref()
+            if entity is not None:
+                entity.unload()
+
+    def __reduce__(self) -> Tuple[Callable[..., 'MemoryBudgetIdentityMap'],
+                                  Tuple[object, ...]]:
+        # Entities are not pickled.
+        return type(self), (self.max_bytes,)
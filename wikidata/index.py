@@ -0,0 +1,359 @@
+"""Inverted index from statements to entities over a local corpus.
+
+:class:`PropertyValueIndex` maps each pair of property and value, e.g.,
+``('P31', 'Q5')`` (*instance of* *human*), to the entities having such
+a statement.  It's built incrementally from loaded entities or from
+`JSON dumps`_, and answers queries without any request:
+
+.. code-block:: python
+
+   index = PropertyValueIndex()
+   index.add_dump(open('latest-all.json'))
+   humans = index['P31', 'Q5']
+   koreans = index['P27', 'Q884'] | index['P27', 'Q423']
+   index.entity_ids(humans & koreans)
+
+Postings are kept as sorted lists of delta-encoded varints, so that an index
+over millions of entities fits in memory.
+
+.. _JSON dumps: https://www.wikidata.org/wiki/Wikidata:Database_download
+
+.. versionadded:: 0.10.0
+
+"""
+import collections.abc
+import json
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .entity import Entity, EntityId
+
+__all__ = 'IndexKey', 'PostingList', 'PropertyValueIndex', 'snak_value_key'
+
+
+#: The key of :class:`PropertyValueIndex`: a pair of property id and
+#: value key (see also :func:`snak_value_key()`).
+IndexKey = Tuple[EntityId, str]
+
+
+def encode_varint(number: int, buffer: bytearray) -> None:
+    while number > 0x7f:
+        buffer.append((number & 0x7f) | 0x80)
+        number >>= 7
+    buffer.append(number)
+
+
+class PostingList(collections.abc.Sized, collections.abc.Iterable):
+    r"""Sorted list of document numbers, compressed as delta-encoded
+    varints.  Appending a number greater than the last one is cheap;
+    the other insertions need to re-encode the whole list.
+
+    Two posting lists can be combined using ``&`` (intersection) and
+    ``|`` (union) operators.
+
+    :param numbers: The initial document numbers.  They don't have to be
+                    sorted nor unique.
+    :type numbers: :class:`~typing.Iterable`\ [:class:`int`]
+
+    """
+
+    __slots__ = 'data', 'length', 'last'
+
+    def __init__(self, numbers: Iterable[int] = ()) -> None:
+        self.data = bytearray()
+        self.length = 0
+        self.last = -1
+        for number in sorted(set(numbers)):
+            self.append(number)
+
+    def append(self, number: int) -> None:
+        """Append a document ``number`` greater than the last one."""
+        if number <= self.last:
+            raise ValueError(
+                'expected a number greater than {}, not {}'.format(
+                    self.last, number
+                )
+            )
+        encode_varint(number - self.last - 1, self.data)
+        self.last = number
+        self.length += 1
+
+    def add(self, number: int) -> None:
+        """Add a document ``number``.  Does nothing if it already exists."""
+        if number > self.last:
+            self.append(number)
+        elif number not in self:
+            numbers = list(self)
+            numbers.append(number)
+            numbers.sort()
+            self.data = bytearray()
+            self.length = 0
+            self.last = -1
+            for n in numbers:
+                self.append(n)
+
+    def __iter__(self) -> Iterator[int]:
+        number = -1
+        delta = shift = 0
+        for byte in self.data:
+            delta |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            number += delta + 1
+            yield number
+            delta = shift = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __contains__(self, number: object) -> bool:
+        if not isinstance(number, int) or number > self.last:
+            return False
+        for n in self:
+            if n >= number:
+                return n == number
+        return False
+
+    def __and__(self, other: 'PostingList') -> 'PostingList':
+        if not isinstance(other, PostingList):
+            return NotImplemented
+        result = PostingList()
+        if not (self and other):
+            return result
+        a = iter(self)
+        b = iter(other)
+        x = next(a)
+        y = next(b)
+        try:
+            while True:
+                if x < y:
+                    x = next(a)
+                elif x > y:
+                    y = next(b)
+                else:
+                    result.append(x)
+                    x = next(a)
+                    y = next(b)
+        except StopIteration:
+            pass
+        return result
+
+    def __or__(self, other: 'PostingList') -> 'PostingList':
+        if not isinstance(other, PostingList):
+            return NotImplemented
+        result = PostingList()
+        a = iter(self)
+        b = iter(other)
+        x = next(a, None)
+        y = next(b, None)
+        while x is not None and y is not None:
+            if x < y:
+                result.append(x)
+                x = next(a, None)
+            elif x > y:
+                result.append(y)
+                y = next(b, None)
+            else:
+                result.append(x)
+                x = next(a, None)
+                y = next(b, None)
+        for rest, n in ((a, x), (b, y)):
+            if n is not None:
+                result.append(n)
+                for n in rest:
+                    result.append(n)
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PostingList):
+            return NotImplemented
+        return self.data == other.data
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}({1!r})'.format(
+            type(self), list(self)
+        )
+
+
+def snak_value_key(snak: Mapping[str, object]) -> Optional[str]:
+    r"""Get the value key of the given ``snak`` to index.  Only entity ids
+    and strings (including external identifiers) are indexed; it returns
+    :const:`None` for the other types of values and snaks without value.
+
+    :param snak: The raw snak data.
+    :type snak: :class:`~typing.Mapping`\ [:class:`str`, :class:`object`]
+    :return: The value key, or :const:`None` if it can't be indexed.
+    :rtype: :class:`~typing.Optional`\ [:class:`str`]
+
+    """
+    if snak.get('snaktype') != 'value':
+        return None
+    datavalue = snak.get('datavalue')
+    if not isinstance(datavalue, collections.abc.Mapping):
+        return None
+    value = datavalue.get('value')
+    type_ = datavalue.get('type')
+    if type_ == 'wikibase-entityid':
+        if not isinstance(value, collections.abc.Mapping):
+            return None
+        return value.get('id')
+    elif type_ == 'string' and isinstance(value, str):
+        return value
+    return None
+
+
+class PropertyValueIndex(collections.abc.Mapping):
+    r"""Inverted index from :const:`IndexKey` to entities.  It's
+    a :class:`~typing.Mapping`\ [:const:`IndexKey`, :class:`PostingList`]
+    and looking up a missing key returns an empty :class:`PostingList`
+    instead of raising :exc:`KeyError`.
+
+    Entities are numbered in the order they are added, and posting lists
+    consist of these document numbers.  Use :meth:`entity_ids()` to turn
+    them back into :class:`~.entity.EntityId`\ s.
+
+    Note that adding an entity again only adds its new statements;
+    statements removed since then are not removed from the index.
+
+    """
+
+    def __init__(self) -> None:
+        #: (:class:`~typing.List`\ [:class:`~.entity.EntityId`])
+        #: The indexed entity ids, in order of their document numbers.
+        self.documents: List[EntityId] = []
+        self.document_numbers: Dict[EntityId, int] = {}
+        self.postings: Dict[IndexKey, PostingList] = {}
+
+    def add(self, entity: Entity) -> None:
+        """Index the statements of the given ``entity``.  The entity is
+        loaded if it's not loaded yet.
+
+        :param entity: The entity to index.
+        :type entity: :class:`~.entity.Entity`
+
+        """
+        self.add_data(entity.attributes)
+
+    def add_data(self, data: Mapping[str, object]) -> None:
+        r"""Index the statements of the given raw entity ``data``, e.g.,
+        :attr:`Entity.data <wikidata.entity.Entity.data>`.
+
+        :param data: The raw entity data.
+        :type data: :class:`~typing.Mapping`\ [:class:`str`, :class:`object`]
+
+        """
+        entity_id = EntityId(str(data['id']))
+        try:
+            number = self.document_numbers[entity_id]
+        except KeyError:
+            number = len(self.documents)
+            self.documents.append(entity_id)
+            self.document_numbers[entity_id] = number
+        claims_map = data.get('claims') or {}
+        assert isinstance(claims_map, collections.abc.Mapping)
+        postings = self.postings
+        for prop_id, claims in claims_map.items():
+            for claim in claims:
+                value_key = snak_value_key(claim['mainsnak'])
+                if value_key is None:
+                    continue
+                key = EntityId(prop_id), value_key
+                try:
+                    posting_list = postings[key]
+                except KeyError:
+                    posting_list = postings[key] = PostingList()
+                posting_list.add(number)
+
+    def add_dump(self, lines: Iterable[Union[str, bytes]]) -> int:
+        r"""Index the entities from the lines of a `JSON dump`__.  Each line
+        of the dump consists of an entity, and the whole dump is wrapped
+        in square brackets.
+
+        __ https://www.wikidata.org/wiki/Wikidata:Database_download
+
+        :param lines: The lines of a JSON dump, e.g., a file object.
+        :type lines: :class:`~typing.Iterable`\ [:class:`~typing.Union`\
+                     [:class:`str`, :class:`bytes`]]
+        :return: The number of indexed entities.
+        :rtype: :class:`int`
+
+        """
+        count = 0
+        for line in lines:
+            line = line.strip()
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.rstrip(',')
+            if line in ('', '[', ']'):
+                continue
+            self.add_data(json.loads(line))
+            count += 1
+        return count
+
+    def entity_ids(self, posting_list: PostingList) -> List[EntityId]:
+        r"""Turn the document numbers of the ``posting_list`` into
+        entity ids.
+
+        :param posting_list: The posting list to turn.
+        :type posting_list: :class:`PostingList`
+        :return: The entity ids.
+        :rtype: :class:`~typing.List`\ [:class:`~.entity.EntityId`]
+
+        """
+        documents = self.documents
+        return [documents[number] for number in posting_list]
+
+    def intersection(self, *keys: IndexKey) -> List[EntityId]:
+        r"""Find entities that have all statements of the given ``keys``.
+
+        :param \*keys: The pairs of property id and value key.
+        :return: The found entity ids.
+        :rtype: :class:`~typing.List`\ [:class:`~.entity.EntityId`]
+
+        """
+        if not keys:
+            return []
+        lists = sorted((self[key] for key in keys), key=len)
+        result = lists[0]
+        for posting_list in lists[1:]:
+            if not result:
+                break
+            result = result & posting_list
+        return self.entity_ids(result)
+
+    def union(self, *keys: IndexKey) -> List[EntityId]:
+        r"""Find entities that have any statement of the given ``keys``.
+
+        :param \*keys: The pairs of property id and value key.
+        :return: The found entity ids.
+        :rtype: :class:`~typing.List`\ [:class:`~.entity.EntityId`]
+
+        """
+        result = PostingList()
+        for key in keys:
+            result = result | self[key]
+        return self.entity_ids(result)
+
+    def __getitem__(self, key: IndexKey) -> PostingList:
+        try:
+            return self.postings[key]
+        except KeyError:
+            return PostingList()
+
+    def __iter__(self) -> Iterator[IndexKey]:
+        return iter(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.postings
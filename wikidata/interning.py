@@ -0,0 +1,67 @@
+"""Interning strings repeated across entity documents.
+
+Every entity document repeats the same short strings over and over: property
+ids, language codes, datatype names, snak types, ranks, and so on.
+:func:`intern_pairs()` is an ``object_pairs_hook`` for :func:`json.load()`
+which makes these strings share a single object through :func:`sys.intern()`.
+It makes parsing a bit slower, but saves memory when many documents are
+kept, e.g., in an :class:`~.identitymap.LRUIdentityMap` or
+a :class:`~.cache.MemoryCachePolicy`.  To turn it on for a client:
+
+.. code-block:: python
+
+   client = Client(intern_strings=True)
+
+.. versionadded:: 0.10.0
+
+"""
+import sys
+from typing import Dict, FrozenSet, List, Tuple
+
+__all__ = 'INTERNED_VALUE_KEYS', 'MAX_INTERNED_LENGTH', 'intern_pairs'
+
+
+#: (:class:`~typing.FrozenSet`\ [:class:`str`]) The keys whose string values
+#: are interned, e.g., ``'rank'``.  Keys themselves are always interned.
+INTERNED_VALUE_KEYS: FrozenSet[str] = frozenset({
+    'after', 'calendarmodel', 'datatype', 'entity-type', 'globe', 'id',
+    'language', 'property', 'rank', 'site', 'snaktype', 'type', 'unit',
+})
+
+#: (:class:`int`) String values longer than this are never interned, e.g.,
+#: statement GUIDs in ``'id'``, which are unique.
+MAX_INTERNED_LENGTH = 40
+
+intern = sys.intern
+
+
+def intern_pairs(pairs: List[Tuple[str, object]]) -> Dict[str, object]:
+    r"""Make a :class:`dict` from the ``pairs`` of a JSON object with its
+    keys and well-known enumerated values (see :const:`INTERNED_VALUE_KEYS`)
+    interned.  Lists of keys, e.g., ``'qualifiers-order'``, are interned
+    as well.  Meant to be used as ``object_pairs_hook`` of
+    :func:`json.load()`:
+
+    >>> import json
+    >>> a = json.loads('{"rank": "normal"}', object_pairs_hook=intern_pairs)
+    >>> b = json.loads('{"rank": "normal"}', object_pairs_hook=intern_pairs)
+    >>> a['rank'] is b['rank']
+    True
+
+    :param pairs: The key-value pairs of a JSON object.
+    :type pairs: :class:`~typing.List`\ [:class:`~typing.Tuple`\
+                 [:class:`str`, :class:`object`]]
+    :return: The JSON object.
+    :rtype: :class:`~typing.Dict`\ [:class:`str`, :class:`object`]
+
+    """
+    result = {}
+    for key, value in pairs:
+        if type(value) is str:
+            if key in INTERNED_VALUE_KEYS and \
+               len(value) <= MAX_INTERNED_LENGTH:
+                value = intern(value)
+        elif type(value) is list and key.endswith('-order'):
+            value = [intern(v) if type(v) is str else v for v in value]
+        result[intern(key)] = value
+    return result
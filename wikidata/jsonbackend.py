@@ -0,0 +1,106 @@
+"""Pluggable JSON parsers for API responses.
+
+:meth:`Client.request() <wikidata.client.Client.request>` parses responses
+using the ``json_backend`` option of :class:`~.client.Client`, which takes
+the raw response body in :class:`bytes`, so that backends can parse it
+without decoding it to text first.  By default it's
+:class:`StdlibJsonBackend`.  :class:`OrjsonBackend` is considerably faster
+on large entity documents, but it has to be chosen explicitly, since
+orjson_ differs from the standard :mod:`json` module in edge cases, e.g.,
+integers wider than 64 bits, ``NaN`` and ``Infinity``, and exceptions it
+raises:
+
+.. code-block:: python
+
+   client = Client(json_backend=OrjsonBackend())
+
+Other parsers can be plugged in by subclassing :class:`JsonBackend`:
+
+.. code-block:: python
+
+   class UjsonBackend(StdlibJsonBackend):
+
+       def loads(self, data, object_pairs_hook=None):
+           if object_pairs_hook is None:
+               return ujson.loads(data)
+           return super().loads(data, object_pairs_hook)
+
+   client = Client(json_backend=UjsonBackend())
+
+.. _orjson: https://github.com/ijl/orjson
+
+.. versionadded:: 0.10.0
+
+"""
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+__all__ = 'JsonBackend', 'OrjsonBackend', 'PairsHook', 'StdlibJsonBackend'
+
+
+#: The type of ``object_pairs_hook``: a function which takes pairs of
+#: a JSON object in order and returns an object to represent it, in
+#: the same manner as :func:`json.loads()`.
+PairsHook = Callable[[List[Tuple[str, Any]]], Any]
+
+
+class JsonBackend:
+    """The interface of JSON backends."""
+
+    def loads(self,
+              data: bytes,
+              object_pairs_hook: Optional[PairsHook] = None) -> object:
+        r"""Parse the given JSON ``data``.
+
+        :param data: The UTF-8 encoded JSON document.
+        :type data: :class:`bytes`
+        :param object_pairs_hook: The function to turn pairs of each JSON
+                                  object into a Python object.  Objects are
+                                  turned into :class:`dict`\ s if it's
+                                  omitted.
+        :type object_pairs_hook: :const:`PairsHook`
+        :return: The parsed value.
+        :rtype: :class:`object`
+        :raise ValueError: When the ``data`` is not a valid JSON.
+
+        """
+        raise NotImplementedError(
+            'JsonBackend.loads() has to be implemented'
+        )
+
+
+class StdlibJsonBackend(JsonBackend):
+    """Parse JSON using the standard :mod:`json` module.  It's the default
+    backend of :class:`~.client.Client`.
+
+    """
+
+    def loads(self,
+              data: bytes,
+              object_pairs_hook: Optional[PairsHook] = None) -> object:
+        return json.loads(data, object_pairs_hook=object_pairs_hook)
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}()'.format(type(self))
+
+
+class OrjsonBackend(StdlibJsonBackend):
+    """Parse JSON using orjson_, which parses :class:`bytes` directly.
+    Since orjson has no hooks, it falls back to the standard :mod:`json`
+    module when ``object_pairs_hook`` is given; the stdlib parser calling
+    the hook is faster than applying it to what orjson parsed.
+
+    :raise ImportError: When orjson_ is not installed.
+
+    """
+
+    def __init__(self) -> None:
+        import orjson  # noqa: F401
+
+    def loads(self,
+              data: bytes,
+              object_pairs_hook: Optional[PairsHook] = None) -> object:
+        if object_pairs_hook is not None:
+            return super().loads(data, object_pairs_hook)
+        import orjson
+        return orjson.loads(data)
@@ -0,0 +1,234 @@
+r"""Incremental parser of ``wbgetentities`` responses.
+
+A response of ``wbgetentities`` for many entities can take megabytes, and
+parsing it as a whole has to wait until it's completely received, keeping
+all of it in memory.  :class:`EntityStream` instead reads a response in
+chunks and yields each entity as soon as its JSON is complete, buffering
+about only an entity at a time:
+
+.. code-block:: python
+
+   stream = EntityStream(response)
+   for entity_id, data in stream:
+       ...
+   stream.members  # other members, e.g., {'success': 1}
+
+It depends only on the standard :mod:`json` module.  Use the
+``stream_responses`` option of :class:`~.client.Client` to make
+:meth:`Client.load_entities() <wikidata.client.Client.load_entities>`
+use it.
+
+.. versionadded:: 0.10.0
+
+"""
+import codecs
+import json
+import re
+from typing import (Dict, IO, Iterator, List, Mapping, Optional, Tuple,
+                    cast)
+
+from .jsonbackend import PairsHook
+
+__all__ = 'CHUNK_SIZE', 'EntityStream', 'StreamError', 'read_text'
+
+
+#: (:class:`int`) The number of bytes to read at a time.
+CHUNK_SIZE = 8192
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class StreamError(ValueError):
+    """Exception raised when a streamed response is malformed."""
+
+
+def read_text(fp: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+
+class CountingReader:
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self.fp = fp
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.fp.read(size)
+        self.size += len(chunk)
+        return chunk
+
+
+class EntityStream(Iterator[Tuple[str, Mapping[str, object]]]):
+    r"""Iterate over the members of ``entities`` in a ``wbgetentities``
+    response, i.e., pairs of an entity id and its data, as soon as each
+    of them is read.  Other top-level members (e.g., ``success`` or
+    ``error``) are kept in :attr:`members`.
+
+    Since the standard :mod:`json` parser can't be resumed, an incomplete
+    entity is parsed again only when the buffer has grown twice since
+    the last attempt, so that the time taken stays linear to the size of
+    the response.  The buffer therefore holds up to about twice the size of
+    an entity.
+
+    :param fp: The binary file object of the response.
+    :type fp: :class:`~typing.IO`\ [:class:`bytes`]
+    :param object_pairs_hook: The function to turn pairs of each JSON object
+                              into a Python object, in the same manner as
+                              :func:`json.loads()`.
+    :type object_pairs_hook: :const:`~.jsonbackend.PairsHook`
+    :param chunk_size: The number of bytes to read at a time.
+                       :const:`CHUNK_SIZE` by default.
+    :type chunk_size: :class:`int`
+    :param max_buffer_size: The maximum number of characters to buffer.
+                            :exc:`StreamError` is raised if an entity
+                            doesn't fit in it.  Unlimited by default.
+    :type max_buffer_size: :class:`~typing.Optional`\ [:class:`int`]
+    :raise StreamError: When the response is malformed.
+
+    """
+
+    def __init__(self,
+                 fp: IO[bytes],
+                 object_pairs_hook: Optional[PairsHook] = None,
+                 chunk_size: int = CHUNK_SIZE,
+                 max_buffer_size: Optional[int] = None) -> None:
+        self.reader = CountingReader(fp)
+        self.chunks = read_text(cast(IO[bytes], self.reader), chunk_size)
+        self.decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+        self.max_buffer_size = max_buffer_size
+        #: (:class:`~typing.Dict`\ [:class:`str`, :class:`object`]) The
+        #: top-level members other than ``entities`` read so far.
+        self.members: Dict[str, object] = {}
+        self.buffer = ''
+        self.position = 0
+        # Chunks read but not appended to the buffer yet, so that the buffer
+        # is not copied for every chunk.
+        self.pending: List[str] = []
+        self.pending_size = 0
+        self.eof = False
+        self.entities = self.iterate()
+
+    def __next__(self) -> Tuple[str, Mapping[str, object]]:
+        return next(self.entities)
+
+    @property
+    def bytes_read(self) -> int:
+        """(:class:`int`) The number of bytes read so far."""
+        return self.reader.size
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        self.pending.append(chunk)
+        self.pending_size += len(chunk)
+        size = len(self.buffer) - self.position + self.pending_size
+        if self.max_buffer_size is not None and size > self.max_buffer_size:
+            raise StreamError('an entity exceeds the max_buffer_size')
+        return True
+
+    def flush(self) -> None:
+        if self.pending:
+            # Drop what is already consumed as well.
+            self.buffer = self.buffer[self.position:] + ''.join(self.pending)
+            self.position = 0
+            self.pending = []
+            self.pending_size = 0
+
+    def peek(self) -> str:
+        """Skip whitespaces and return the next character, or an empty
+        string at the end.
+
+        """
+        while True:
+            match = WHITESPACE.match(self.buffer, self.position)
+            assert match is not None
+            self.position = match.end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            elif not (self.pending or self.fill()):
+                return ''
+            self.flush()
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise StreamError('expected {0!r}, but got {1!r}'.format(
+                chars, char or 'the end'
+            ))
+        self.position += 1
+        return char
+
+    def read_value(self) -> object:
+        self.peek()
+        retry_size = 0
+        while True:
+            size = len(self.buffer) - self.position + self.pending_size
+            if size >= retry_size or self.eof:
+                self.flush()
+                try:
+                    value, end = self.decoder.raw_decode(self.buffer,
+                                                         self.position)
+                except json.JSONDecodeError as e:
+                    if self.eof:
+                        raise StreamError('malformed response: ' +
+                                          str(e)) from e
+                    retry_size = max(size * 2, 1)
+                else:
+                    # A number at the end of the buffer may continue in
+                    # the next chunk.
+                    if end < len(self.buffer) or self.eof or \
+                       isinstance(value, (Mapping, list, str)):
+                        self.position = end
+                        return value
+                    retry_size = size + 1
+            self.fill()
+
+    def read_key(self) -> str:
+        if self.peek() != '"':
+            raise StreamError('expected a key, but got ' +
+                              repr(self.peek() or 'the end'))
+        key = self.read_value()
+        assert isinstance(key, str)
+        self.expect(':')
+        return key
+
+    def iterate(self) -> Iterator[Tuple[str, Mapping[str, object]]]:
+        for key in self.iterate_keys():
+            if key != 'entities':
+                self.members[key] = self.read_value()
+                continue
+            for entity_id in self.iterate_keys():
+                data = self.read_value()
+                if not isinstance(data, Mapping):
+                    raise StreamError('expected an entity object, not ' +
+                                      repr(data))
+                yield entity_id, data
+        if self.peek():
+            raise StreamError('unexpected trailing data: ' +
+                              repr(self.buffer[self.position:][:20]))
+
+    def iterate_keys(self) -> Iterator[str]:
+        # Read the keys of an object; the caller has to read the value of
+        # each key before the next iteration.
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+            return
+        while True:
+            yield self.read_key()
+            if self.expect(',}') == '}':
+                return
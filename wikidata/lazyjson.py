@@ -0,0 +1,385 @@
+r"""Lazily parsed JSON documents.
+
+Documents of large entities (e.g., countries) take megabytes of JSON, but
+often only a few sections of them (e.g., labels) are read.
+:class:`LazyJsonBackend` parses responses into :class:`LazyObject`\ s,
+which keep the JSON text and parse their members one by one as they are
+looked up, so that sections which are never read are never turned into
+Python objects:
+
+.. code-block:: python
+
+   client = Client(json_backend=LazyJsonBackend())
+   entity = client.get(EntityId('Q8646'), load=True)
+   entity.label  # only type, id, and labels are parsed
+
+By default objects are lazy up to 4 levels, i.e., the response, its
+``entities``, each entity, and each section of entities (``labels``,
+``descriptions``, ``aliases``, ``claims``, ``sitelinks``), so that
+the claims of each property are parsed on demand as well.
+
+Since members are parsed in order, looking up a member parses the members
+preceding it as well; they are kept for later lookups.  Testing whether
+a key is present (e.g., ``'missing' in data`` or ``data.get('redirects')``)
+doesn't parse members, but only scans their keys.
+
+:class:`LazyObject`\ s are pickled as their JSON text, so that caches
+which pickle values (e.g., :class:`~.cache.ProxyCachePolicy`) store
+the original response instead of serializing parsed objects, and their
+hits are lazily parsed as well.
+
+.. versionadded:: 0.10.0
+
+"""
+import json
+import json.decoder
+import re
+from typing import (Callable, Dict, Iterator, Mapping, Optional, Set,
+                    Tuple, Union)
+
+from .jsonbackend import JsonBackend, PairsHook
+
+__all__ = 'LazyJsonBackend', 'LazyObject', 'loads'
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+STRING_OR_BRACKET = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+
+
+def skip_whitespace(text: str, pos: int) -> int:
+    match = WHITESPACE.match(text, pos)
+    assert match is not None
+    return match.end()
+
+
+def skip_value(text: str, pos: int, decoder: json.JSONDecoder) -> int:
+    # Find the end of the JSON value at the given index without turning it
+    # into Python objects, except for scalars.  Since it only matches
+    # brackets and strings, the value has to be parsed later to be sure
+    # it's valid.
+    char = text[pos:pos + 1]
+    if char == '"':
+        match = STRING.match(text, pos)
+        if match is None:
+            raise json.JSONDecodeError('Unterminated string', text, pos)
+        return match.end()
+    elif char not in ('{', '['):
+        _, end = decoder.raw_decode(text, pos)
+        return end
+    depth = 0
+    for match in STRING_OR_BRACKET.finditer(text, pos):
+        token = match.group()
+        if token in ('{', '['):
+            depth += 1
+        elif token in ('}', ']'):
+            depth -= 1
+            if not depth:
+                return match.end()
+    raise json.JSONDecodeError('Unterminated ' + (
+        'object' if char == '{' else 'array'
+    ), text, pos)
+
+
+class LazyObject(Mapping[str, object]):
+    r"""A JSON object whose members are parsed on demand.  It's
+    a read-only :class:`~typing.Mapping`, so it can be used wherever parsed
+    JSON objects are expected.  Use :func:`loads()` to make one.
+
+    Note that lookups parse the JSON text, so a lazy object should not be
+    shared by multiple threads without synchronization.
+
+    :param text: The whole JSON text.
+    :type text: :class:`str`
+    :param start: The index of the opening brace in the ``text``.
+    :type start: :class:`int`
+    :param depth: The number of levels of nested objects to parse lazily,
+                  including this object.  Objects deeper than it are parsed
+                  eagerly.
+    :type depth: :class:`int`
+    :param decoder: The decoder to parse members eagerly.
+    :type decoder: :class:`json.JSONDecoder`
+
+    """
+
+    __slots__ = 'text', 'start', 'end', 'position', 'pending', 'depth', \
+                'decoder', 'parsed', 'remaining_keys'
+
+    def __init__(self,
+                 text: str,
+                 start: int,
+                 depth: int,
+                 decoder: json.JSONDecoder) -> None:
+        if text[start:start + 1] != '{':
+            raise json.JSONDecodeError('Expecting object', text, start)
+        self.text = text
+        self.start = start
+        #: (:class:`~typing.Optional`\ [:class:`int`]) The index after
+        #: the closing brace in :attr:`text`.  :const:`None` until all
+        #: members are parsed.
+        self.end: Optional[int] = None
+        #: (:class:`~typing.Optional`\ [:class:`int`]) The index after
+        #: the last parsed member in :attr:`text`, or :const:`None` if all
+        #: members are parsed.
+        self.position: Optional[int] = start + 1
+        #: The key and value of the last parsed member if it's a lazy object,
+        #: whose end is not known until the next member is parsed.
+        self.pending: Optional[Tuple[str, LazyObject]] = None
+        self.depth = depth
+        self.decoder = decoder
+        #: (:class:`~typing.Dict`\ [:class:`str`, :class:`object`])
+        #: The members parsed so far.
+        self.parsed: Dict[str, object] = {}
+        #: The keys of members which were not parsed yet when they were
+        #: scanned by :meth:`scan_keys()`.  :const:`None` until then.
+        self.remaining_keys: Optional[Set[str]] = None
+
+    def advance(self) -> Optional[str]:
+        r"""Parse the next member.  Nested objects are not parsed until
+        they are looked up or a member after them is parsed.  In the latter
+        case, if nothing is looked up in a nested object yet, it's replaced
+        by a :class:`dict` parsed at once.  Otherwise, it's only skipped
+        and remains lazy, since it's probably referred to from elsewhere.
+
+        :return: The key of the parsed member, or :const:`None` if all
+                 members are parsed.
+        :rtype: :class:`~typing.Optional`\ [:class:`str`]
+        :raise json.JSONDecodeError: When the JSON text is invalid.
+
+        """
+        if self.position is None:
+            return None
+        text = self.text
+        if self.pending is not None:
+            key, child = self.pending
+            self.pending = None
+            if child.parsed or child.remaining_keys is not None:
+                self.position = skip_value(text, child.start, self.decoder)
+            else:
+                # Nothing is looked up in the child yet, so parse it eagerly,
+                # which is much faster than parsing it member by member.
+                self.parsed[key], self.position = self.decoder.raw_decode(
+                    text, child.start
+                )
+        pos = skip_whitespace(text, self.position)
+        char = text[pos:pos + 1]
+        if char == '}':
+            self.end = pos + 1
+            self.position = None
+            return None
+        elif self.parsed:
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter",
+                                           text, pos)
+            pos = skip_whitespace(text, pos + 1)
+            char = text[pos:pos + 1]
+        if char != '"':
+            raise json.JSONDecodeError(
+                'Expecting property name enclosed in double quotes',
+                text, pos
+            )
+        key, pos = json.decoder.scanstring(  # type: ignore
+            text, pos + 1
+        )
+        pos = skip_whitespace(text, pos)
+        if text[pos:pos + 1] != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+        pos = skip_whitespace(text, pos + 1)
+        value: object
+        if self.depth > 1 and text[pos:pos + 1] == '{':
+            value = LazyObject(text, pos, self.depth - 1, self.decoder)
+            self.pending = key, value
+        else:
+            value, pos = self.decoder.raw_decode(text, pos)
+        self.position = pos
+        self.parsed[key] = value
+        return key
+
+    def finish(self) -> int:
+        """Parse all the remaining members.
+
+        :return: The index after the closing brace in :attr:`text`.
+        :rtype: :class:`int`
+        :raise json.JSONDecodeError: When the JSON text is invalid.
+
+        """
+        while self.advance() is not None:
+            pass
+        assert self.end is not None
+        return self.end
+
+    def scan_keys(self) -> Set[str]:
+        r"""Scan the keys of the members not parsed yet, without parsing
+        their values.  Scanned keys are kept until all members are parsed.
+
+        :return: The keys of the members not parsed yet.
+        :rtype: :class:`~typing.Set`\ [:class:`str`]
+        :raise json.JSONDecodeError: When the JSON text is invalid.
+
+        """
+        if self.remaining_keys is not None:
+            return self.remaining_keys
+        keys: Set[str] = set()
+        if self.position is None:
+            return keys
+        text = self.text
+        if self.pending is not None:
+            pos = skip_value(text, self.pending[1].start, self.decoder)
+        else:
+            pos = self.position
+        first = not self.parsed
+        while True:
+            pos = skip_whitespace(text, pos)
+            char = text[pos:pos + 1]
+            if char == '}':
+                break
+            elif not first:
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter",
+                                               text, pos)
+                pos = skip_whitespace(text, pos + 1)
+                char = text[pos:pos + 1]
+            first = False
+            if char != '"':
+                raise json.JSONDecodeError(
+                    'Expecting property name enclosed in double quotes',
+                    text, pos
+                )
+            key, pos = json.decoder.scanstring(  # type: ignore
+                text, pos + 1
+            )
+            pos = skip_whitespace(text, pos)
+            if text[pos:pos + 1] != ':':
+                raise json.JSONDecodeError("Expecting ':' delimiter",
+                                           text, pos)
+            pos = skip_value(text, skip_whitespace(text, pos + 1),
+                             self.decoder)
+            keys.add(key)
+        self.remaining_keys = keys
+        return keys
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.parsed or \
+            self.position is not None and key in self.scan_keys()
+
+    def get(self, key: str, default: object = None) -> object:
+        if key in self:
+            return self[key]
+        return default
+
+    def __getitem__(self, key: str) -> object:
+        try:
+            return self.parsed[key]
+        except KeyError:
+            pass
+        if self.remaining_keys is not None and \
+           key not in self.remaining_keys:
+            raise KeyError(key)
+        while self.position is not None:
+            if self.advance() == key:
+                return self.parsed[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        parsed = self.parsed
+        count = 0
+        while True:
+            if len(parsed) > count:
+                # Members parsed before iterating or between iterations.
+                keys = list(parsed)[count:]
+                count += len(keys)
+                yield from keys
+                continue
+            key = self.advance()
+            if key is None:
+                return
+            if len(parsed) > count:
+                count += 1
+                yield key
+
+    def __len__(self) -> int:
+        self.finish()
+        return len(self.parsed)
+
+    def __bool__(self) -> bool:
+        return bool(self.parsed) or self.advance() is not None
+
+    def dumps(self) -> str:
+        """Get the JSON text of the object.  Unlike serializing parsed
+        members, it's only a slice of the original text, although members
+        are parsed to find the end of the object unless it's the outermost.
+
+        :return: The JSON text.
+        :rtype: :class:`str`
+        :raise json.JSONDecodeError: When the JSON text is invalid.
+
+        """
+        if self.start == 0 and self.end is None:
+            return self.text
+        return self.text[self.start:self.finish()]
+
+    def __reduce__(self) -> Tuple[Callable[..., object], Tuple[object, ...]]:
+        return loads, (self.dumps(), self.depth,
+                       self.decoder.object_pairs_hook)
+
+    def __repr__(self) -> str:
+        return '<{0.__module__}.{0.__qualname__} {1} parsed{2}>'.format(
+            type(self), sorted(self.parsed),
+            '' if self.position is None else ', ...'
+        )
+
+
+def loads(data: Union[bytes, str],
+          depth: int = 4,
+          object_pairs_hook: Optional[PairsHook] = None) -> object:
+    r"""Parse the given JSON ``data`` lazily.  If it's an object,
+    a :class:`LazyObject` is returned.  Otherwise, it's parsed eagerly.
+
+    :param data: The JSON document.  :class:`bytes` have to be encoded in
+                 UTF-8.
+    :type data: :class:`~typing.Union`\ [:class:`bytes`, :class:`str`]
+    :param depth: The number of levels of nested objects to parse lazily,
+                  including the outermost one.  4 by default.
+    :type depth: :class:`int`
+    :param object_pairs_hook: The function to turn pairs of eagerly parsed
+                              objects into Python objects, in the same
+                              manner as :func:`json.loads()`.  It's not
+                              applied to :class:`LazyObject`\ s.
+    :type object_pairs_hook: :const:`~.jsonbackend.PairsHook`
+    :return: The parsed value.
+    :rtype: :class:`object`
+    :raise json.JSONDecodeError: When the top-level of the ``data`` is not
+                                 a valid JSON.  Errors inside objects are
+                                 raised when the members are looked up.
+
+    """
+    text = data.decode('utf-8') if isinstance(data, bytes) else data
+    decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+    if depth < 1 or not text.lstrip(' \t\n\r').startswith('{'):
+        return decoder.decode(text)
+    if text[:1] != '{':
+        text = text.strip(' \t\n\r')
+    return LazyObject(text, 0, depth, decoder)
+
+
+class LazyJsonBackend(JsonBackend):
+    r"""JSON backend which parses responses into :class:`LazyObject`\ s.
+
+    :param depth: The number of levels of nested objects to parse lazily,
+                  including the outermost one.  4 by default.
+    :type depth: :class:`int`
+
+    """
+
+    def __init__(self, depth: int = 4) -> None:
+        self.depth = depth
+
+    def loads(self,
+              data: bytes,
+              object_pairs_hook: Optional[PairsHook] = None) -> object:
+        return loads(data, self.depth, object_pairs_hook)
+
+    def __repr__(self) -> str:
+        return '{0.__module__}.{0.__qualname__}(depth={1!r})'.format(
+            type(self), self.depth
+        )
@@ -1,7 +1,22 @@
 import collections.abc
-from typing import Iterator, Mapping, NewType, Type, Union, cast
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NewType,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-__all__ = 'Locale', 'MonolingualText', 'MultilingualText'
+__all__ = ('DEFAULT_FALLBACK', 'MEDIAWIKI_FALLBACK_CHAINS', 'LanguageFallback',
+           'Locale', 'MonolingualText', 'MultilingualText', 'TermValues')
 
 
 #: The locale of each :class:`MonolingualText` or internal
@@ -11,12 +26,372 @@ __all__ = 'Locale', 'MonolingualText', 'MultilingualText'
 Locale = NewType('Locale', str)
 
 
+#: (:class:`~typing.Mapping`\ [:class:`str`, :class:`~typing.Sequence`\
+#: [:class:`str`]]) Language fallback chains taken from MediaWiki's
+#: ``languages/messages/Messages*.php`` files.  Only languages that have
+#: fallbacks other than English are listed, and English, the last resort of
+#: every chain, is omitted.
+#:
+#: .. versionadded:: 0.10.0
+MEDIAWIKI_FALLBACK_CHAINS: Mapping[str, Sequence[str]] = {
+    'ab': ['ru'],
+    'ace': ['id'],
+    'als': ['gsw', 'de'],
+    'an': ['es'],
+    'arz': ['ar'],
+    'ary': ['ar'],
+    'ast': ['es'],
+    'ba': ['ru'],
+    'bar': ['de'],
+    'bat-smg': ['sgs', 'lt'],
+    'be': ['ru'],
+    'be-tarask': ['be'],
+    'bh': ['bho'],
+    'br': ['fr'],
+    'ce': ['ru'],
+    'co': ['it'],
+    'cv': ['ru'],
+    'de-at': ['de'],
+    'de-ch': ['de'],
+    'de-formal': ['de'],
+    'en-ca': ['en'],
+    'en-gb': ['en'],
+    'es-formal': ['es'],
+    'ext': ['es'],
+    'frp': ['fr'],
+    'gan': ['gan-hant', 'zh-hant', 'zh-hans'],
+    'gl': ['pt'],
+    'gsw': ['de'],
+    'hif': ['hif-latn'],
+    'hsb': ['dsb', 'de'],
+    'dsb': ['hsb', 'de'],
+    'ko-kp': ['ko'],
+    'ksh': ['de'],
+    'lb': ['de'],
+    'li': ['nl'],
+    'lzh': ['zh-hant'],
+    'nb': ['no', 'nn'],
+    'nds': ['nds-de', 'de'],
+    'nds-nl': ['nl'],
+    'nl-informal': ['nl'],
+    'nn': ['no', 'nb'],
+    'no': ['nb'],
+    'oc': ['ca', 'fr'],
+    'os': ['ru'],
+    'pfl': ['de'],
+    'pt': ['pt-br'],
+    'pt-br': ['pt'],
+    'rue': ['uk', 'ru'],
+    'sah': ['ru'],
+    'sgs': ['lt'],
+    'sli': ['de'],
+    'sr': ['sr-ec'],
+    'stq': ['de'],
+    'szl': ['pl'],
+    'tt': ['tt-cyrl', 'ru'],
+    'tt-cyrl': ['ru'],
+    'uk': ['ru'],
+    'vls': ['nl'],
+    'wuu': ['zh-hans'],
+    'yue': ['zh-hk', 'zh-hant', 'zh-hans'],
+    'zea': ['nl'],
+    'zh': ['zh-hans'],
+    'zh-classical': ['lzh', 'zh-hant'],
+    'zh-cn': ['zh-hans'],
+    'zh-hant': ['zh-hans'],
+    'zh-hk': ['zh-hant', 'zh-hans'],
+    'zh-min-nan': ['nan'],
+    'zh-mo': ['zh-hk', 'zh-hant', 'zh-hans'],
+    'zh-my': ['zh-sg', 'zh-hans'],
+    'zh-sg': ['zh-hans'],
+    'zh-tw': ['zh-hant', 'zh-hans'],
+    'zh-yue': ['yue', 'zh-hk', 'zh-hant', 'zh-hans'],
+}
+
+
+class LanguageFallback:
+    r"""Resolve which locale of a :class:`MultilingualText` to show, by
+    trying the preferred locales and their fallback chains in order.
+    The chain is compiled once when it's constructed, so that resolving
+    takes at most a lookup per locale in the chain:
+
+    >>> fallback = LanguageFallback(['zh-tw'])
+    >>> fallback.locales
+    ('zh-tw', 'zh-hant', 'zh-hans', 'en')
+    >>> fallback.resolve(MultilingualText({'en': 'Seoul', 'zh-hant': '首爾'}))
+    'zh-hant'
+
+    Chains can be customized by ``chains``:
+
+    >>> LanguageFallback(['zh-hant'], {'zh-hant': ['zh-tw', 'zh']}).locales
+    ('zh-hant', 'zh-tw', 'zh', 'en')
+
+    If none of the chain is available, a variant of the first preferred
+    language (e.g., ``en-gb`` for ``en``) and then any available locale
+    is chosen.
+
+    :param preferred: The preferred locales, in order of preference.
+                      English by default.
+    :type preferred: :class:`~typing.Iterable`\ [:class:`str`]
+    :param chains: The fallback chains of each locale.
+                   :const:`MEDIAWIKI_FALLBACK_CHAINS` by default.
+                   Fallbacks of fallbacks are followed as well.
+    :type chains: :class:`~typing.Mapping`\ [:class:`str`,
+                  :class:`~typing.Sequence`\ [:class:`str`]]
+    :param last_resort: The locales to try after all the chains, as
+                        MediaWiki does with English.  English by default.
+    :type last_resort: :class:`~typing.Iterable`\ [:class:`str`]
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    __slots__ = 'locales', 'variant_prefixes'
+
+    #: (:class:`~typing.Tuple`\ [:class:`Locale`, ...]) The compiled
+    #: chain of locales to try, in order.
+    locales: Tuple[Locale, ...]
+
+    variant_prefixes: Tuple[str, ...]
+
+    def __init__(self,
+                 preferred: Iterable[str] = ('en',),
+                 chains: Mapping[str, Sequence[str]] =
+                 MEDIAWIKI_FALLBACK_CHAINS,
+                 last_resort: Iterable[str] = ('en',)) -> None:
+        locales: List[Locale] = []
+        seen: Set[str] = set()
+
+        def visit(locale: str) -> None:
+            if locale in seen:
+                return
+            seen.add(locale)
+            locales.append(Locale(locale))
+            for fallback in chains.get(locale, ()):
+                visit(fallback)
+        preferred = list(preferred)
+        for locale in preferred:
+            visit(locale)
+        for locale in last_resort:
+            visit(locale)
+        self.locales = tuple(locales)
+        if preferred:
+            language = preferred[0].split('-', 1)[0].split('_', 1)[0]
+            self.variant_prefixes = language + '-', language + '_'
+        else:
+            self.variant_prefixes = ()
+
+    def resolve(self, texts: Mapping[Locale, str]) -> Optional[Locale]:
+        r"""Resolve the locale to show from the given ``texts``.
+
+        :param texts: The texts, e.g., a :class:`MultilingualText`.
+        :type texts: :class:`~typing.Mapping`\ [:class:`Locale`,
+                     :class:`str`]
+        :return: The resolved locale, or :const:`None` if ``texts`` is
+                 empty.
+        :rtype: :class:`~typing.Optional`\ [:class:`Locale`]
+
+        """
+        if isinstance(texts, MultilingualText):
+            texts = texts.texts
+        for locale in self.locales:
+            if locale in texts:
+                return locale
+        last = None
+        for locale in texts:
+            if self.variant_prefixes and \
+               locale.startswith(self.variant_prefixes):
+                return locale
+            last = locale
+        return last
+
+    def __repr__(self) -> str:
+        return '<{0.__module__}.{0.__qualname__} {1}>'.format(
+            type(self), ' -> '.join(self.locales)
+        )
+
+
+#: (:class:`LanguageFallback`) The default fallback, which prefers English.
+#:
+#: .. versionadded:: 0.10.0
+DEFAULT_FALLBACK = LanguageFallback()
+
+
+class TermValues(collections.abc.Mapping):
+    r"""Read-only view of raw terms, e.g., ``labels`` of entity data, as
+    a :class:`~typing.Mapping`\ [:class:`Locale`, :class:`str`].  Values
+    are taken out of the raw terms on demand.
+
+    Terms are keyed by their ``language``, and terms without it are
+    omitted.  A term whose key is its language is looked up without
+    copying anything; looking up other locales (e.g., a miss) or iterating
+    indexes all terms by their languages once.
+
+    :param terms: The raw terms, e.g., ``{'en': {'language': 'en',
+                  'value': 'Seoul'}}``.
+    :type terms: :class:`~typing.Mapping`\ [:class:`str`,
+                 :class:`~typing.Mapping`\ [:class:`str`, :class:`str`]]
+
+    .. versionadded:: 0.10.0
+
+    """
+
+    __slots__ = 'terms', 'index'
+
+    def __init__(self, terms: Mapping[str, Mapping[str, str]]) -> None:
+        self.terms = terms
+        self.index: Optional[Dict[Locale, str]] = None
+
+    def get_index(self) -> Dict[Locale, str]:
+        index = self.index
+        if index is None:
+            pairs = (
+                (item['language'], item['value'])
+                for item in self.terms.values()
+            )
+            index = self.index = {Locale(k): v for k, v in pairs if k}
+        return index
+
+    def __iter__(self) -> Iterator[Locale]:
+        return iter(self.get_index())
+
+    def __len__(self) -> int:
+        return len(self.get_index())
+
+    def __contains__(self, locale: object) -> bool:
+        try:
+            self[cast(Locale, locale)]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, locale: Locale) -> str:
+        if self.index is None:
+            try:
+                term = self.terms[locale]
+            except KeyError:
+                pass
+            else:
+                if locale and term['language'] == locale:
+                    return term['value']
+        return self.get_index()[locale]
+
+
 class MultilingualText(collections.abc.Mapping):
+    r"""Texts in multiple languages, e.g., labels of an entity.  It's
+    a :class:`~typing.Mapping`\ [:class:`Locale`, :class:`str`], and
+    converting it to :class:`str` shows the text in the locale resolved
+    by its :attr:`fallback`.
+
+    :param texts: The texts by locale.
+    :type texts: :class:`~typing.Mapping`\ [:class:`~typing.Union`\
+                 [:class:`Locale`, :class:`str`], :class:`str`]
+    :param fallback: The language fallback to resolve the locale to show.
+                     :const:`DEFAULT_FALLBACK` (English) by default.
+    :type fallback: :class:`LanguageFallback`
+
+    .. versionadded:: 0.10.0
+       The ``fallback`` option.
+
+    """
+
+    __slots__ = 'texts', 'fallback', 'resolved'
+
+    texts: Mapping[Locale, str]
+
+    #: (:class:`LanguageFallback`) The language fallback to resolve
+    #: the locale to show.
+    #:
+    #: .. versionadded:: 0.10.0
+    fallback: LanguageFallback
 
-    __slots__ = 'texts',
+    # The pair of the last used fallback and the locale it resolved.
+    resolved: Optional[Tuple[LanguageFallback, Optional[Locale]]]
 
-    def __init__(self, texts: Mapping[Union[Locale, str], str]) -> None:
+    def __init__(self,
+                 texts: Mapping[Union[Locale, str], str],
+                 fallback: LanguageFallback = DEFAULT_FALLBACK) -> None:
         self.texts = {Locale(lc): t for lc, t in texts.items()}
+        self.fallback = fallback
+        self.resolved = None
+
+    @classmethod
+    def from_terms(
+        cls,
+        terms: Mapping[str, Mapping[str, str]],
+        fallback: LanguageFallback = DEFAULT_FALLBACK
+    ) -> 'MultilingualText':
+        r"""Create a lazy view over the raw ``terms``, e.g., ``labels`` of
+        entity data, instead of copying all of them.  Texts are taken out
+        of the raw terms only when they are looked up.
+
+        :param terms: The raw terms, e.g., ``{'en': {'language': 'en',
+                      'value': 'Seoul'}}``.  See also :class:`TermValues`.
+        :type terms: :class:`~typing.Mapping`\ [:class:`str`,
+                     :class:`~typing.Mapping`\ [:class:`str`, :class:`str`]]
+        :param fallback: The language fallback to resolve the locale to
+                         show.  :const:`DEFAULT_FALLBACK` by default.
+        :type fallback: :class:`LanguageFallback`
+        :return: The multilingual text.
+        :rtype: :class:`MultilingualText`
+
+        .. versionadded:: 0.10.0
+
+        """
+        self = cls.__new__(cls)
+        self.texts = TermValues(terms)
+        self.fallback = fallback
+        self.resolved = None
+        return self
+
+    def resolve_locale(
+        self,
+        fallback: Optional[LanguageFallback] = None
+    ) -> Optional[Locale]:
+        r"""Resolve the locale to show.  The result is cached, so that
+        resolving again with the same ``fallback`` takes no lookup.
+
+        :param fallback: The language fallback to use instead of
+                         :attr:`fallback`.
+        :type fallback: :class:`~typing.Optional`\ [:class:`LanguageFallback`]
+        :return: The resolved locale, or :const:`None` if it's empty.
+        :rtype: :class:`~typing.Optional`\ [:class:`Locale`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        if fallback is None:
+            fallback = self.fallback
+        resolved = self.resolved
+        if resolved is not None and resolved[0] is fallback:
+            return resolved[1]
+        locale = fallback.resolve(self.texts)
+        self.resolved = fallback, locale
+        return locale
+
+    def resolve(
+        self,
+        fallback: Optional[LanguageFallback] = None
+    ) -> Optional['MonolingualText']:
+        r"""Get the text to show along with its locale.
+
+        >>> text = MultilingualText({'en': 'Seoul', 'zh-hant': '首爾'})
+        >>> text.resolve(LanguageFallback(['zh-hk']))
+        '(zh-hant:) 首爾'[11:]
+
+        :param fallback: The language fallback to use instead of
+                         :attr:`fallback`.
+        :type fallback: :class:`~typing.Optional`\ [:class:`LanguageFallback`]
+        :return: The resolved text, or :const:`None` if it's empty.
+        :rtype: :class:`~typing.Optional`\ [:class:`MonolingualText`]
+
+        .. versionadded:: 0.10.0
+
+        """
+        locale = self.resolve_locale(fallback)
+        if locale is None:
+            return None
+        return MonolingualText(self.texts[locale], locale)
 
     def __iter__(self) -> Iterator[Locale]:
         for locale in self.texts:
@@ -35,14 +410,10 @@ class MultilingualText(collections.abc.Mapping):
         return bool(self.texts)
 
     def __str__(self) -> str:
-        try:
-            return self.texts[Locale('en')]
-        except KeyError:
-            value = ''
-            for lang, value in self.texts.items():
-                if lang.startswith('en_'):
-                    return value
-            return value
+        locale = self.resolve_locale()
+        if locale is None:
+            return ''
+        return self.texts[locale]
 
     def __repr__(self) -> str:
         if self:
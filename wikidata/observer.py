@@ -0,0 +1,358 @@
+"""Instrumentation of API requests made by :class:`~.client.Client`.
+
+Observers passed to the ``observers`` option of :class:`~.client.Client`
+are notified when :meth:`Client.request() <.client.Client.request>` starts,
+finishes, or fails, with a :class:`RequestEvent` which carries the url,
+the cache key and outcome, the HTTP status, the response size, the time
+taken, and which entities triggered the request.
+
+:class:`RequestMetrics` is a ready-made observer which aggregates them into
+counters and histograms:
+
+.. code-block:: python
+
+   metrics = RequestMetrics()
+   client = Client(observers=[metrics])
+   ...
+   metrics.latency.percentile(0.99)
+   export(metrics.snapshot())
+
+.. versionadded:: 0.10.0
+
+"""
+import bisect
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cache import CacheKey
+from .entity import EntityId
+
+__all__ = ('DEFAULT_LATENCY_BUCKETS', 'DEFAULT_SIZE_BUCKETS', 'Histogram',
+           'RequestEvent', 'RequestMetrics', 'RequestObserver')
+
+
+class RequestEvent:
+    r"""What happened to a request.  The same event object is passed to
+    :meth:`RequestObserver.on_start()` and then to either
+    :meth:`RequestObserver.on_finish()` or
+    :meth:`RequestObserver.on_error()`, being filled as the request goes on.
+
+    .. attribute:: url
+
+       (:class:`str`) The requested url.
+
+    .. attribute:: cache_key
+
+       (:const:`~.cache.CacheKey`) The key to look up the cache.
+
+    .. attribute:: entity_ids
+
+       (:class:`~typing.Sequence`\ [:class:`~.entity.EntityId`]) The ids of
+       entities which triggered the request, if any.
+
+    .. attribute:: batched
+
+       (:class:`bool`) Whether the request loads entities in a batch, e.g.,
+       by :meth:`Client.load_entities()
+       <wikidata.client.Client.load_entities>`, even if only an entity is
+       left in the batch.
+
+    .. attribute:: started_at
+
+       (:class:`float`) When the request started, in seconds of
+       :func:`time.perf_counter()`.
+
+    .. attribute:: elapsed
+
+       (:class:`~typing.Optional`\ [:class:`float`]) The seconds taken.
+       :const:`None` until it finishes.
+
+    .. attribute:: cache_hit
+
+       (:class:`~typing.Optional`\ [:class:`bool`]) Whether the result was
+       cached.  :const:`None` until the cache is looked up.
+
+    .. attribute:: status
+
+       (:class:`~typing.Optional`\ [:class:`int`]) The HTTP status code.
+       :const:`None` on cache hits or if no response was received.
+
+    .. attribute:: size
+
+       (:class:`~typing.Optional`\ [:class:`int`]) The size of the response
+       body in bytes.  :const:`None` on cache hits or if no response was
+       received.
+
+    .. attribute:: error
+
+       (:class:`~typing.Optional`\ [:class:`BaseException`]) The error
+       raised by the request, if any.
+
+    """
+
+    __slots__ = ('url', 'cache_key', 'entity_ids', 'batched', 'started_at',
+                 'elapsed', 'cache_hit', 'status', 'size', 'error')
+
+    def __init__(self,
+                 url: str,
+                 cache_key: CacheKey,
+                 entity_ids: Sequence[EntityId] = (),
+                 batched: bool = False) -> None:
+        self.url = url
+        self.cache_key = cache_key
+        self.entity_ids = entity_ids
+        self.batched = batched
+        self.started_at = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self.cache_hit: Optional[bool] = None
+        self.status: Optional[int] = None
+        self.size: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    def finish(self) -> None:
+        """Record the time taken so far as :attr:`elapsed`."""
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def __repr__(self) -> str:
+        return '<{0.__module__}.{0.__qualname__} {1!r}>'.format(
+            type(self), self.url
+        )
+
+
+class RequestObserver:
+    """The interface of request observers.  All methods do nothing by
+    default, so that subclasses can override only what they need.
+
+    Exceptions raised by observers are not suppressed, so observers have
+    to be cheap and not fail.
+
+    """
+
+    def on_start(self, event: RequestEvent) -> None:
+        """Called when a request starts, before the cache is looked up.
+
+        :param event: The event of the request.
+        :type event: :class:`RequestEvent`
+
+        """
+
+    def on_finish(self, event: RequestEvent) -> None:
+        """Called when a request successfully finishes, either from
+        the cache or from the server.
+
+        :param event: The event of the request.
+        :type event: :class:`RequestEvent`
+
+        """
+
+    def on_error(self, event: RequestEvent) -> None:
+        """Called when a request fails.  :attr:`RequestEvent.error` is set.
+        Note that ``400 Bad Request`` errors for invalid entity ids are
+        reported here as well, even though :meth:`Client.request()
+        <.client.Client.request>` returns :const:`None` for them.
+
+        :param event: The event of the request.
+        :type event: :class:`RequestEvent`
+
+        """
+
+
+#: (:class:`~typing.Tuple`\ [:class:`float`, ...]) The default bucket
+#: boundaries of :attr:`RequestMetrics.latency`, in seconds.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0, 30.0,
+)
+
+#: (:class:`~typing.Tuple`\ [:class:`float`, ...]) The default bucket
+#: boundaries of :attr:`RequestMetrics.size`, in bytes.
+DEFAULT_SIZE_BUCKETS: Tuple[float, ...] = tuple(
+    float(2 ** n) for n in range(10, 26, 2)
+)
+
+
+class Histogram:
+    r"""Histogram with fixed bucket boundaries, in the same manner as
+    Prometheus: each bucket counts observations less than or equal to its
+    upper boundary, and the last bucket is unbounded.
+
+    :param boundaries: The upper boundaries of buckets, in ascending order.
+    :type boundaries: :class:`~typing.Sequence`\ [:class:`float`]
+
+    """
+
+    def __init__(self, boundaries: Sequence[float]) -> None:
+        #: (:class:`~typing.Tuple`\ [:class:`float`, ...]) The upper
+        #: boundaries of buckets.
+        self.boundaries = tuple(boundaries)
+        #: (:class:`~typing.List`\ [:class:`int`]) The number of observations
+        #: per bucket (not cumulative).  It has one more element than
+        #: :attr:`boundaries`, for values greater than all boundaries.
+        self.counts = [0] * (len(self.boundaries) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """Add an observed ``value``."""
+        self.counts[bisect.bisect_left(self.boundaries, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        r"""(:class:`~typing.Optional`\ [:class:`float`]) The mean of
+        observations, or :const:`None` if nothing is observed.
+
+        """
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        r"""Estimate the ``q``-quantile of observations by linear
+        interpolation within the bucket it falls into.
+
+        :param q: The quantile between 0 and 1, e.g., 0.99.
+        :type q: :class:`float`
+        :return: The estimated value, or :const:`None` if nothing is
+                 observed.
+        :rtype: :class:`~typing.Optional`\ [:class:`float`]
+
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1, not ' + repr(q))
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.boundaries[i - 1] if i else self.min
+                upper = self.boundaries[i] if i < len(self.boundaries) \
+                    else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+    def snapshot(self) -> Dict[str, object]:
+        r"""Export the histogram as a plain :class:`dict` with ``count``,
+        ``sum``, ``min``, ``max``, ``buckets`` (pairs of upper boundary and
+        cumulative count), and ``p50``/``p90``/``p99``.
+
+        :return: The exported histogram.
+        :rtype: :class:`~typing.Dict`\ [:class:`str`, :class:`object`]
+
+        """
+        buckets: List[Tuple[float, int]] = []
+        cumulative = 0
+        for boundary, count in zip(self.boundaries + (math.inf,),
+                                   self.counts):
+            cumulative += count
+            buckets.append((boundary, cumulative))
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'buckets': buckets,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+        }
+
+
+class RequestMetrics(RequestObserver):
+    r"""Observer which aggregates requests in process into counters and
+    histograms.  Use :meth:`snapshot()` to export them to a monitoring
+    system.
+
+    :param latency_buckets: The bucket boundaries of :attr:`latency`
+                            in seconds.  :const:`DEFAULT_LATENCY_BUCKETS`
+                            by default.
+    :type latency_buckets: :class:`~typing.Sequence`\ [:class:`float`]
+    :param size_buckets: The bucket boundaries of :attr:`size` in bytes.
+                         :const:`DEFAULT_SIZE_BUCKETS` by default.
+    :type size_buckets: :class:`~typing.Sequence`\ [:class:`float`]
+
+    """
+
+    def __init__(self,
+                 latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                 size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_read = 0
+        #: (:class:`~typing.Dict`\ [:class:`int`, :class:`int`]) The number
+        #: of responses per HTTP status code.
+        self.statuses: Dict[int, int] = {}
+        #: (:class:`Histogram`) Latency of all requests in seconds.
+        self.latency = Histogram(latency_buckets)
+        #: (:class:`Histogram`) Latency of requests missed the cache, i.e.,
+        #: requests made to the server, in seconds.
+        self.fetch_latency = Histogram(latency_buckets)
+        #: (:class:`Histogram`) Response sizes in bytes.
+        self.size = Histogram(size_buckets)
+
+    def on_start(self, event: RequestEvent) -> None:
+        self.requests += 1
+
+    def on_finish(self, event: RequestEvent) -> None:
+        self.record(event)
+
+    def on_error(self, event: RequestEvent) -> None:
+        self.errors += 1
+        self.record(event)
+
+    def record(self, event: RequestEvent) -> None:
+        if event.cache_hit:
+            self.cache_hits += 1
+        elif event.cache_hit is not None:
+            self.cache_misses += 1
+        if event.status is not None:
+            self.statuses[event.status] = \
+                self.statuses.get(event.status, 0) + 1
+        if event.size is not None:
+            self.bytes_read += event.size
+            self.size.observe(event.size)
+        if event.elapsed is not None:
+            self.latency.observe(event.elapsed)
+            if not event.cache_hit:
+                self.fetch_latency.observe(event.elapsed)
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        r"""(:class:`~typing.Optional`\ [:class:`float`]) The ratio of cache
+        hits to cache lookups, or :const:`None` if nothing is looked up.
+
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else None
+
+    def snapshot(self) -> Dict[str, object]:
+        r"""Export the metrics as a plain :class:`dict`.
+
+        :return: The exported metrics.
+        :rtype: :class:`~typing.Dict`\ [:class:`str`, :class:`object`]
+
+        """
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_ratio': self.cache_hit_ratio,
+            'bytes_read': self.bytes_read,
+            'statuses': dict(self.statuses),
+            'latency': self.latency.snapshot(),
+            'fetch_latency': self.fetch_latency.snapshot(),
+            'size': self.size.snapshot(),
+        }
@@ -10,10 +10,12 @@ class Quantity:
     about the uncertainty interval of this number, and a unit of measurement.
     """
 
-    amount = None  # type: float
-    lower_bound = None  # type: Optional[float]
-    upper_bound = None  # type: Optional[float]
-    unit = None  # type: Optional[Entity]
+    __slots__ = 'amount', 'lower_bound', 'upper_bound', 'unit'
+
+    amount: float
+    lower_bound: Optional[float]
+    upper_bound: Optional[float]
+    unit: Optional[Entity]
 
     def __init__(self,
                  amount: float,
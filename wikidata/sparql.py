@@ -0,0 +1,268 @@
+"""Streaming decoder of `SPARQL query results`__ from the `Wikidata Query
+Service`__.  Use :meth:`Client.sparql() <wikidata.client.Client.sparql>`
+rather than functions in this module directly.
+
+Results are read incrementally, so that a large result set is never
+buffered as a whole.  Both JSON and TSV formats are supported.
+
+__ https://www.w3.org/TR/sparql11-results-json/
+__ https://query.wikidata.org/
+
+.. versionadded:: 0.10.0
+
+"""
+import datetime
+import json
+import re
+from typing import (
+    Dict,
+    IO,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from .entity import EntityId
+from .jsonstream import read_text
+
+if TYPE_CHECKING:
+    from .client import Client  # noqa: F401
+
+__all__ = ('ENTITY_URI_PREFIX', 'SparqlError', 'decode_term',
+           'iter_json_bindings', 'iter_tsv_bindings')
+
+
+#: (:class:`str`) The prefix of entity URIs.
+ENTITY_URI_PREFIX = 'http://www.wikidata.org/entity/'
+
+XSD = 'http://www.w3.org/2001/XMLSchema#'
+WKT_LITERAL = 'http://www.opengis.net/ont/geosparql#wktLiteral'
+WKT_POINT_RE = re.compile(
+    r'^\s*(?:<(?P<globe>[^>]+)>\s*)?'
+    r'Point\(\s*(?P<longitude>\S+)\s+(?P<latitude>\S+)\s*\)\s*$',
+    re.IGNORECASE
+)
+ENTITY_ID_RE = re.compile(r'^[A-Z]\d+$')
+BINDINGS_RE = re.compile(r'"bindings"\s*:\s*\[')
+
+
+class SparqlError(ValueError):
+    """Exception raised when SPARQL query results are malformed."""
+
+
+def iter_json_bindings(fp: IO[bytes]) -> Iterator[Dict[str, Dict[str, str]]]:
+    r"""Read bindings from SPARQL query results in JSON, one by one.
+    Only a binding is buffered at a time.
+
+    :param fp: The binary file object of the results.
+    :type fp: :class:`~typing.IO`\ [:class:`bytes`]
+    :return: The bindings, i.e., mappings of variable names to RDF terms.
+    :rtype: :class:`~typing.Iterator`\ [:class:`~typing.Dict`\
+            [:class:`str`, :class:`~typing.Dict`\ [:class:`str`,
+            :class:`str`]]]
+    :raise SparqlError: When the results are malformed.
+
+    """
+    chunks = read_text(fp)
+    decoder = json.JSONDecoder()
+    buffer = ''
+
+    def fill() -> bool:
+        nonlocal buffer
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buffer += chunk
+        return True
+
+    while True:
+        match = BINDINGS_RE.search(buffer)
+        if match:
+            buffer = buffer[match.end():]
+            break
+        elif not fill():
+            raise SparqlError('no "bindings" found')
+    while True:
+        stripped = buffer.lstrip(' \t\r\n,')
+        if not stripped:
+            buffer = ''
+            if fill():
+                continue
+            raise SparqlError('unexpected end of results')
+        buffer = stripped
+        if buffer[0] == ']':
+            return
+        try:
+            binding, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if fill():
+                continue
+            raise SparqlError('malformed binding: ' + str(e)) from e
+        buffer = buffer[end:]
+        if not isinstance(binding, dict):
+            raise SparqlError('expected a binding object, not ' +
+                              repr(binding))
+        yield binding
+
+
+TSV_ESCAPES = {
+    't': '\t', 'b': '\b', 'n': '\n', 'r': '\r', 'f': '\f',
+    '"': '"', "'": "'", '\\': '\\',
+}
+TSV_LITERAL_RE = re.compile(
+    r'^"(?P<value>(?:[^"\\]|\\.)*)"'
+    r'(?:@(?P<lang>[A-Za-z0-9-]+)|\^\^<(?P<datatype>[^>]*)>)?$',
+    re.DOTALL
+)
+TSV_ESCAPE_RE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+
+
+def unescape_tsv(value: str) -> str:
+    def replace(match):
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        return TSV_ESCAPES.get(match.group(3), match.group(3))
+    return TSV_ESCAPE_RE.sub(replace, value)
+
+
+def parse_tsv_term(term: str) -> Optional[Dict[str, str]]:
+    """Parse an RDF term in TSV results into the same form to JSON results.
+    Returns :const:`None` for an unbound (empty) term.
+
+    """
+    if not term:
+        return None
+    if term[0] == '<' and term[-1] == '>':
+        return {'type': 'uri', 'value': term[1:-1]}
+    elif term.startswith('_:'):
+        return {'type': 'bnode', 'value': term[2:]}
+    match = TSV_LITERAL_RE.match(term)
+    if match:
+        result = {'type': 'literal',
+                  'value': unescape_tsv(match.group('value'))}
+        if match.group('lang'):
+            result['xml:lang'] = match.group('lang')
+        elif match.group('datatype'):
+            result['datatype'] = match.group('datatype')
+        return result
+    # Abbreviated numbers and booleans
+    if term in ('true', 'false'):
+        datatype = 'boolean'
+    elif re.match(r'^[+-]?\d+$', term):
+        datatype = 'integer'
+    elif re.match(r'^[+-]?\d*\.\d+$', term):
+        datatype = 'decimal'
+    else:
+        datatype = 'double'
+    return {'type': 'literal', 'value': term, 'datatype': XSD + datatype}
+
+
+def iter_tsv_bindings(fp: IO[bytes]) -> Iterator[Dict[str, Dict[str, str]]]:
+    r"""Read bindings from SPARQL query results in TSV, one by one.
+    Only a line is buffered at a time.
+
+    :param fp: The binary file object of the results.
+    :type fp: :class:`~typing.IO`\ [:class:`bytes`]
+    :return: The bindings, i.e., mappings of variable names to RDF terms.
+    :rtype: :class:`~typing.Iterator`\ [:class:`~typing.Dict`\
+            [:class:`str`, :class:`~typing.Dict`\ [:class:`str`,
+            :class:`str`]]]
+    :raise SparqlError: When the results are malformed.
+
+    """
+    variables: Optional[List[str]] = None
+    for line in fp:
+        text = line.decode('utf-8').rstrip('\r\n')
+        if variables is None:
+            variables = [v.lstrip('?$') for v in text.split('\t')]
+            continue
+        if not text and len(variables) > 1:
+            continue
+        terms = text.split('\t')
+        if len(terms) != len(variables):
+            raise SparqlError(
+                'expected {} terms, not {}: {!r}'.format(
+                    len(variables), len(terms), text
+                )
+            )
+        binding: Dict[str, Dict[str, str]] = {}
+        for variable, term in zip(variables, terms):
+            parsed = parse_tsv_term(term)
+            if parsed is not None:
+                binding[variable] = parsed
+        yield binding
+
+
+def decode_term(client: 'Client', term: Mapping[str, str]) -> object:
+    r"""Decode an RDF ``term`` of SPARQL query results into a Python value.
+
+    - Entity URIs become :class:`~.entity.Entity` objects through
+      :meth:`Client.get() <wikidata.client.Client.get>`, so that they're
+      identity-mapped.
+    - Strings, language-tagged strings, and WKT points are decoded through
+      :meth:`Client.decode_datavalue()
+      <wikidata.client.Client.decode_datavalue>` as ``string``,
+      ``monolingualtext``, and ``globecoordinate`` datavalues respectively.
+    - Integers, decimals, booleans, and date-times become :class:`int`,
+      :class:`float`, :class:`bool`, and :class:`datetime.datetime`.
+    - The other terms are left as their lexical :class:`str`.
+
+    :param client: The client session.
+    :type client: :class:`~.client.Client`
+    :param term: The RDF term in the form of JSON results.
+    :type term: :class:`~typing.Mapping`\ [:class:`str`, :class:`str`]
+    :return: The decoded value.
+
+    """
+    type_ = term.get('type')
+    value = term['value']
+    if type_ == 'uri':
+        if value.startswith(ENTITY_URI_PREFIX):
+            entity_id = value[len(ENTITY_URI_PREFIX):]
+            if ENTITY_ID_RE.match(entity_id):
+                return client.get(EntityId(entity_id))
+        return value
+    elif type_ not in ('literal', 'typed-literal'):
+        return value
+    lang = term.get('xml:lang')
+    if lang:
+        return client.decode_datavalue('monolingualtext', {
+            'type': 'monolingualtext',
+            'value': {'text': value, 'language': lang},
+        })
+    datatype = term.get('datatype')
+    try:
+        if datatype is None or datatype == XSD + 'string':
+            return client.decode_datavalue('string', {
+                'type': 'string',
+                'value': value,
+            })
+        elif datatype == XSD + 'integer':
+            return int(value)
+        elif datatype in (XSD + 'decimal', XSD + 'double', XSD + 'float'):
+            return float(value)
+        elif datatype == XSD + 'boolean':
+            return value == 'true' or value == '1'
+        elif datatype == XSD + 'dateTime':
+            return datetime.datetime.strptime(
+                value, '%Y-%m-%dT%H:%M:%SZ'
+            ).replace(tzinfo=datetime.timezone.utc)
+        elif datatype == WKT_LITERAL:
+            match = WKT_POINT_RE.match(value)
+            if match:
+                return client.decode_datavalue('globe-coordinate', {
+                    'type': 'globecoordinate',
+                    'value': {
+                        'latitude': float(match.group('latitude')),
+                        'longitude': float(match.group('longitude')),
+                        'globe': match.group('globe') or
+                        ENTITY_URI_PREFIX + 'Q2',
+                        'precision': None,
+                    },
+                })
+    except ValueError:
+        pass
+    return value
@@ -0,0 +1,157 @@
+"""Lightweight cache of labels and descriptions.
+
+:meth:`Client.get_labels() <wikidata.client.Client.get_labels>` fetches
+only labels (and optionally descriptions) of entities in the requested
+languages, which is far smaller than whole entity documents.  They are kept
+in :class:`TermCache` of the client, so that :attr:`Entity.label
+<wikidata.entity.Entity.label>` and :attr:`Entity.description
+<wikidata.entity.Entity.description>` of entities that are not loaded are
+filled from it without loading them:
+
+.. code-block:: python
+
+   labels = client.get_labels(ids, ['ko', 'en'])
+   str(client.get(ids[0]).label)  # no request
+
+.. versionadded:: 0.10.0
+
+"""
+import collections
+import copy
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from .cache import CacheStats
+from .entity import EntityId
+from .multilingual import DEFAULT_FALLBACK, LanguageFallback, MultilingualText
+
+__all__ = 'TermCache', 'TermKey'
+
+
+#: The key of :class:`TermCache`: a pair of entity id and attribute,
+#: i.e., ``'labels'`` or ``'descriptions'``.
+TermKey = Tuple[EntityId, str]
+
+
+class TermCache:
+    r"""LRU cache of :class:`~.multilingual.MultilingualText` by entity id
+    and attribute (``'labels'`` or ``'descriptions'``).  It also remembers
+    which languages were fetched, so that languages that an entity has no
+    text in aren't fetched again.
+
+    :param max_size: The maximum number of texts to keep.
+                     10,000 by default.
+    :type max_size: :class:`int`
+
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self.texts: collections.OrderedDict = collections.OrderedDict()
+        self.languages: Dict[TermKey, FrozenSet[str]] = {}
+        self.counters = CacheStats()
+
+    def get(self,
+            entity_id: EntityId,
+            attribute: str) -> Optional[MultilingualText]:
+        r"""Look up the texts of the given entity.
+
+        :param entity_id: The entity id.
+        :type entity_id: :class:`~.entity.EntityId`
+        :param attribute: ``'labels'`` or ``'descriptions'``.
+        :type attribute: :class:`str`
+        :return: The cached texts, or :const:`None` if nothing is cached.
+        :rtype: :class:`~typing.Optional`\
+                [:class:`~.multilingual.MultilingualText`]
+
+        """
+        key = entity_id, attribute
+        try:
+            text = self.texts[key]
+        except KeyError:
+            self.counters.misses += 1
+            return None
+        self.texts.move_to_end(key)
+        self.counters.hits += 1
+        return text
+
+    def missing_languages(self,
+                          entity_id: EntityId,
+                          attribute: str,
+                          languages: Iterable[str]) -> AbstractSet[str]:
+        r"""Get the ``languages`` which were not fetched for the given
+        entity yet.
+
+        :param entity_id: The entity id.
+        :type entity_id: :class:`~.entity.EntityId`
+        :param attribute: ``'labels'`` or ``'descriptions'``.
+        :type attribute: :class:`str`
+        :param languages: The languages to check.
+        :type languages: :class:`~typing.Iterable`\ [:class:`str`]
+        :return: The languages not fetched yet.
+        :rtype: :class:`~typing.AbstractSet`\ [:class:`str`]
+
+        """
+        fetched = self.languages.get((entity_id, attribute), frozenset())
+        return frozenset(languages) - fetched
+
+    def update(self,
+               entity_id: EntityId,
+               attribute: str,
+               languages: Iterable[str],
+               terms: Mapping[str, Mapping[str, str]],
+               fallback: LanguageFallback = DEFAULT_FALLBACK) -> None:
+        r"""Add the fetched texts of the given entity.  They are merged with
+        the texts of the other languages fetched before.
+
+        :param entity_id: The entity id.
+        :type entity_id: :class:`~.entity.EntityId`
+        :param attribute: ``'labels'`` or ``'descriptions'``.
+        :type attribute: :class:`str`
+        :param languages: The languages that were requested.
+        :type languages: :class:`~typing.Iterable`\ [:class:`str`]
+        :param terms: The raw terms in the response, e.g.,
+                      ``{'en': {'language': 'en', 'value': 'Seoul'}}``.
+        :type terms: :class:`~typing.Mapping`\ [:class:`str`,
+                     :class:`~typing.Mapping`\ [:class:`str`, :class:`str`]]
+        :param fallback: The language fallback of the text.
+        :type fallback: :class:`~.multilingual.LanguageFallback`
+
+        """
+        key = entity_id, attribute
+        texts = {lang: term['value'] for lang, term in terms.items()}
+        old = self.texts.pop(key, None)
+        if old is not None:
+            texts = dict(old.texts.items(), **texts)
+        self.texts[key] = MultilingualText(texts, fallback)
+        self.languages[key] = \
+            self.languages.get(key, frozenset()) | frozenset(languages)
+        self.counters.sets += 1
+        while len(self.texts) > self.max_size:
+            evicted, _ = self.texts.popitem(last=False)
+            del self.languages[evicted]
+            self.counters.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Get the statistics of the cache.
+
+        :return: The statistics.
+        :rtype: :class:`~.cache.CacheStats`
+
+        """
+        stats = copy.copy(self.counters)
+        stats.entries = len(self.texts)
+        return stats
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.texts
@@ -0,0 +1,166 @@
+"""Normalizing :class:`~.quantity.Quantity` values into common units.
+
+Wikidata describes how to convert a unit of measurement into another through
+the unit's own statements: *conversion to SI unit* (:const:`P2370
+<CONVERSION_TO_SI_UNIT>`) and *conversion to standard unit* (:const:`P2442
+<CONVERSION_TO_STANDARD_UNIT>`).  :class:`UnitConverter` reads these
+statements and caches them, so that converting a large number of quantities
+doesn't make a request per unit:
+
+.. code-block:: python
+
+   converter = UnitConverter(client)
+   areas = converter.normalize(entity.getlist(client.get('P2046')))
+
+.. versionadded:: 0.10.0
+
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .client import Client
+from .entity import Entity, EntityId, EntityState
+from .quantity import Quantity
+
+__all__ = ('CONVERSION_TO_SI_UNIT', 'CONVERSION_TO_STANDARD_UNIT',
+           'UnitConverter')
+
+
+#: (:class:`~.entity.EntityId`) The property *conversion to SI unit*.
+CONVERSION_TO_SI_UNIT = EntityId('P2370')
+
+#: (:class:`~.entity.EntityId`) The property *conversion to standard unit*.
+CONVERSION_TO_STANDARD_UNIT = EntityId('P2442')
+
+
+class UnitConverter:
+    r"""Convert :class:`~.quantity.Quantity` values into their base units,
+    e.g., kilometres into metres, using conversion factors stated in
+    Wikidata.  Conversion factors are cached per unit, and units appeared in
+    a bunch of quantities are loaded at once by :meth:`normalize()`.
+
+    Note that only conversions that can be done by multiplying a factor are
+    supported; units like degree Celsius are left as they are.
+
+    :param client: The client session to load units through.
+    :type client: :class:`~.client.Client`
+    :param properties: The properties to look up conversion factors from,
+                       in order of preference.
+                       :const:`CONVERSION_TO_SI_UNIT` and then
+                       :const:`CONVERSION_TO_STANDARD_UNIT` by default.
+    :type properties: :class:`~typing.Sequence`\ [:class:`~.entity.EntityId`]
+
+    """
+
+    def __init__(self,
+                 client: Client,
+                 properties: Sequence[EntityId] = (
+                     CONVERSION_TO_SI_UNIT,
+                     CONVERSION_TO_STANDARD_UNIT,
+                 )) -> None:
+        self.client = client
+        self.properties: Tuple[EntityId, ...] = tuple(properties)
+        #: (:class:`~typing.Dict`\ [:class:`~.entity.EntityId`,
+        #: :class:`~typing.Optional`\ [:class:`~typing.Tuple`\
+        #: [:class:`float`, :class:`~.entity.Entity`]]])
+        #: The cached pairs of conversion factor and base unit.
+        #: :const:`None` means the unit has no known conversion.
+        self.conversions: Dict[EntityId,
+                               Optional[Tuple[float, Entity]]] = {}
+
+    def prefetch(self, units: Iterable[Optional[Entity]]) -> None:
+        r"""Load the conversion factors of the given ``units`` at once.
+        Units whose conversion factors are already cached are skipped.
+
+        :param units: The units to look up.  :const:`None` values
+                      (i.e., unitless) are ignored.
+        :type units: :class:`~typing.Iterable`\ [:class:`~typing.Optional`\
+                     [:class:`~.entity.Entity`]]
+
+        """
+        pending: Dict[EntityId, Entity] = {}
+        for unit in units:
+            if unit is not None and unit.id not in self.conversions:
+                pending.setdefault(unit.id, unit)
+        if not pending:
+            return
+        self.client.load_entities(pending.values())
+        for unit_id, unit in pending.items():
+            self.conversions[unit_id] = self.lookup(unit)
+
+    def lookup(self, unit: Entity) -> Optional[Tuple[float, Entity]]:
+        """Read the conversion factor and the base unit from the ``unit``
+        entity's statements, without looking up the cache.
+
+        :param unit: The unit to look up.
+        :type unit: :class:`~.entity.Entity`
+        :return: The pair of conversion factor and base unit,
+                 or :const:`None` if there's no conversion.
+
+        """
+        if unit.state is EntityState.non_existent:
+            return None
+        for prop_id in self.properties:
+            prop = self.client.get(prop_id)
+            for value in unit.getlist(prop):
+                if isinstance(value, Quantity) and value.unit is not None:
+                    return value.amount, value.unit
+        return None
+
+    def conversion(self, unit: Entity) -> Optional[Tuple[float, Entity]]:
+        """Get the conversion factor and the base unit of the ``unit``.
+
+        :param unit: The unit to look up.
+        :type unit: :class:`~.entity.Entity`
+        :return: The pair of conversion factor and base unit,
+                 or :const:`None` if there's no conversion.
+
+        """
+        try:
+            return self.conversions[unit.id]
+        except KeyError:
+            pass
+        self.prefetch([unit])
+        return self.conversions[unit.id]
+
+    def convert(self, quantity: Quantity) -> Quantity:
+        """Convert the given ``quantity`` into its base unit.  If its unit
+        has no known conversion the ``quantity`` is returned as it is.
+
+        :param quantity: The quantity to convert.
+        :type quantity: :class:`~.quantity.Quantity`
+        :return: The converted quantity.
+        :rtype: :class:`~.quantity.Quantity`
+
+        """
+        if quantity.unit is None:
+            return quantity
+        conversion = self.conversion(quantity.unit)
+        if conversion is None:
+            return quantity
+        factor, base_unit = conversion
+        if factor == 1 and base_unit == quantity.unit:
+            return quantity
+        return Quantity(
+            quantity.amount * factor,
+            None if quantity.lower_bound is None
+            else quantity.lower_bound * factor,
+            None if quantity.upper_bound is None
+            else quantity.upper_bound * factor,
+            base_unit
+        )
+
+    def normalize(self, quantities: Iterable[Quantity]) -> List[Quantity]:
+        r"""Convert all the given ``quantities`` into their base units.
+        Distinct units that appear in ``quantities`` are loaded at once
+        beforehand.
+
+        :param quantities: The quantities to convert.
+        :type quantities: :class:`~typing.Iterable`\
+                          [:class:`~.quantity.Quantity`]
+        :return: The converted quantities, in the same order.
+        :rtype: :class:`~typing.List`\ [:class:`~.quantity.Quantity`]
+
+        """
+        quantities = list(quantities)
+        self.prefetch(q.unit for q in quantities)
+        return [self.convert(q) for q in quantities]